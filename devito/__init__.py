@@ -1,11 +1,14 @@
 from __future__ import absolute_import
+from multiprocessing import cpu_count
 
 from devito.base import *  # noqa
+from devito.data import bfloat16  # noqa
 from devito.dimension import *  # noqa
 from devito.equation import *  # noqa
 from devito.finite_difference import *  # noqa
 from devito.grid import *  # noqa
 from devito.logger import error, warning, info, set_log_level  # noqa
+from devito.operator import build_operators  # noqa
 from devito.parameters import *  # noqa
 from devito.tools import *  # noqa
 
@@ -31,6 +34,31 @@ def _cast_and_update_compiler(val):
 configuration.add('openmp', 0, [0, 1], callback=_cast_and_update_compiler)
 configuration.add('debug_compiler', 0, [0, 1], lambda i: bool(i))
 
+# Persistent, cross-process cache of JIT-compiled Operators (opt-in). The cache
+# size is expressed in MBs; if no directory is provided, a per-user directory in
+# the system's tmp space is used
+configuration.add('jit-cache', 0, [0, 1], lambda i: bool(i))
+configuration.add('jit-cache-dir', None)
+configuration.add('jit-cache-size', 1024)
+
+# Pipe the generated code to the compiler and keep the shared objects in a
+# RAM-backed file system, thus avoiding any I/O to the (possibly slow) tmp space
+configuration.add('jit-inmemory', 0, [0, 1], lambda i: bool(i))
+
+# Profile-guided optimization: the first `apply` builds and trains an
+# instrumented version of the Operator, which is then rebuilt from the profile
+configuration.add('compiler-pgo', 0, [0, 1], lambda i: bool(i))
+
+# Empirical compiler-flag auto-tuning: the first `apply` compiles and times a
+# few variants of the compiler flags, and keeps the fastest one. The variants
+# which may alter the numerical results (e.g., -ffast-math) are only tried with
+# 'fast-math'
+configuration.add('compiler-autotuning', 0, [0, 1, 'fast-math'],
+                  lambda i: i if i == 'fast-math' else bool(i))
+
+# Number of workers available to Operator.compile_async
+configuration.add('jit-workers', cpu_count(), callback=lambda i: int(i))
+
 # ... then the backend configuration. The order is important since the
 # backend might depend on the compiler configuration.
 configuration.add('backend', 'core', list(backends_registry),
@@ -1,4 +1,5 @@
 from collections import OrderedDict
+from functools import reduce
 
 import cgen as c
 from mpmath.libmp import prec_to_dps, to_str
@@ -15,6 +16,7 @@ class Allocator(object):
     def __init__(self):
         self.heap = OrderedDict()
         self.stack = OrderedDict()
+        self.pool = OrderedDict()
 
     def push_stack(self, scope, obj):
         """
@@ -46,6 +48,23 @@ class Allocator(object):
 
         self.heap[obj] = (decl, alloc, free)
 
+    def push_pool(self, obj):
+        """
+        Generate a cgen object to access ``obj``, of type :class:`SymbolicData`,
+        through a pointer to caller-provided memory, rather than allocating it
+        on the heap.
+        """
+        if obj in self.pool:
+            return
+
+        shape = "".join("[%s]" % i.symbolic_size for i in obj.indices[1:])
+        ctype = c.dtype_to_ctype(obj.dtype)
+        lvalue = c.Value(ctype, "(*restrict %s)%s __attribute__((aligned(64)))"
+                         % (obj.name, shape))
+        rvalue = "(%s (*)%s) %s_vec" % (ctype, shape, obj.name)
+
+        self.pool[obj] = c.Initializer(lvalue, rvalue)
+
     @property
     def onstack(self):
         return [(k, v.values()) for k, v in self.stack.items()]
@@ -54,6 +73,10 @@ class Allocator(object):
     def onheap(self):
         return self.heap.values()
 
+    @property
+    def onpool(self):
+        return list(self.pool.items())
+
 
 # Utils to print C strings
 
@@ -153,9 +176,102 @@ class CodePrinter(C99CodePrinter):
     def _print_ListInitializer(self, expr):
         return "{%s}" % ', '.join([self._print(i) for i in expr.params])
 
+    def _print_Byref(self, expr):
+        return "&%s" % self._print(expr.args[0])
+
     def _print_IntDiv(self, expr):
         return str(expr)
 
+    def _print_FMA(self, expr):
+        return "%s(%s)" % (expr.cname, ', '.join(self._print(i) for i in expr.args))
+
+    def _print_Min(self, expr):
+        return reduce(lambda a, b: "MIN(%s, %s)" % (a, b),
+                      [self._print(i) for i in expr.args])
+
+    def _print_Max(self, expr):
+        return reduce(lambda a, b: "MAX(%s, %s)" % (a, b),
+                      [self._print(i) for i in expr.args])
+
+    def _print_Load(self, expr):
+        return "%s(%s)" % (expr.cname, self._print(expr.args[0]))
+
+    def _print_Store(self, expr):
+        return "%s(%s)" % (expr.cname, self._print(expr.args[0]))
+
+
+"""
+The C definitions of the conversions from/to the compact storage formats
+(see :class:`Load` and :class:`Store`). The values are stored as raw bits in
+an ``unsigned short``, while the arithmetic is carried out in ``float``.
+"""
+storage_conversions = OrderedDict([
+    ('load_half', """\
+static inline float load_half(unsigned short h)
+{
+  union { unsigned int i; float f; } v;
+  union { unsigned int i; float f; } magic = {(254 - 15) << 23};
+  union { unsigned int i; float f; } infnan = {(127 + 16) << 23};
+  /* Rescale exponent and mantissa; subnormal halves become normal floats */
+  v.i = (unsigned int)(h & 0x7fff) << 13;
+  v.f *= magic.f;
+  if (v.f >= infnan.f)
+  {
+    v.i |= 255 << 23;
+  }
+  v.i |= (unsigned int)(h & 0x8000) << 16;
+  return v.f;
+}"""),
+    ('store_half', """\
+static inline unsigned short store_half(float x)
+{
+  union { unsigned int i; float f; } v;
+  union { unsigned int i; float f; } infty = {255 << 23};
+  union { unsigned int i; float f; } max = {(127 + 16) << 23};
+  union { unsigned int i; float f; } denorm = {((127 - 15) + (23 - 10) + 1) << 23};
+  unsigned int sign, odd;
+  unsigned short o;
+  v.f = x;
+  sign = v.i & 0x80000000u;
+  v.i ^= sign;
+  if (v.i >= max.i)
+  {
+    /* Overflow to Inf, NaN to quiet NaN */
+    o = v.i > infty.i ? 0x7e00 : 0x7c00;
+  }
+  else if (v.i < (113u << 23))
+  {
+    /* Subnormal or zero, rounded by the floating-point addition */
+    v.f += denorm.f;
+    o = v.i - denorm.i;
+  }
+  else
+  {
+    /* Round to nearest, ties to even */
+    odd = (v.i >> 13) & 1;
+    v.i += ((unsigned int)(15 - 127) << 23) + 0xfff + odd;
+    o = v.i >> 13;
+  }
+  return o | (sign >> 16);
+}"""),
+    ('load_bfloat16', """\
+static inline float load_bfloat16(unsigned short h)
+{
+  union { unsigned int i; float f; } v;
+  v.i = (unsigned int)h << 16;
+  return v.f;
+}"""),
+    ('store_bfloat16', """\
+static inline unsigned short store_bfloat16(float x)
+{
+  union { unsigned int i; float f; } v;
+  v.f = x;
+  /* Round to nearest, ties to even */
+  v.i += 0x7fff + ((v.i >> 16) & 1);
+  return v.i >> 16;
+}""")
+])
+
 
 def ccode(expr, **settings):
     """Generate C++ code from an expression calling CodePrinter class
@@ -1,11 +1,26 @@
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from copy import copy
 from functools import partial
 from hashlib import sha1
-from os import environ, path
-from tempfile import mkdtemp
+from itertools import count
+from os import environ, getpid, path
+from tempfile import gettempdir, mkdtemp
 from time import time
 from sys import platform
 from distutils import version
+import errno
+import os
+import shutil
 import subprocess
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; cache accesses won't be serialized
+    fcntl = None
 
 import numpy.ctypeslib as npct
 from codepy.jit import extension_file_from_string
@@ -16,7 +31,8 @@ from devito.logger import log
 from devito.parameters import configuration
 from devito.tools import change_directory, sniff_compiler_version
 
-__all__ = ['jit_compile', 'load', 'make', 'GNUCompiler']
+__all__ = ['jit_compile', 'jit_compile_async', 'load', 'make', 'GNUCompiler',
+           'jit_cache']
 
 
 class Compiler(GCCToolchain):
@@ -92,6 +108,42 @@ class Compiler(GCCToolchain):
     def __repr__(self):
         return "DevitoJITCompiler[%s]" % self.__class__.__name__
 
+    _fast_math = ['-ffast-math']
+    _unroll = ['-funroll-loops']
+
+    def tuning_variants(self, fast_math=False):
+        """
+        Return the variants of the compiler flags tried by the empirical compiler
+        auto-tuner, as a mapper from variant names to lists of flags.
+
+        :param fast_math: (Optional) also return the variants which may alter
+                          the numerical results (e.g., ``fast-math``). Defaults
+                          to False.
+        """
+        cflags = list(self.cflags)
+        variants = OrderedDict([('default', cflags)])
+        if '-O3' in cflags:
+            variants['O2'] = ['-O2' if i == '-O3' else i for i in cflags]
+        variants['unroll'] = cflags + self._unroll
+        if fast_math:
+            variants['fast-math'] = cflags + self._fast_math
+            variants['fast-math-unroll'] = cflags + self._fast_math + self._unroll
+        if '-march=native' in cflags:
+            variants['mtune'] = ['-mtune=native' if i == '-march=native' else i
+                                 for i in cflags]
+        return variants
+
+    def pgo_flags(self, mode, profile_dir):
+        """
+        Return the flags for a profile-guided optimization (PGO) build, or None
+        if PGO isn't supported by this compiler.
+
+        :param mode: Either 'generate', for an instrumented build, or 'use', for
+                     a build optimized through the collected profile.
+        :param profile_dir: The directory where the profile is stored.
+        """
+        return None
+
 
 class GNUCompiler(Compiler):
     """Set of standard compiler flags for the GCC toolchain."""
@@ -113,6 +165,13 @@ class GNUCompiler(Compiler):
             if configuration['openmp']:
                 self.ldflags += ['-fopenmp']
 
+    def pgo_flags(self, mode, profile_dir):
+        if mode == 'generate':
+            return ['-fprofile-generate=%s' % profile_dir]
+        else:
+            return ['-fprofile-use=%s' % profile_dir, '-fprofile-correction',
+                    '-Wno-missing-profile', '-Wno-coverage-mismatch']
+
 
 class GNUCompilerNoAVX(GNUCompiler):
     """Set of compiler flags for GCC but with AVX suppressed. This is
@@ -151,6 +210,9 @@ class IntelCompiler(Compiler):
     CC = 'icc'
     CPP = 'icpc'
 
+    _fast_math = ['-fp-model', 'fast=2']
+    _unroll = ['-unroll-aggressive']
+
     def __init__(self, *args, **kwargs):
         super(IntelCompiler, self).__init__(*args, **kwargs)
         self.cflags += ["-xhost"]
@@ -168,6 +230,12 @@ class IntelCompiler(Compiler):
                 # Note: fopenmp, not qopenmp, is what is needed by icc versions < 15.0
                 self.ldflags += ['-fopenmp']
 
+    def pgo_flags(self, mode, profile_dir):
+        if mode == 'generate':
+            return ['-prof-gen', '-prof-dir=%s' % profile_dir]
+        else:
+            return ['-prof-use', '-prof-dir=%s' % profile_dir]
+
 
 class IntelKNLCompiler(IntelCompiler):
     """Set of standard compiler flags for the clang toolchain"""
@@ -200,6 +268,9 @@ class CustomCompiler(Compiler):
         if configuration['openmp']:
             self.ldflags += environ.get('OMP_LDFLAGS', '-fopenmp').split(' ')
 
+    # A GCC-compatible toolchain is assumed, as with the default flags
+    pgo_flags = GNUCompiler.pgo_flags
+
 
 def get_tmp_dir():
     """Function to get a temp directory.
@@ -215,6 +286,60 @@ def get_tmp_dir():
     return _devito_compiler_tmpdir
 
 
+def get_shm_dir():
+    """Function to get a directory in a RAM-backed file system.
+
+    :return: Path to a devito-specific directory in ``/dev/shm``, if available,
+             or in the system's tmp space otherwise.
+    """
+    global _devito_compiler_shmdir
+    try:
+        path.exists(_devito_compiler_shmdir)
+    except:
+        shm = '/dev/shm'
+        root = shm if path.isdir(shm) and os.access(shm, os.W_OK) else None
+        _devito_compiler_shmdir = mkdtemp(prefix="devito-", dir=root)
+
+    return _devito_compiler_shmdir
+
+
+def get_jit_executor():
+    """Function to get the pool of workers for background JIT compilation.
+
+    :return: A :class:`concurrent.futures.ThreadPoolExecutor` with
+             ``configuration['jit-workers']`` workers.
+    """
+    global _devito_jit_executor
+    nworkers = configuration['jit-workers']
+    if _devito_jit_executor is None or _devito_jit_executor._max_workers != nworkers:
+        if _devito_jit_executor is not None:
+            # Any pending compilation in the old pool will still run to completion
+            _devito_jit_executor.shutdown(wait=False)
+            _devito_jit_retired.append(_devito_jit_executor)
+        _devito_jit_executor = ThreadPoolExecutor(max_workers=nworkers)
+
+    return _devito_jit_executor
+
+
+def wait_jit_executor():
+    """
+    Wait for all pending background JIT compilations to complete, and terminate
+    the workers. This makes it safe to fork the Python process. A new pool of
+    workers is created by the next call to :func:`get_jit_executor`.
+    """
+    global _devito_jit_executor
+    for i in _devito_jit_retired + [_devito_jit_executor]:
+        if i is not None:
+            i.shutdown(wait=True)
+    _devito_jit_executor = None
+    _devito_jit_retired[:] = []
+
+
+_devito_jit_executor = None
+_devito_jit_retired = []
+"""The pools of workers replaced after a change of ``configuration['jit-workers']``."""
+
+
 def load(basename, compiler):
     """Load a compiled library
 
@@ -225,24 +350,310 @@ def load(basename, compiler):
     return npct.load_library(basename, '.')
 
 
-def jit_compile(ccode, compiler):
+def get_lib_ext():
+    """Return the extension of shared libraries on the current platform."""
+    if platform == "linux" or platform == "linux2":
+        return "so"
+    elif platform == "darwin":
+        return "dylib"
+    elif platform == "win32" or platform == "win64":
+        return "dll"
+
+
+class JITCache(object):
+
+    """
+    A persistent, content-addressed cache of JIT-compiled shared objects.
+
+    Unlike :func:`get_tmp_dir`, which is private to a Python process, the
+    cache directory is shared by all processes of a user, so an Operator
+    compiled once (e.g., by one rank of a shot farm) is reused by all others
+    and across restarts. The cache key covers the generated code as well as
+    the compiler class, version and command line (flags, defines, ...).
+
+    Concurrent accesses to the same entry are serialized through file locks,
+    while compiled objects are moved into the cache atomically. The size of
+    the cache is capped at ``configuration['jit-cache-size']`` MBs; when the
+    cap is exceeded, the least recently used entries are evicted. Entries used
+    within the last ``grace`` seconds are never evicted, as they may be about
+    to be loaded (once loaded, removing a shared object is harmless).
+    """
+
+    grace = 600
+    """Seconds after its last use during which an entry can't be evicted."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # The statistics are updated by concurrent compilations too
+        self._stats_lock = threading.Lock()
+
+    @property
+    def directory(self):
+        """The cache directory, created on-the-fly if necessary."""
+        dirname = configuration['jit-cache-dir']
+        if not dirname:
+            uid = os.getuid() if hasattr(os, 'getuid') else 0
+            dirname = path.join(gettempdir(), 'devito-jitcache-%d' % uid)
+        try:
+            os.makedirs(dirname)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        return dirname
+
+    def key(self, ccode, compiler):
+        """
+        Return the cache key of ``ccode`` when compiled by ``compiler``.
+        """
+        signature = [str(ccode), compiler.__class__.__name__, str(compiler.version),
+                     ' '.join(compiler._cmdline([]))]
+        return sha1(''.join(signature).encode()).hexdigest()
+
+    @contextmanager
+    def lock(self, name):
+        """Hold an exclusive lock on the cache entry ``name``."""
+        if fcntl is None:
+            yield
+            return
+        with open(path.join(self.directory, '%s.lock' % name), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @property
+    def entries(self):
+        """The compiled objects in the cache, least recently used first."""
+        ext = '.%s' % get_lib_ext()
+        entries = [path.join(self.directory, i) for i in os.listdir(self.directory)
+                   if i.endswith(ext) and '.tmp' not in i]
+        return sorted(entries, key=path.getmtime)
+
+    def touch(self, lib_file):
+        """Mark ``lib_file`` as most recently used."""
+        try:
+            os.utime(lib_file, None)
+        except OSError:
+            pass
+
+    def evict(self):
+        """
+        Drop the least recently used entries until the cache fits within
+        ``configuration['jit-cache-size']`` MBs.
+        """
+        capacity = configuration['jit-cache-size'] * 1024**2
+        with self.lock('cache'):
+            entries = self.entries
+            size = sum(path.getsize(i) for i in entries)
+            # Never evict the most recently used entry (i.e., the one just added)
+            # nor those that might still be waiting to be loaded
+            deadline = time() - self.grace
+            for i in entries[:-1]:
+                if size <= capacity or path.getmtime(i) > deadline:
+                    break
+                size -= path.getsize(i)
+                basename = path.splitext(i)[0]
+                for f in [i, '%s.lock' % basename] + \
+                        ['%s.%s' % (basename, e) for e in ('c', 'cpp')]:
+                    try:
+                        os.remove(f)
+                    except OSError:
+                        pass
+                with self._stats_lock:
+                    self.evictions += 1
+                log("JITCache: evicted %s" % i)
+
+    def stats(self):
+        """Return a dict with the hits, misses and evictions seen so far."""
+        with self._stats_lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions}
+
+    def clear(self):
+        """Remove all entries from the cache and reset the statistics."""
+        with self.lock('cache'):
+            for i in os.listdir(self.directory):
+                if i != 'cache.lock':
+                    try:
+                        if path.isdir(path.join(self.directory, i)):
+                            # E.g., PGO builds and profiles
+                            shutil.rmtree(path.join(self.directory, i))
+                        else:
+                            os.remove(path.join(self.directory, i))
+                    except OSError:
+                        pass
+        with self._stats_lock:
+            self.hits = self.misses = self.evictions = 0
+
+
+jit_cache = JITCache()
+"""The process-wide handle to the persistent JIT cache."""
+
+
+def jit_compile(ccode, compiler, pgo=None):
     """JIT compile the given ccode.
 
+    If ``configuration['jit-inmemory']`` is set, the code is compiled through
+    :func:`_compile_inmemory`; this takes precedence over the persistent cache.
+    Otherwise, if ``configuration['jit-cache']`` is set, the shared object is
+    looked up in, and eventually added to, the persistent :class:`JITCache`.
+
+    If ``pgo`` is provided, a profile-guided optimization build is carried out
+    instead; see :func:`_jit_compile_pgo`.
+
     :param ccode: String of C source code.
     :param compiler: The toolchain used for compilation.
+    :param pgo: (Optional) Either 'generate' or 'use'.
 
     :return: The name of the compilation unit.
     """
-    hash_key = sha1(str(ccode).encode()).hexdigest()
-    basename = path.join(get_tmp_dir(), hash_key)
+    if pgo is not None:
+        return _jit_compile_pgo(ccode, compiler, pgo)
+
+    # The key covers the compiler flags too, as several builds of the same
+    # code (e.g., by the compiler auto-tuner) may coexist
+    if configuration['jit-inmemory']:
+        hash_key = jit_cache.key(ccode, compiler)
+        basename = path.join(get_shm_dir(), hash_key)
+        with _tmp_dir_locks[hash_key]:
+            _compile_inmemory(ccode, compiler, basename)
+        return basename
+
+    if not configuration['jit-cache']:
+        hash_key = jit_cache.key(ccode, compiler)
+        basename = path.join(get_tmp_dir(), hash_key)
+        # Identical code may be concurrently compiled by background workers
+        with _tmp_dir_locks[hash_key]:
+            _compile(ccode, compiler, basename)
+        return basename
+
+    hash_key = jit_cache.key(ccode, compiler)
+    basename = path.join(jit_cache.directory, hash_key)
+    lib_file = "%s.%s" % (basename, get_lib_ext())
+
+    with jit_cache.lock(hash_key):
+        if path.exists(lib_file):
+            with jit_cache._stats_lock:
+                jit_cache.hits += 1
+            jit_cache.touch(lib_file)
+            log("%s: cache hit %s [hits=%d, misses=%d]" %
+                (compiler, lib_file, jit_cache.hits, jit_cache.misses))
+        else:
+            with jit_cache._stats_lock:
+                jit_cache.misses += 1
+            # Build under a private name, then atomically move into the cache,
+            # so that no process ever sees a partially written shared object
+            tmp_basename = "%s.tmp%d" % (basename, getpid())
+            src_file = "%s.%s" % (basename, compiler.src_ext)
+            _compile(ccode, compiler, tmp_basename, src_file)
+            os.rename("%s.%s" % (tmp_basename, get_lib_ext()), lib_file)
+            log("%s: cache miss %s [hits=%d, misses=%d]" %
+                (compiler, lib_file, jit_cache.hits, jit_cache.misses))
+
+    jit_cache.evict()
 
-    src_file = "%s.%s" % (basename, compiler.src_ext)
-    if platform == "linux" or platform == "linux2":
-        lib_file = "%s.so" % basename
-    elif platform == "darwin":
-        lib_file = "%s.dylib" % basename
-    elif platform == "win32" or platform == "win64":
-        lib_file = "%s.dll" % basename
+    return basename
+
+
+def jit_compile_async(ccode, compiler):
+    """JIT compile the given ccode in the background.
+
+    The compilation is carried out by one of the workers returned by
+    :func:`get_jit_executor`. Since the heavy lifting is performed by an
+    external compiler process, many compilations may proceed concurrently
+    while the Python interpreter carries on.
+
+    :param ccode: String of C source code.
+    :param compiler: The toolchain used for compilation.
+
+    :return: A :class:`concurrent.futures.Future` wrapping the name of the
+             compilation unit, as returned by :func:`jit_compile`.
+    """
+    return get_jit_executor().submit(jit_compile, str(ccode), compiler)
+
+
+_tmp_dir_locks = defaultdict(threading.Lock)
+"""Serialize in-process compilations of the same code in :func:`get_tmp_dir`."""
+
+
+def pgo_directory(ccode, compiler):
+    """
+    Return the directory storing the profile-guided optimization (PGO) builds
+    of ``ccode`` as well as the collected profile. If ``configuration['jit-cache']``
+    is set, the directory lives in the persistent :class:`JITCache`, alongside
+    the shared objects, so the profile is reused across processes.
+    """
+    hash_key = jit_cache.key(ccode, compiler)
+    root = jit_cache.directory if configuration['jit-cache'] else get_tmp_dir()
+    return path.join(root, '%s.pgo' % hash_key)
+
+
+def pgo_profiled(ccode, compiler):
+    """Return True if a PGO profile has been collected for ``ccode``."""
+    profile_dir = path.join(pgo_directory(ccode, compiler), 'profile')
+    return path.isdir(profile_dir) and len(os.listdir(profile_dir)) > 0
+
+
+_pgo_builds = count()
+"""Give unique names to the instrumented builds of :func:`_jit_compile_pgo`."""
+
+
+def _jit_compile_pgo(ccode, compiler, mode):
+    """
+    JIT compile ``ccode`` for profile-guided optimization (PGO).
+
+    With ``mode='generate'``, an instrumented shared object is built; running
+    it, and eventually unloading it, writes the profile to disk. The shared
+    object is given a unique name, so that it can be privately loaded and
+    unloaded without affecting any other library. With ``mode='use'``, the
+    profile is used to build an optimized shared object. Both builds share
+    the same source and object names, which the compilers rely upon to match
+    the profile to the code.
+    """
+    workdir = pgo_directory(ccode, compiler)
+    profile_dir = path.join(workdir, 'profile')
+    basename = path.join(workdir, 'kernel')
+    optimized = path.join(workdir, 'kernel-pgo')
+    lib_file = "%s.%s" % (optimized, get_lib_ext())
+
+    flags = compiler.pgo_flags(mode, profile_dir)
+    if flags is None:
+        raise CompilationError("%s doesn't support profile-guided optimization"
+                               % compiler)
+    pgo_compiler = copy(compiler)
+    pgo_compiler.cflags = pgo_compiler.cflags + flags
+
+    if not path.isdir(profile_dir):
+        try:
+            os.makedirs(profile_dir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    with jit_cache.lock(path.basename(workdir)):
+        if mode == 'generate':
+            _compile(ccode, pgo_compiler, basename)
+            instrumented = '%s-gen%d-%d' % (basename, getpid(), next(_pgo_builds))
+            os.rename("%s.%s" % (basename, get_lib_ext()),
+                      "%s.%s" % (instrumented, get_lib_ext()))
+            return instrumented
+        if not path.exists(lib_file):
+            _compile(ccode, pgo_compiler, basename)
+            # A private name, so that it's never confused with the instrumented
+            # shared object by the dynamic loader
+            os.rename("%s.%s" % (basename, get_lib_ext()), lib_file)
+        return optimized
+
+
+def _compile(ccode, compiler, basename, src_file=None):
+    """
+    Compile ``ccode`` into the shared object ``basename.{so,dylib,dll}``.
+    """
+    src_file = src_file or "%s.%s" % (basename, compiler.src_ext)
+    lib_file = "%s.%s" % (basename, get_lib_ext())
 
     tic = time()
     extension_file_from_string(toolchain=compiler, ext_file=lib_file,
@@ -251,7 +662,31 @@ def jit_compile(ccode, compiler):
     toc = time()
     log("%s: compiled %s [%.2f s]" % (compiler, src_file, toc-tic))
 
-    return basename
+
+def _compile_inmemory(ccode, compiler, basename):
+    """
+    Compile ``ccode`` into the shared object ``basename.{so,dylib,dll}``,
+    without writing the source code to disk. The code is piped to the
+    compiler over stdin, while the shared object is expected to live in a
+    RAM-backed file system (see :func:`get_shm_dir`).
+    """
+    lib_file = "%s.%s" % (basename, get_lib_ext())
+    language = 'c++' if compiler.src_ext == 'cpp' else 'c'
+    command = compiler._cmdline(['-x', language, '-']) + ['-o', lib_file]
+    if configuration['debug_compiler']:
+        log(" ".join(command))
+
+    tic = time()
+    process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, err = process.communicate(str(ccode).encode())
+    if process.returncode != 0:
+        raise CompilationError('Command "%s" return error status %d. '
+                               'Unable to compile code.\n%s' %
+                               (" ".join(command), process.returncode,
+                                err.decode('utf-8', 'replace')))
+    toc = time()
+    log("%s: compiled %s in-memory [%.2f s]" % (compiler, lib_file, toc-tic))
 
 
 def make(loc, args):
@@ -1,16 +1,25 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
-from itertools import combinations
+from copy import copy
+from itertools import combinations, product
 from functools import reduce
 from operator import mul
+from os import getpid, path, rename
+from time import time
+import json
 import resource
 
+import cpuinfo
+
+from devito.compiler import jit_cache, jit_compile, jit_compile_async, load
+from devito.dle.backends import BlockingArg, PrefetchArg
+from devito.exceptions import CompilationError
 from devito.ir.iet import Iteration, FindNodes, FindSymbols
 from devito.logger import info, info_at
 from devito.parameters import configuration
 
-__all__ = ['autotune']
+__all__ = ['autotune', 'autotune_compiler', 'squeeze', 'tuning_db']
 
 
 def autotune(operator, arguments, tunable):
@@ -19,50 +28,42 @@ def autotune(operator, arguments, tunable):
     operator arguments to perform empirical autotuning. Some of the operator
     arguments are marked as tunable.
     """
-    at_arguments = arguments.copy()
-
-    # User-provided output data must not be altered
-    output = [i.name for i in operator.output]
-    for k, v in arguments.items():
-        if k in output:
-            at_arguments[k] = v.copy()
+    at_arguments, timesteps = squeeze(operator, arguments)
+    if at_arguments is None:
+        info_at("Couldn't understand loop structure, giving up auto-tuning")
+        return arguments
 
     iterations = FindNodes(Iteration).visit(operator.body)
     dim_mapper = {i.dim.name: i.dim for i in iterations}
 
-    # Shrink the iteration space of time-stepping dimension so that auto-tuner
-    # runs will finish quickly
-    steppers = [i for i in iterations if i.dim.is_Time]
-    if len(steppers) == 0:
-        timesteps = 1
-    elif len(steppers) == 1:
-        stepper = steppers[0]
-        start = 0
-        timesteps = stepper.extent(start=start, finish=options['at_squeezer'])
-        if timesteps < 0:
-            timesteps = options['at_squeezer'] - timesteps + 1
-            info_at("Adjusted auto-tuning timestep to %d" % timesteps)
-        at_arguments[stepper.dim.start_name] = start
-        at_arguments[stepper.dim.end_name] = timesteps
-        if stepper.dim.is_Stepping:
-            at_arguments[stepper.dim.parent.start_name] = start
-            at_arguments[stepper.dim.parent.end_name] = timesteps
+    # Attempted block sizes ...
+    mapper = OrderedDict([(i.argument.symbolic_size.name, i) for i in tunable
+                          if isinstance(i, BlockingArg)])
+    if mapper:
+        # ... Defaults (basic mode). With hierarchical blocking, the number of
+        # blocks in a block of blocks is tuned independently, at each level
+        attempts = [options['at_blocksize']]
+        attempts += [options['at_blockcount']]*max(i.level for i in mapper.values())
+        blocksizes = [OrderedDict([(i, v[mapper[i].level]) for i in mapper])
+                      for v in product(*attempts)]
+        # ... Always try the entire iteration space (degenerate block)
+        datashape = [at_arguments[mapper[i].original_dim.symbolic_end.name] -
+                     at_arguments[mapper[i].original_dim.symbolic_start.name]
+                     for i in mapper]
+        blocksizes.append(OrderedDict([(i, mapper[i].iteration.extent(0, j)
+                                        if mapper[i].level == 0 else 1)
+                          for i, j in zip(mapper, datashape)]))
+        # ... More attempts if auto-tuning in aggressive mode
+        if configuration.core['autotuning'] == 'aggressive':
+            blocksizes = more_heuristic_attempts(blocksizes)
     else:
-        info_at("Couldn't understand loop structure, giving up auto-tuning")
-        return arguments
+        blocksizes = [OrderedDict()]
 
-    # Attempted block sizes ...
-    mapper = OrderedDict([(i.argument.symbolic_size.name, i) for i in tunable])
-    # ... Defaults (basic mode)
-    blocksizes = [OrderedDict([(i, v) for i in mapper]) for v in options['at_blocksize']]
-    # ... Always try the entire iteration space (degenerate block)
-    datashape = [at_arguments[mapper[i].original_dim.symbolic_end.name] -
-                 at_arguments[mapper[i].original_dim.symbolic_start.name] for i in mapper]
-    blocksizes.append(OrderedDict([(i, mapper[i].iteration.extent(0, j))
-                      for i, j in zip(mapper, datashape)]))
-    # ... More attempts if auto-tuning in aggressive mode
-    if configuration.core['autotuning'] == 'aggressive':
-        blocksizes = more_heuristic_attempts(blocksizes)
+    # Attempted prefetch distances, in combination with each block size
+    prefetch = [i.argument.name for i in tunable if isinstance(i, PrefetchArg)]
+    if prefetch:
+        blocksizes = [OrderedDict(list(bs.items()) + [(i, v) for i in prefetch])
+                      for bs in blocksizes for v in options['at_prefetch']]
 
     # How many temporaries are allocated on the stack?
     # Will drop block sizes that might lead to a stack overflow
@@ -77,12 +78,20 @@ def autotune(operator, arguments, tunable):
     for bs in blocksizes:
         illegal = False
         for k, v in at_arguments.items():
-            if k in bs:
+            if k in bs and k not in mapper:
+                # E.g., the prefetch distance
+                at_arguments[k] = bs[k]
+            elif k in bs:
                 val = bs[k]
                 start = at_arguments[mapper[k].original_dim.symbolic_start.name]
                 end = at_arguments[mapper[k].original_dim.symbolic_end.name]
-                if val <= mapper[k].iteration.extent(start, end):
+                extent = mapper[k].iteration.extent(start, end)
+                if mapper[k].level > 0 or val <= extent:
                     at_arguments[k] = val
+                elif mapper[k].original_dim.is_Time:
+                    # Time blocks may span more timesteps than those executed
+                    # while auto-tuning
+                    at_arguments[k] = extent
                 else:
                     # Block size cannot be larger than actual dimension
                     illegal = True
@@ -93,7 +102,7 @@ def autotune(operator, arguments, tunable):
         # Make sure we remain within stack bounds, otherwise skip block size
         dim_sizes = {}
         for k, v in at_arguments.items():
-            if k in bs:
+            if k in mapper:
                 dim_sizes[mapper[k].argument.symbolic_size] = bs[k]
             elif k in dim_mapper:
                 dim_sizes[dim_mapper[k].symbolic_size] = v
@@ -129,7 +138,7 @@ def autotune(operator, arguments, tunable):
     # Build the new argument list
     tuned = OrderedDict()
     for k, v in arguments.items():
-        tuned[k] = best[k] if k in mapper else v
+        tuned[k] = best[k] if k in best else v
 
     # Reset the profiling struct
     assert operator.profiler.name in tuned
@@ -138,6 +147,167 @@ def autotune(operator, arguments, tunable):
     return tuned
 
 
+def autotune_compiler(operator, ccode, arguments):
+    """
+    Determine empirically the fastest variant of the compiler flags for
+    ``operator``, whose generated code is ``ccode``. The flag variants are
+    JIT-compiled concurrently, then timed on ``arguments`` over a squeezed
+    time window, after a warm-up run. The variants which may alter the numerical
+    results are only tried if ``configuration['compiler-autotuning']`` is set to
+    'fast-math'. The outcome is recorded in the :class:`TuningDatabase`, so
+    the search is not repeated for the same code on the same host.
+
+    :returns: A 2-tuple ``(basename, compiler)``, with ``basename`` the name of
+              the fastest shared object, and ``compiler`` the compiler with the
+              winning flags, or None if auto-tuning couldn't be performed.
+    """
+    fast_math = configuration['compiler-autotuning'] == 'fast-math'
+    compilers = OrderedDict()
+    for k, v in operator._compiler.tuning_variants(fast_math).items():
+        compilers[k] = copy(operator._compiler)
+        compilers[k].cflags = v
+
+    # Anything on record? Outcomes with and without the variants altering the
+    # numerical results are recorded separately
+    category = 'compiler-fast-math' if fast_math else 'compiler'
+    key = jit_cache.key(ccode, operator._compiler)
+    best = tuning_db.lookup(category, key)
+    if best in compilers:
+        info("Auto-tuned compiler flags: %s [from the tuning database]" % best)
+        return jit_compile(ccode, compilers[best]), compilers[best]
+
+    at_arguments, timesteps = squeeze(operator, arguments)
+    if at_arguments is None:
+        info_at("Couldn't understand loop structure, giving up auto-tuning")
+        return None
+
+    futures = OrderedDict([(k, jit_compile_async(ccode, v))
+                           for k, v in compilers.items()])
+    timings = OrderedDict()
+    for k, future in futures.items():
+        try:
+            basename = future.result()
+        except CompilationError:
+            info_at("Compiler flags <%s> unsupported, skipping" % k)
+            continue
+        cfunction = getattr(load(basename, compilers[k]), operator.name)
+        cfunction.argtypes = operator._argtypes
+
+        # Warm up (e.g., page faults, caches), then keep the fastest of a few runs
+        elapsed = []
+        for i in range(options['at_compiler_runs'] + 1):
+            at_arguments[operator.profiler.name] = operator.profiler.new()
+            tic = time()
+            cfunction(*[at_arguments[p.name] for p in operator.parameters])
+            elapsed.append(time() - tic)
+        timings[k] = (min(elapsed[1:]), basename)
+        info_at("Compiler flags <%s> took %f (s) in %d time steps" %
+                (k, timings[k][0], timesteps))
+
+    try:
+        best = min(timings, key=lambda i: timings[i][0])
+    except ValueError:
+        info("Compiler auto-tuning request, but couldn't compile any variant")
+        return None
+    info("Auto-tuned compiler flags: %s" % best)
+    tuning_db.record(category, key, best)
+
+    return timings[best][1], compilers[best]
+
+
+class TuningDatabase(object):
+
+    """
+    A persistent database of auto-tuning outcomes. The database is a JSON
+    file in the :class:`JITCache` directory, shared by all processes of a
+    user. Entries are keyed on the host CPU, since the best choices are
+    typically machine-specific, as well as on a tuning category (e.g.,
+    ``'compiler'``) and an Operator hash.
+    """
+
+    @property
+    def filename(self):
+        return path.join(jit_cache.directory, 'tuning.json')
+
+    @property
+    def host(self):
+        """A description of the host CPU."""
+        if self._host is None:
+            info = cpuinfo.get_cpu_info()
+            self._host = '%s [%d cores]' % (info.get('brand_raw', info.get('brand')),
+                                            info.get('count', 0))
+        return self._host
+
+    _host = None
+
+    def lookup(self, category, key):
+        """Return the tuning outcome on record, or None."""
+        return self._load().get(self.host, {}).get(category, {}).get(key)
+
+    def record(self, category, key, value):
+        """Add a tuning outcome to the database."""
+        with jit_cache.lock('tuning'):
+            entries = self._load()
+            entries.setdefault(self.host, {}).setdefault(category, {})[key] = value
+            # Write to a private file, then atomically move it in place
+            tmpname = '%s.tmp%d' % (self.filename, getpid())
+            with open(tmpname, 'w') as f:
+                json.dump(entries, f, indent=2)
+            rename(tmpname, self.filename)
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+
+tuning_db = TuningDatabase()
+"""The process-wide handle to the persistent tuning database."""
+
+
+def squeeze(operator, arguments):
+    """
+    Return a copy of ``arguments`` in which the iteration space of the
+    time-stepping dimension is shrunk, so that runs of ``operator`` (e.g.,
+    auto-tuning or profiling runs) finish quickly, as well as the number of
+    time steps that will be executed. User-provided output data is replaced
+    by copies, so that it doesn't get altered. If the loop structure of
+    ``operator`` is not understood, return ``(None, None)``.
+    """
+    at_arguments = arguments.copy()
+
+    # User-provided output data must not be altered
+    output = [i.name for i in operator.output]
+    for k, v in arguments.items():
+        if k in output:
+            at_arguments[k] = v.copy()
+
+    iterations = FindNodes(Iteration).visit(operator.body)
+
+    # Shrink the iteration space of time-stepping dimension
+    steppers = [i for i in iterations if i.dim.is_Time]
+    if len(steppers) == 0:
+        timesteps = 1
+    elif len(steppers) == 1:
+        stepper = steppers[0]
+        start = 0
+        timesteps = stepper.extent(start=start, finish=options['at_squeezer'])
+        if timesteps < 0:
+            timesteps = options['at_squeezer'] - timesteps + 1
+            info_at("Adjusted auto-tuning timestep to %d" % timesteps)
+        at_arguments[stepper.dim.start_name] = start
+        at_arguments[stepper.dim.end_name] = timesteps
+        if stepper.dim.is_Stepping:
+            at_arguments[stepper.dim.parent.start_name] = start
+            at_arguments[stepper.dim.parent.end_name] = timesteps
+    else:
+        return None, None
+
+    return at_arguments, timesteps
+
+
 def more_heuristic_attempts(blocksizes):
     # Ramp up to higher block sizes
     handle = OrderedDict([(i, options['at_blocksize'][-1]) for i in blocksizes[0]])
@@ -170,6 +340,9 @@ def more_heuristic_attempts(blocksizes):
 options = {
     'at_squeezer': 5,
     'at_blocksize': sorted({8, 16, 24, 32, 40, 64, 128}),
+    'at_blockcount': [2, 4, 8],
+    'at_prefetch': [0, 16, 32, 64],
+    'at_compiler_runs': 3,
     'at_stack_limit': resource.getrlimit(resource.RLIMIT_STACK)[0] / 4
 }
 """Autotuning options."""
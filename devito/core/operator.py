@@ -1,8 +1,15 @@
 from __future__ import absolute_import
 
-from devito.core.autotuning import autotune
+import ctypes
+import _ctypes
+import os
+
+from devito.core.autotuning import autotune, autotune_compiler, squeeze
 from devito.cgen_utils import printmark
+from devito.compiler import get_lib_ext, jit_compile, load, pgo_profiled
+from devito.exceptions import CompilationError
 from devito.ir.iet import List, Transformer, filter_iterations, retrieve_iteration_tree
+from devito.logger import info, warning
 from devito.operator import OperatorRunnable
 from devito.tools import flatten
 
@@ -14,13 +21,73 @@ class OperatorCore(OperatorRunnable):
     def _autotune(self, arguments):
         """
         Use auto-tuning on this Operator to determine empirically the
-        best block sizes when loop blocking is in use.
+        best block sizes and prefetch distance when loop blocking and
+        software prefetching are in use.
         """
-        if self.dle_flags.get('blocking', False):
+        if self.dle_flags.get('blocking', False) or\
+                self.dle_flags.get('prefetch', False):
             return autotune(self, arguments, self.dle_arguments)
         else:
             return arguments
 
+    def _autotune_compiler(self, arguments):
+        """
+        JIT-compile this Operator using the compiler flags that empirically
+        perform best on ``arguments``. See :func:`autotune_compiler`.
+        """
+        ccode = self._generate_code()
+        with self.build_profile.timer('compilation'):
+            tuned = autotune_compiler(self, ccode, arguments)
+        if tuned is None:
+            return False
+        basename, self._compiler = tuned
+        self._lib = load(basename, self._compiler)
+        self._lib.name = basename
+        return True
+
+    def _compile_pgo(self, arguments):
+        """
+        JIT-compile this Operator through profile-guided optimization: build
+        an instrumented shared object, run it over a squeezed time window (as
+        done by the auto-tuner), then rebuild it based on the collected profile.
+        The profile is reused if already available.
+        """
+        ccode = self._generate_code()
+        try:
+            with self.build_profile.timer('compilation'):
+                if not pgo_profiled(ccode, self._compiler):
+                    self._pgo_train(ccode, arguments)
+                basename = jit_compile(ccode, self._compiler, pgo='use')
+        except CompilationError as e:
+            warning("Profile-guided optimization failed, falling back to "
+                    "standard JIT-compilation [%s]" % e)
+            return False
+        self._lib = load(basename, self._compiler)
+        self._lib.name = basename
+        return True
+
+    def _pgo_train(self, ccode, arguments):
+        """Collect a profile running an instrumented build of this Operator."""
+        pgo_arguments, timesteps = squeeze(self, arguments)
+        if pgo_arguments is None:
+            raise CompilationError("couldn't understand the loop structure")
+        pgo_arguments[self.profiler.name] = self.profiler.new()
+
+        # The instrumented shared object is uniquely named and privately loaded
+        # (i.e., not through `load`, which caches the libraries by name), so
+        # that unloading it can't affect any other library
+        basename = jit_compile(ccode, self._compiler, pgo='generate')
+        lib_file = '%s.%s' % (basename, get_lib_ext())
+        lib = ctypes.CDLL(lib_file)
+        cfunction = getattr(lib, self.name)
+        cfunction.argtypes = self._argtypes
+        cfunction(*[pgo_arguments[p.name] for p in self.parameters])
+        info("Operator `%s` profiled in %d time steps" % (self.name, timesteps))
+
+        # Unloading the instrumented shared object writes the profile to disk
+        _ctypes.dlclose(lib._handle)
+        os.remove(lib_file)
+
 
 class OperatorDebug(OperatorCore):
     """
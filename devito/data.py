@@ -3,6 +3,7 @@ from __future__ import absolute_import
 import ctypes
 from ctypes.util import find_library
 from functools import reduce
+from itertools import count
 from operator import mul
 
 import numpy as np
@@ -13,6 +14,50 @@ from devito.tools import as_tuple, numpy_to_ctypes
 import devito
 
 
+class bfloat16(object):
+
+    """
+    The bfloat16 storage format, that is the 16 most significant bits of an
+    IEEE-754 single-precision number. As NumPy has no such type, the values
+    are held as raw bits in a ``numpy.uint16``.
+    """
+
+
+compact_dtypes = (np.float16, bfloat16)
+"""The storage formats trading precision for memory footprint. The values
+are converted from/to ``numpy.float32`` whenever accessed (see
+:class:`CompactData`)."""
+
+
+def to_compact(values, dtype):
+    """
+    Round ``values`` to the compact storage format ``dtype``, returning the raw
+    bits as a ``numpy.uint16`` array.
+    """
+    values = np.asarray(values, dtype=np.float32)
+    if dtype is bfloat16:
+        bits = values.view(np.uint32)
+        # Round to nearest, ties to even
+        bits = bits + (0x7fff + ((bits >> 16) & 1))
+        return (bits >> 16).astype(np.uint16)
+    else:
+        return values.astype(np.float16).view(np.uint16)
+
+
+def from_compact(bits, dtype):
+    """
+    Convert the raw bits ``bits`` in the compact storage format ``dtype`` into
+    ``numpy.float32`` values.
+    """
+    bits = np.asarray(bits, dtype=np.uint16)
+    if dtype is bfloat16:
+        values = (bits.astype(np.uint32) << 16).view(np.float32)
+    else:
+        values = bits.view(np.float16).astype(np.float32)
+    # Scalars in, scalars out
+    return values if values.ndim else values[()]
+
+
 class Data(np.ndarray):
 
     """
@@ -25,7 +70,8 @@ class Data(np.ndarray):
     :param shape: Shape of the domain region in grid points.
     :param dimensions: A tuple of :class:`Dimension`s, representing the dimensions
                        of the ``Data``.
-    :param dtype: A ``numpy.dtype`` for the raw data.
+    :param dtype: A ``numpy.dtype`` for the raw data, or one of the compact
+                  storage formats ``numpy.float16`` and :class:`bfloat16`.
 
     .. note::
 
@@ -38,14 +84,35 @@ class Data(np.ndarray):
         still be of type :class:`Data`. However, if ``A``'s rank is different than
         ``self``'s rank, namely if ``A.ndim != self.ndim``, then the capability of
         performing logical indexing is lost.
+
+    .. note::
+
+        A root ``Data`` carries a version, namely a globally unique number that
+        changes whenever the data values are modified, either on ``self`` or on
+        any view of ``self``, through indexing (e.g., ``A[:] = 1.``), in-place
+        arithmetic (e.g., ``A += 1.``), ufuncs and functions writing into
+        ``self`` (e.g., ``np.add(B, C, out=A)`` or ``np.copyto(A, B)``) or
+        ``fill``, as well as by an :class:`Operator`. Views and copies carry
+        no version.
+
+    .. note::
+
+        Data in a compact storage format is held as raw ``numpy.uint16`` bits,
+        and is for internal use only. Users access the values through a
+        :class:`CompactData`.
     """
 
+    _versions = count()
+
     def __new__(cls, shape, dimensions, dtype):
         assert len(shape) == len(dimensions)
-        ndarray, c_pointer = malloc_aligned(shape, dtype)
+        compact = dtype if dtype in compact_dtypes else None
+        ndarray, c_pointer = malloc_aligned(shape, np.uint16 if compact else dtype)
         obj = np.asarray(ndarray).view(cls)
         obj._c_pointer = c_pointer
+        obj._compact = compact
         obj._modulo = tuple(True if i.is_Stepping else False for i in dimensions)
+        obj._version = next(Data._versions)
         return obj
 
     def __del__(self):
@@ -60,7 +127,9 @@ class Data(np.ndarray):
         if obj is None:
             # `self` was created through __new__()
             return
-        if type(obj) != Data or self.ndim != obj.ndim:
+        # The raw bits of views and copies are still in the storage format
+        self._compact = getattr(obj, '_compact', None)
+        if not isinstance(obj, Data) or self.ndim != obj.ndim:
             self._modulo = tuple(False for i in range(self.ndim))
         else:
             self._modulo = obj._modulo
@@ -68,6 +137,7 @@ class Data(np.ndarray):
         # explicit reference to the C pointer (`_c_pointer`). This makes sure
         # that only one object (the "root" Data) will free the C-allocated memory
         self._c_pointer = None
+        self._version = None
 
     def __getitem__(self, index):
         index = self._convert_index(index)
@@ -76,6 +146,47 @@ class Data(np.ndarray):
     def __setitem__(self, index, val):
         index = self._convert_index(index)
         super(Data, self).__setitem__(index, val)
+        self._modified()
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # Run the ufunc on plain ndarrays, as `ndarray.__array_ufunc__` would
+        # otherwise defer to this very method
+        cast = lambda i: i.view(np.ndarray) if isinstance(i, Data) else i
+        outputs = kwargs.get('out', ())
+        if outputs:
+            kwargs['out'] = tuple(cast(i) for i in outputs)
+        retval = getattr(ufunc, method)(*[cast(i) for i in inputs], **kwargs)
+
+        # In-place writes (e.g., `A += 1` or `np.add(B, C, out=A)`) modify the data
+        if method == 'at':
+            outputs = inputs[:1]
+        for i in outputs:
+            if isinstance(i, Data):
+                i._modified()
+        if outputs:
+            return outputs[0] if len(outputs) == 1 else outputs
+
+        # As for any other view or copy, new arrays are still of type Data
+        def wrap(i):
+            if not isinstance(i, np.ndarray):
+                return i
+            i = i.view(type(self))
+            i.__array_finalize__(self)
+            return i
+        return tuple(wrap(i) for i in retval) if isinstance(retval, tuple) else\
+            wrap(retval)
+
+    def __array_function__(self, func, types, args, kwargs):
+        retval = super(Data, self).__array_function__(func, types, args, kwargs)
+        # Functions writing into their first argument (e.g., `np.copyto(A, B)`)
+        if func in (np.copyto, np.place, np.put, np.putmask) and\
+                isinstance(args[0], Data):
+            args[0]._modified()
+        return retval
+
+    def fill(self, value):
+        super(Data, self).fill(value)
+        self._modified()
 
     def _convert_index(self, index):
         if isinstance(index, np.ndarray):
@@ -116,6 +227,15 @@ class Data(np.ndarray):
                 wrapped.append(i % mod)
         return wrapped[0] if len(index) == 1 else tuple(wrapped)
 
+    def _modified(self):
+        """Record that the data values may have changed."""
+        # Views carry no version, so the root Data is updated instead
+        root = self
+        while root._version is None and isinstance(root.base, Data):
+            root = root.base
+        if root._version is not None:
+            root._version = next(Data._versions)
+
     def reset(self):
         """
         Set all grid entries to 0.
@@ -123,6 +243,100 @@ class Data(np.ndarray):
         self[:] = 0.0
 
 
+class CompactData(np.lib.mixins.NDArrayOperatorsMixin):
+
+    """
+    The values of a :class:`Data` in a compact storage format, as
+    ``numpy.float32``.
+
+    :param storage: The :class:`Data` holding the raw bits.
+
+    .. note::
+
+        This is a lightweight proxy, not a :class:`numpy.ndarray`. Indexing
+        (e.g., ``A[0]`` or ``A[0][1:3]``) only converts the indexed values, or
+        returns a new proxy if the result is a view of ``storage``. Assignments
+        through indexing (e.g., ``A[:] = 1.``), in-place arithmetic (e.g.,
+        ``A += 1.``) and ``fill`` are rounded to the storage format and written
+        back to ``storage``. Any other operation (e.g., ``A + 1.``, ``A.sum()``
+        or ``np.asarray(A)``) acts on a ``numpy.float32`` copy of all values.
+    """
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    @property
+    def shape(self):
+        return self._storage.shape
+
+    @property
+    def ndim(self):
+        return self._storage.ndim
+
+    @property
+    def size(self):
+        return self._storage.size
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float32)
+
+    def __len__(self):
+        return len(self._storage)
+
+    def __repr__(self):
+        return 'CompactData(%s)' % np.array2string(np.asarray(self), separator=', ')
+
+    def __str__(self):
+        return str(np.asarray(self))
+
+    def __getitem__(self, index):
+        retval = self._storage[index]
+        if isinstance(retval, np.ndarray) and np.may_share_memory(retval, self._storage):
+            return CompactData(retval)
+        return from_compact(retval, self._storage._compact)
+
+    def __setitem__(self, index, val):
+        self._storage[index] = to_compact(val, self._storage._compact)
+
+    def fill(self, value):
+        self[:] = value
+
+    def __array__(self, dtype=None, copy=None):
+        values = np.asarray(from_compact(self._storage.view(np.ndarray),
+                                         self._storage._compact))
+        return values if dtype is None else values.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        cast = lambda i: np.asarray(i) if isinstance(i, CompactData) else i
+        if method == 'at':
+            # E.g., `np.add.at(A, [0, 1], 1.)`
+            values = cast(inputs[0])
+            ufunc.at(values, *[cast(i) for i in inputs[1:]], **kwargs)
+            inputs[0][:] = values
+            return
+        outputs = kwargs.get('out', ())
+        if outputs:
+            kwargs['out'] = tuple(None if isinstance(i, CompactData) else i
+                                  for i in outputs)
+        retval = getattr(ufunc, method)(*[cast(i) for i in inputs], **kwargs)
+        if not outputs:
+            return retval
+
+        # In-place writes (e.g., `A += 1` or `np.add(B, C, out=A)`)
+        retval = retval if isinstance(retval, tuple) else (retval,)
+        for i, j in zip(outputs, retval):
+            if isinstance(i, CompactData):
+                i[:] = j
+        return outputs[0] if len(outputs) == 1 else outputs
+
+    def __getattr__(self, name):
+        # Any other attribute or method (e.g., `A.sum()`) is that of the values
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(np.asarray(self), name)
+
+
 """
 Pre-load ``libc`` to explicitly manage C memory
 """
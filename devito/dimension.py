@@ -95,6 +95,18 @@ class Dimension(AbstractSymbol):
     def _hashable_content(self):
         return super(Dimension, self)._hashable_content() + (self.spacing,)
 
+    # Pickling support
+
+    def __reduce_ex__(self, proto):
+        # SymPy's cache is bypassed, or the unpickled Dimension would override
+        # the state of any live Dimension with the same name
+        return (_unpickle_dimension, (type(self), self.name), self.__getstate__())
+
+    def __getstate__(self):
+        state = super(Dimension, self).__getstate__()
+        state.update(self.__dict__)
+        return state
+
     def argument_defaults(self, size=None):
         """
         Returns a map of default argument values defined by this symbol.
@@ -367,3 +379,8 @@ class LoweredDimension(Dimension):
 
     def _hashable_content(self):
         return Symbol._hashable_content(self) + (self.origin,)
+
+
+def _unpickle_dimension(cls, name):
+    """Rebuild a pickled :class:`Dimension`."""
+    return sympy.Symbol.__xnew__(cls, name)
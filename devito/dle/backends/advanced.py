@@ -3,25 +3,33 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
+from functools import reduce
 from itertools import combinations
 
 import cgen
 import numpy as np
 import psutil
+from sympy import And, Ge, Integer, Lt, Max, Min, Mod
 
 from devito.cgen_utils import ccode
 from devito.dimension import Dimension
 from devito.dle import fold_blockable_tree, unfold_blocked_tree
-from devito.dle.backends import (BasicRewriter, BlockingArg, dle_pass, omplang,
-                                 simdinfo, get_simd_flag, get_simd_items)
+from devito.dle.backends import (BasicRewriter, BlockingArg, PrefetchArg, dle_pass,
+                                 omplang, simdinfo, simdlang, get_simd_flag,
+                                 get_simd_items)
 from devito.dse import promote_scalar_expressions
 from devito.exceptions import DLEException
-from devito.ir.iet import (Block, Expression, Iteration, List,
-                           PARALLEL, ELEMENTAL, REMAINDER, tagger,
-                           FindSymbols, IsPerfectIteration, Transformer,
-                           compose_nodes, retrieve_iteration_tree, filter_iterations)
-from devito.logger import dle_warning
-from devito.tools import as_tuple, grouper
+from devito.ir.iet import (Block, Call, Conditional, Element, Expression, Iteration,
+                           List, PARALLEL, SEQUENTIAL, ELEMENTAL, REMAINDER, VECTOR,
+                           tagger,
+                           FindAdjacentIterations, FindNodes, FindSymbols,
+                           IsPerfectIteration, Transformer, compose_nodes,
+                           retrieve_iteration_tree, filter_iterations)
+from devito.ir.support import Forward, Scope
+from devito.logger import dle, dle_warning
+from devito.symbolics import FMA, Byref, estimate_memory
+from devito.tools import as_tuple, filter_ordered, grouper, is_integer
+from devito.types import Scalar
 
 
 class DevitoRewriter(BasicRewriter):
@@ -94,6 +102,70 @@ class DevitoRewriter(BasicRewriter):
 
         return processed, {}
 
+    @dle_pass
+    def _loop_fusion(self, nodes, state):
+        """
+        Fuse adjacent :class:`Iteration` nests over the same :class:`Dimension`s,
+        so that the grid is swept fewer times. All but the innermost Iterations
+        are fused; the innermost Iterations are kept separate, so that they
+        remain free of branches and can still be vectorized: ::
+
+            for x                          for x
+              for y                          for y
+                for z                          for z
+                  A            -->               A
+            for x                              for z
+              for y                              B
+                for z
+                  B
+
+        The fused Iterations span the union of the iteration spaces of the
+        original nests; the body of each original nest is guarded by a
+        :class:`Conditional` if its iteration space is smaller than such union.
+        Two nests are fused only if no data dependence between them is carried
+        by any of the fused Dimensions, as established by a :class:`Scope`.
+        """
+        found = FindAdjacentIterations().visit(nodes)
+        found.pop('seen_iteration')
+
+        mapper = {}
+        fused = set()
+        traffic = 0
+        # Outer groups first, as an enclosing nest might have been fused already
+        for v in reversed(list(found.values())):
+            for group in v:
+                if group[0] in fused:
+                    continue
+                chain = [group[0]]
+                handle = group[0]
+                for i in group[1:] + (None,):
+                    attempt = fuse(handle, i) if i is not None else None
+                    if attempt is not None:
+                        chain.append(i)
+                        handle = attempt
+                        continue
+                    if len(chain) > 1:
+                        mapper[chain[0]] = handle
+                        mapper.update({j: None for j in chain[1:]})
+                        for j in chain:
+                            fused.update(FindNodes(Iteration).visit(j))
+                        exprs = [[e.expr for e in FindNodes(Expression).visit(j)]
+                                 for j in chain]
+                        traffic += sum(estimate_memory(j) for j in exprs)
+                        traffic -= estimate_memory(sum(exprs, []))
+                    chain = [i]
+                    handle = i
+
+        if not mapper:
+            return nodes, {}
+
+        processed = Transformer(mapper).visit(nodes)
+
+        dle("Fused %d Iteration nests, estimated memory traffic reduced by %d "
+            "accesses per grid point" % (len(mapper), traffic))
+
+        return processed, {'flags': 'fusion'}
+
     @dle_pass
     def _loop_blocking(self, nodes, state):
         """
@@ -116,15 +188,33 @@ class DevitoRewriter(BasicRewriter):
         two outer loops will blocked, and the resulting 2-dimensional block will
         have size 4x7. The latter may be set to True to also block innermost parallel
         :class:`Iteration` objects.
+
+        Hierarchical blocking is requested through the keyword ``blocklevels``.
+        With ``blocklevels = 2``, the blocks are in turn grouped into blocks of
+        blocks (e.g., a block sized for the L2 cache within a block sized for the
+        shared L3 cache): ::
+
+            for i_block_l1  // parallel
+              for j_block_l1  // parallel
+                for i_block = i_block_l1; i_block < MIN(i_block_l1 + ...); ...
+                  for j_block = j_block_l1; j_block < MIN(j_block_l1 + ...); ...
+                    for i = i_block; i < i_block + i_block_size; i++
+                      for j = j_block; j < j_block + j_block_size; j++
+                        ...
+
+        The size of a block of blocks is expressed as the number of blocks of the
+        level below along each dimension, and is a separate runtime argument.
         """
         exclude_innermost = not self.params.get('blockinner', False)
         ignore_heuristic = self.params.get('blockalways', False)
+        levels = max(self.params.get('blocklevels', 1), 1)
 
         # Make sure loop blocking will span as many Iterations as possible
         fold = fold_blockable_tree(nodes, exclude_innermost)
 
         mapper = {}
         blocked = OrderedDict()
+        superblocked = OrderedDict()
         for tree in retrieve_iteration_tree(fold):
             # Is the Iteration tree blockable ?
             iterations = [i for i in tree if i.is_Parallel]
@@ -133,9 +223,19 @@ class DevitoRewriter(BasicRewriter):
             if len(iterations) <= 1:
                 continue
             root = iterations[0]
+            if root in mapper:
+                # Already blocked (e.g., a fused nest, with multiple Iteration trees)
+                continue
             if not IsPerfectIteration().visit(root):
                 # Illegal/unsupported
                 continue
+            if any(len(i.nodes) > 1 for i in iterations[:-1]):
+                # Unsupported (e.g., a fused nest, with blocking of the innermost
+                # Iterations requested)
+                continue
+            if any(i.limits[1] != i.dim.symbolic_end for i in iterations):
+                # Unsupported (e.g., the Iterations were skewed by time blocking)
+                continue
             if not tree[0].is_Sequential and not ignore_heuristic:
                 # Heuristic: avoid polluting the generated code with blocked
                 # nests (thus increasing JIT compilation time and affecting
@@ -162,12 +262,29 @@ class DevitoRewriter(BasicRewriter):
                 finish = i.dim.symbolic_end + i.offsets[1]
                 innersize = iter_size + (-i.offsets[0] + i.offsets[1])
                 finish = finish - (innersize % block_size)
-                inter_block = Iteration([], dim, [start, finish, block_size],
-                                        properties=PARALLEL)
-                inter_blocks.append(inter_block)
+
+                # With hierarchical blocking, the blocks are grouped into blocks
+                # of blocks, level by level. The block size at a level is the
+                # number of blocks of the level below
+                dims = [dim]
+                steps = [block_size]
+                for n in range(1, levels):
+                    name = "%s%d_block_l%d" % (i.dim.name, len(mapper), n)
+                    dims.append(superblocked.setdefault((i, n), Dimension(name=name)))
+                    steps.append(dims[-1].symbolic_size*steps[-1])
+
+                # Only the outermost level is parallel, as the Iterations at the
+                # levels below have bounds depending on the enclosing blocks
+                handle = [Iteration([], dims[-1], [start, finish, steps[-1]],
+                                    properties=PARALLEL)]
+                for d, step, parent_step in reversed(list(zip(dims, steps, steps[1:]))):
+                    parent = handle[-1].dim
+                    limits = [parent, Min(parent + parent_step, finish), step]
+                    handle.append(Iteration([], d, limits))
+                inter_blocks.append(handle)
 
                 # Build Iteration within a block
-                start = inter_block.dim
+                start = dim
                 finish = start + block_size
                 intra_block = i._rebuild([], limits=[start, finish, 1], offsets=None,
                                          properties=i.properties + (TAG, ELEMENTAL))
@@ -176,13 +293,17 @@ class DevitoRewriter(BasicRewriter):
                 # Build unitary-increment Iteration over the 'leftover' region.
                 # This will be used for remainder loops, executed when any
                 # dimension size is not a multiple of the block size.
-                start = inter_block.limits[1]
+                start = handle[0].limits[1]
                 finish = i.dim.symbolic_end + i.offsets[1]
                 remainder = i._rebuild([], limits=[start, finish, 1], offsets=None)
                 remainders.append(remainder)
 
+            # Level by level, from the outermost one
+            inter_blocks = [(b, r) for level in zip(*inter_blocks)
+                            for b, r in zip(level, remainders)]
+
             # Build blocked Iteration nest
-            blocked_tree = compose_nodes(inter_blocks + intra_blocks +
+            blocked_tree = compose_nodes([b for b, _ in inter_blocks] + intra_blocks +
                                          [iterations[-1].nodes])
 
             # Build remainder Iterations
@@ -191,8 +312,7 @@ class DevitoRewriter(BasicRewriter):
                 for c in combinations([i.dim for i in iterations], n + 1):
                     # First all inter-block Interations
                     nodes = [b._rebuild(properties=b.properties + (REMAINDER,))
-                             for b, r in zip(inter_blocks, remainders)
-                             if r.dim not in c]
+                             for b, r in inter_blocks if r.dim not in c]
                     # Then intra-block or remainder, for each dim (in order)
                     properties = (REMAINDER, TAG, ELEMENTAL)
                     for b, r in zip(intra_blocks, remainders):
@@ -214,13 +334,25 @@ class DevitoRewriter(BasicRewriter):
             return processed, {}
 
         # Determine the block shape
+        blockshape = self._blockshape(blocked, lambda i: default_block_size)
+
+        # Track any additional arguments required to execute /state.nodes/
+        arguments = [BlockingArg(v, k, blockshape[k]) for k, v in blocked.items()]
+        arguments.extend([BlockingArg(v, k, default_block_count, n)
+                          for (k, n), v in superblocked.items()])
+
+        return processed, {'arguments': arguments, 'flags': 'blocking'}
+
+    def _blockshape(self, blocked, default):
+        """
+        Determine the block shape of the blocked :class:`Iteration`s in ``blocked``,
+        based on the DLE parameter ``blockshape``. If not provided, ``default``,
+        a callable, is used to derive a suggested block size from each Iteration.
+        """
         blockshape = self.params.get('blockshape')
         if not blockshape:
             # Use trivial heuristic for a suitable blockshape
-            def heuristic(dim_size):
-                ths = 8  # FIXME: This really needs to be improved
-                return ths if dim_size > ths else 1
-            blockshape = {k: heuristic for k in blocked.keys()}
+            blockshape = {k: default(k) for k in blocked.keys()}
         else:
             try:
                 nitems, nrequired = len(blockshape), len(blocked)
@@ -236,10 +368,126 @@ class DevitoRewriter(BasicRewriter):
             blockshape.update({k: None for k in blocked.keys()
                                if k not in blockshape})
 
+        return blockshape
+
+    @dle_pass
+    def _time_blocking(self, nodes, state):
+        """
+        Apply temporal blocking, or time skewing, to :class:`Iteration` trees.
+
+        A timestepping loop whose body is a single, perfect nest of parallel
+        Iterations only writing to :class:`TimeFunction`s (besides temporaries)
+        is tiled in both time and space. Each tile computes a block of consecutive
+        timesteps; at each timestep, the tile is shifted backwards by the stencil
+        radius along the skewed dimensions, so that all of the values it reads
+        have already been computed. This way, several timesteps are computed while
+        the tile is still in cache. The tiles are executed sequentially, in
+        lexicographic order. For example, the Iteration tree: ::
+
+            for time
+              for x
+                for y
+                  ...
+
+        is turned, given the stencil radius ``r`` along ``x``, into: ::
+
+            for tb = time_s; tb < time_e; tb += tb_size
+              for xb = x_s; xb < x_e + (tb_size - 1)*r; xb += xb_size
+                for time = tb; time < MIN(tb + tb_size, time_e); time++
+                  for x = MAX(x_s, xb - (time - tb)*r);
+                      x < MIN(x_e, xb + xb_size - (time - tb)*r); x++
+                    for y
+                      ...
+
+        As in loop blocking, the innermost dimension is not skewed, unless
+        ``blockinner`` is set. If ``blockshape`` is provided, its first entry is
+        used as the size of the time blocks.
+        """
+        exclude_innermost = not self.params.get('blockinner', False)
+
+        mapper = {}
+        blocked = OrderedDict()
+        for tree in retrieve_iteration_tree(nodes):
+            # Is the Iteration tree skewable ?
+            stepper = tree[0]
+            if stepper in mapper:
+                continue
+            if not stepper.dim.is_Time or stepper.direction != Forward:
+                continue
+            if len(retrieve_iteration_tree(stepper)) > 1:
+                # Unsupported (e.g., sparse operations within the timestepping loop)
+                continue
+            nest = tree[1:]
+            if not nest or not all(i.is_Parallel for i in nest):
+                continue
+            if not IsPerfectIteration().visit(nest[0]):
+                continue
+            exprs = FindNodes(Expression).visit(nest[0])
+            if len(exprs) != len(FindNodes(Expression).visit(stepper)):
+                # Unsupported (e.g., expressions outside of the space nest)
+                continue
+            iterations = list(nest)
+            if exclude_innermost and len(iterations) > 1:
+                iterations = [i for i in iterations if not i.is_Vectorizable]
+            radius = skewing_radius(exprs, [i.dim for i in iterations])
+            if radius is None:
+                # Illegal/unsupported
+                continue
+
+            # Build the Iteration over time blocks
+            name = "%s%d_tblock" % (stepper.dim.name, len(mapper))
+            tdim = blocked.setdefault(stepper, Dimension(name=name))
+            tsize = tdim.symbolic_size
+            start, finish = stepper.bounds_symbolic
+            inter_blocks = [Iteration([], tdim, [start, finish, tsize],
+                                      properties=SEQUENTIAL)]
+
+            # The number of timesteps into the current time block
+            shift = stepper.dim - tdim
+
+            # Build the Iterations over, and within, the skewed space blocks
+            intra_blocks = []
+            for i in iterations:
+                name = "%s%d_tblock" % (i.dim.name, len(mapper))
+                dim = blocked.setdefault(i, Dimension(name=name))
+                block_size = dim.symbolic_size
+                r = radius[i.dim]
+                start, finish = i.bounds_symbolic
+                inter_block = Iteration([], dim, [start, finish + (tsize - 1)*r,
+                                                  block_size], properties=SEQUENTIAL)
+                inter_blocks.append(inter_block)
+
+                start = Max(start, dim - shift*r)
+                finish = Min(finish, dim + block_size - shift*r)
+                intra_block = i._rebuild([], limits=[start, finish, 1], offsets=None)
+                intra_blocks.append(intra_block)
+
+            # Build the skewed Iteration nest, executed within each time block
+            skewed = compose_nodes(intra_blocks + [iterations[-1].nodes])
+            body = Transformer({nest[0]: skewed}).visit(stepper.nodes)
+            limits = [tdim, Min(tdim + tsize, stepper.bounds_symbolic[1]), 1]
+            intra_time = stepper._rebuild(body, limits=limits, offsets=None)
+
+            # Will replace with time-blocked loop tree
+            mapper[stepper] = compose_nodes(inter_blocks + [intra_time])
+
+        processed = Transformer(mapper).visit(nodes)
+
+        # All blocked dimensions
+        if not blocked:
+            return processed, {}
+
+        # Determine the block shape
+        default = lambda i: default_time_block_size if i.dim.is_Time else\
+            default_block_size
+        blockshape = self._blockshape(blocked, default)
+        blockshape.update({k: default(k) for k, v in blockshape.items()
+                           if v is None and k.dim.is_Time})
+
         # Track any additional arguments required to execute /state.nodes/
         arguments = [BlockingArg(v, k, blockshape[k]) for k, v in blocked.items()]
 
-        return processed, {'arguments': arguments, 'flags': 'blocking'}
+        return processed, {'arguments': arguments, 'flags': ('blocking', 'timeblocking')}
 
     @dle_pass
     def _simdize(self, nodes, state):
@@ -256,7 +504,7 @@ class DevitoRewriter(BasicRewriter):
                 handle = FindSymbols('symbolics').visit(i)
                 try:
                     aligned = [j for j in handle if j.is_Tensor and
-                               j.shape[-1] % get_simd_items(j.dtype) == 0]
+                               j.shape[-1] % get_simd_items(j._mem_dtype) == 0]
                 except KeyError:
                     aligned = []
                 if aligned:
@@ -271,6 +519,101 @@ class DevitoRewriter(BasicRewriter):
 
         return processed, {}
 
+    @dle_pass
+    def _prefetch(self, nodes, state):
+        """
+        Add software prefetches to the innermost vectorizable Iterations. In a
+        stencil sweep, the reads from the leading plane (see :func:`leading_reads`)
+        access data that none of the previous iterations has brought into cache;
+        for each of them, the data ``pf_distance`` iterations ahead is prefetched.
+        For example, for a read ``u[t0][x + 2][y][z]``: ::
+
+            __builtin_prefetch(&u[t0][x + 2][y][z + pf_distance], 0, 3);
+
+        The prefetch distance is a runtime argument, which may be auto-tuned.
+        """
+        distance = Scalar(name='pf_distance', dtype=np.int32)
+
+        mapper = {}
+        for tree in retrieve_iteration_tree(nodes):
+            candidate = tree[-1]
+            if not candidate.is_Vectorizable:
+                continue
+            exprs = FindNodes(Expression).visit(candidate)
+            reads = leading_reads(exprs, [i.dim for i in tree])
+            if not reads:
+                continue
+
+            prefetches = []
+            for i in reads:
+                n = i.base.function.indices.index(candidate.dim)
+                indices = list(i.indices)
+                indices[n] = indices[n] + distance
+                address = Byref(i.func(i.base, *indices))
+                prefetches.append(Call('__builtin_prefetch',
+                                       [address, Integer(0), Integer(3)]))
+
+            mapper[candidate] = candidate._rebuild(tuple(prefetches) + candidate.nodes)
+
+        if not mapper:
+            return nodes, {}
+
+        processed = Transformer(mapper).visit(nodes)
+
+        # The prefetch distance is an additional argument of /state.nodes/
+        arguments = [PrefetchArg(distance, default_prefetch_distance)]
+
+        return processed, {'arguments': arguments, 'flags': 'prefetch'}
+
+    @dle_pass
+    def _intrinsify(self, nodes, state):
+        """
+        Replace the innermost vectorizable Iterations with loops of explicit SIMD
+        intrinsics, for the instruction set returned by :func:`get_simd_flag`.
+        Each vector loop is followed by a scalar loop over the remainder
+        iterations. Iterations that cannot be translated (see :func:`vectorize`)
+        are left to the compiler, and thus to the pragmas added by :meth:`_simdize`.
+        """
+        isa = get_simd_flag()
+        if not any(i == isa for i, _ in simdlang) or\
+                '-mno-avx' in self.params['compiler'].cflags:
+            dle_warning("SIMD intrinsics unsupported on this platform, "
+                        "relying on compiler auto-vectorization")
+            return nodes, {}
+
+        ignore_deps = as_tuple(self._compiler_decoration('ignore-deps'))
+
+        mapper = {}
+        for tree in retrieve_iteration_tree(nodes):
+            candidate = tree[-1]
+            if not candidate.is_Vectorizable or candidate.uindices:
+                continue
+            try:
+                body, width = vectorize(candidate.nodes, candidate.dim, isa)
+            except DLEException:
+                # Unsupported, left to the compiler
+                continue
+
+            # The vector and remainder loops. Vectorizable Iterations have no
+            # loop-carried dependences, so they can always run forward
+            start, finish = candidate.bounds_symbolic
+            split = finish - Mod(finish - start, width)
+            properties = tuple(i for i in candidate.properties if i != VECTOR)
+            pragmas = tuple(i for i in candidate.pragmas
+                            if i not in ignore_deps and 'simd' not in str(i))
+            vector = candidate._rebuild(body, limits=[start, split, width],
+                                        offsets=None, direction=Forward,
+                                        properties=properties, pragmas=pragmas)
+            remainder = candidate._rebuild(limits=[split, finish, 1], offsets=None,
+                                           direction=Forward, pragmas=pragmas,
+                                           properties=properties + (REMAINDER,))
+
+            mapper[candidate] = List(body=[vector, remainder])
+
+        processed = Transformer(mapper).visit(nodes)
+
+        return processed, {'includes': ['immintrin.h'], 'flags': 'intrinsics'}
+
     @dle_pass
     def _ompize(self, nodes, state):
         """
@@ -393,6 +736,286 @@ class DevitoRewriter(BasicRewriter):
         return processed, {}
 
 
+def default_block_size(dim_size):
+    """Trivial heuristic to determine a suitable block size for a dimension."""
+    ths = 8  # FIXME: This really needs to be improved
+    return ths if dim_size > ths else 1
+
+
+default_time_block_size = 4
+"""The number of timesteps in a time block, unless specified otherwise."""
+
+default_block_count = 4
+"""The number of blocks, along each dimension, in a block of the level above
+(hierarchical blocking), unless specified otherwise."""
+
+default_prefetch_distance = 32
+"""The number of iterations, along the innermost dimension, between a software
+prefetch and the corresponding load, unless specified otherwise."""
+
+
+def skewing_radius(exprs, dimensions):
+    """
+    Return a mapper from each :class:`Dimension` in ``dimensions`` to the stencil
+    radius along it, that is the maximum distance, from the grid point being
+    computed, of the reads from the :class:`TimeFunction`s written in ``exprs``.
+    Return None if ``exprs`` cannot be time-skewed along ``dimensions``, that is
+    if anything other than TimeFunctions or temporaries private to a single grid
+    point is written, or if any access is not a constant offset away from
+    ``dimensions``.
+    """
+    written = set()
+    for e in exprs:
+        if e.is_scalar:
+            continue
+        elif e.write.is_TimeFunction:
+            written.add(e.write)
+        elif not e.write.is_Array or set(e.write.indices) & set(dimensions):
+            return None
+    if not written:
+        return None
+
+    radius = {d: 0 for d in dimensions}
+    for e in exprs:
+        for i in e.reads:
+            if not i.is_Indexed or i.base.function not in written:
+                continue
+            for d in dimensions:
+                for j in i.indices:
+                    if d not in j.free_symbols:
+                        continue
+                    offset = j - d
+                    if not offset.is_Integer:
+                        return None
+                    radius[d] = max(radius[d], abs(int(offset)))
+
+    return radius
+
+
+def leading_reads(exprs, dimensions):
+    """
+    Return the reads in ``exprs`` from the leading plane of each stencil, that
+    is, for each :class:`TensorFunction`, the reads at the largest offset along
+    the outermost space :class:`Dimension` in ``dimensions`` it is accessed
+    through. Only the Functions accessed through the innermost Dimension in
+    ``dimensions`` are considered; of the reads differing only in the innermost
+    index, the first one is retained.
+    """
+    innermost = dimensions[-1]
+
+    mapper = OrderedDict()
+    for e in exprs:
+        for i in e.reads:
+            if not i.is_Indexed or not i.base.function.is_TensorFunction:
+                continue
+            indices = i.base.function.indices
+            if innermost not in indices:
+                continue
+            sweep = [d for d in indices if d.is_Space and d in dimensions[:-1]]
+            if not sweep:
+                continue
+            offset = i.indices[indices.index(sweep[0])] - sweep[0]
+            if not offset.is_Integer:
+                continue
+            mapper.setdefault(i.base.function, []).append((int(offset), i))
+
+    reads = []
+    for f, v in mapper.items():
+        leading = [i for offset, i in v if offset == max(j for j, _ in v)]
+        n = f.indices.index(innermost)
+        reads.extend(filter_ordered(leading,
+                                    key=lambda i: i.indices[:n] + i.indices[n+1:]))
+
+    return reads
+
+
+def vectorize(nodes, dim, isa):
+    """
+    Translate ``nodes``, the body of an :class:`Iteration` over ``dim``, into
+    statements using the SIMD intrinsics of the instruction set ``isa``. Each
+    statement computes as many consecutive iterations as the lanes of a vector
+    register. Return the translated statements and the number of lanes.
+
+    Raise DLEException if the translation is not possible, for example due to
+    a mix of data types, to array accesses which are not contiguous along
+    ``dim`` (thus requiring gathers), or to operations with no intrinsic.
+    """
+    exprs = [i for i in nodes if i.is_Expression]
+    if not exprs or any(not (i.is_Expression or i.is_Call) for i in nodes):
+        raise DLEException
+    dtypes = set(np.dtype(i.dtype).name for i in exprs)
+    if len(dtypes) != 1 or (isa, dtypes.pop()) not in simdlang:
+        raise DLEException
+    dtype = np.dtype(exprs[0].dtype)
+    lang = simdlang[(isa, dtype.name)]
+
+    temporaries = set(i.expr.lhs for i in exprs if i.is_scalar)
+    vectors = set()
+
+    def address(indexed):
+        # Only unit-stride, contiguous accesses along /dim/ are supported
+        if not indexed.is_Indexed:
+            raise DLEException
+        offset = indexed.indices[-1] - dim
+        if not offset.is_Integer or\
+                any(dim in i.free_symbols for i in indexed.indices[:-1]) or\
+                np.dtype(indexed.base.function.dtype) != dtype:
+            raise DLEException
+        return ccode(Byref(indexed))
+
+    def translate(expr):
+        free = expr.free_symbols
+        if free & (temporaries - vectors):
+            # Temporary read before being written, i.e. across iterations
+            raise DLEException
+        elif dim not in free and not free & vectors:
+            # Invariant along /dim/, hence broadcast
+            return '%s(%s)' % (lang['set1'], ccode(expr))
+        elif expr in vectors:
+            return expr.name
+        elif expr.is_Indexed:
+            return '%s(%s)' % (lang['loadu'], address(expr))
+        elif expr.is_Add or expr.is_Mul:
+            op = lang['add'] if expr.is_Add else lang['mul']
+            return reduce(lambda a, b: '%s(%s, %s)' % (op, a, b),
+                          [translate(i) for i in expr.args])
+        elif expr.is_Pow and expr.exp.is_Integer and expr.exp != 0:
+            base = translate(expr.base)
+            ret = reduce(lambda a, b: '%s(%s, %s)' % (lang['mul'], a, b),
+                         [base]*abs(int(expr.exp)))
+            if expr.exp < 0:
+                ret = '%s(%s(1), %s)' % (lang['div'], lang['set1'], ret)
+            return ret
+        elif isinstance(expr, FMA) and 'fmadd' in lang:
+            return '%s(%s)' % (lang['fmadd'], ', '.join(translate(i) for i in expr.args))
+        else:
+            raise DLEException
+
+    body = []
+    for i in nodes:
+        if i.is_Call:
+            body.append(i)
+            continue
+        lhs, rhs = i.expr.lhs, translate(i.expr.rhs)
+        if lhs in vectors:
+            body.append(Element(cgen.Assign(lhs.name, rhs)))
+        elif lhs in temporaries:
+            vectors.add(lhs)
+            body.append(Element(cgen.Initializer(cgen.Value(lang['type'], lhs.name),
+                                                 rhs)))
+        else:
+            body.append(Element(cgen.Statement('%s(%s, %s)' % (lang['storeu'],
+                                                               address(lhs), rhs))))
+
+    return body, simdinfo[isa] // dtype.itemsize
+
+
+def fuse(nest0, nest1):
+    """
+    Fuse the :class:`Iteration` nests ``nest0`` and ``nest1``, down to but
+    excluding the innermost Iterations. Return None if the two nests cannot
+    be fused, either because their outer Iterations don't match or because
+    fusion would break a data dependence between ``nest0`` and ``nest1``.
+    """
+    # The Iterations to be fused
+    levels = []
+    i0, i1 = nest0, nest1
+    while i0.is_Iteration and i1.is_Iteration:
+        key0 = (i0.dim, i0.limits, i0.direction, set(i0.properties), i0.uindices)
+        key1 = (i1.dim, i1.limits, i1.direction, set(i1.properties), i1.uindices)
+        if key0 != key1 or not all(is_integer(i) for i in i0.offsets + i1.offsets):
+            break
+        if not all(FindNodes(Iteration).visit(i.nodes) for i in [i0, i1]):
+            # Innermost Iterations are kept separate
+            break
+        levels.append((i0, i1))
+        if len(i0.nodes) != 1 or len(i1.nodes) != 1:
+            break
+        i0, i1 = i0.nodes[0], i1.nodes[0]
+    if not levels:
+        return None
+    dims = [i.dim for i, _ in levels]
+
+    # Is fusion legal ? No dependences between the two nests may be carried by
+    # the fused Dimensions. Dependences through scalars are also disallowed, as
+    # the nests would no longer see the scalar's final value
+    exprs0 = [e.expr for e in FindNodes(Expression).visit(nest0)]
+    exprs1 = [e.expr for e in FindNodes(Expression).visit(nest1)]
+    scope = Scope(exprs0 + exprs1)
+    for dep in scope.d_all:
+        if (dep.source.timestamp < len(exprs0)) == (dep.sink.timestamp < len(exprs0)):
+            # Within the same nest
+            continue
+        if not dep.findices or any(dep.is_carried(d) for d in dims):
+            return None
+
+    # Fused Iterations span the union of the two iteration spaces
+    fused = []
+    for i0, i1 in levels:
+        offsets = (min(i0.offsets[0], i1.offsets[0]), max(i0.offsets[1], i1.offsets[1]))
+        fused.append(i0._rebuild(offsets=offsets))
+
+    # Guard the original bodies, if necessary
+    body = []
+    for n, nest in enumerate([nest0, nest1]):
+        guards = []
+        for i, f in zip([j[n] for j in levels], fused):
+            start, finish = i.bounds_symbolic
+            if i.offsets[0] != f.offsets[0]:
+                guards.append(Ge(i.dim, start))
+            if i.offsets[1] != f.offsets[1]:
+                guards.append(Lt(i.dim, finish))
+        nodes = levels[-1][n].nodes
+        if guards:
+            body.append(Conditional(And(*guards), nodes))
+        else:
+            # Keep it self-contained, so that the fused nest is still perfect
+            body.append(List(body=nodes))
+
+    return compose_nodes(fused + [tuple(body)])
+
+
+class DevitoTimeBlockingRewriter(DevitoRewriter):
+
+    """
+    This Rewriter applies temporal blocking (see :meth:`_time_blocking`) on top
+    of the transformations performed by :class:`DevitoRewriter`. Loop blocking
+    is still applied to the Iteration trees not amenable to temporal blocking.
+    """
+
+    def _pipeline(self, state):
+        self._avoid_denormals(state)
+        self._loop_fission(state)
+        self._time_blocking(state)
+        self._loop_blocking(state)
+        self._simdize(state)
+        if self.params['openmp'] is True:
+            self._ompize(state)
+        self._create_elemental_functions(state)
+        self._minimize_remainders(state)
+
+
+class DevitoIntrinsicsRewriter(DevitoRewriter):
+
+    """
+    This Rewriter emits explicit SIMD intrinsics (see :meth:`_intrinsify`) for
+    the innermost vectorizable Iterations, instead of relying on compiler
+    auto-vectorization, on top of the transformations performed by
+    :class:`DevitoRewriter`.
+    """
+
+    def _pipeline(self, state):
+        self._avoid_denormals(state)
+        self._loop_fission(state)
+        self._loop_blocking(state)
+        self._simdize(state)
+        if self.params['openmp'] is True:
+            self._ompize(state)
+        self._create_elemental_functions(state)
+        self._intrinsify(state)
+        self._minimize_remainders(state)
+
+
 class DevitoRewriterSafeMath(DevitoRewriter):
 
     """
@@ -414,9 +1037,11 @@ class DevitoSpeculativeRewriter(DevitoRewriter):
 
     def _pipeline(self, state):
         self._avoid_denormals(state)
+        self._loop_fusion(state)
         self._loop_fission(state)
         self._loop_blocking(state)
         self._simdize(state)
+        self._prefetch(state)
         self._nontemporal_stores(state)
         if self.params['openmp'] is True:
             self._ompize(state)
@@ -457,9 +1082,13 @@ class DevitoCustomRewriter(DevitoSpeculativeRewriter):
     passes_mapper = {
         'denormals': DevitoSpeculativeRewriter._avoid_denormals,
         'blocking': DevitoSpeculativeRewriter._loop_blocking,
+        'timeblocking': DevitoSpeculativeRewriter._time_blocking,
         'openmp': DevitoSpeculativeRewriter._ompize,
         'simd': DevitoSpeculativeRewriter._simdize,
         'fission': DevitoSpeculativeRewriter._loop_fission,
+        'fusion': DevitoSpeculativeRewriter._loop_fusion,
+        'intrinsics': DevitoSpeculativeRewriter._intrinsify,
+        'prefetch': DevitoSpeculativeRewriter._prefetch,
         'split': DevitoSpeculativeRewriter._create_elemental_functions
     }
 
@@ -2,16 +2,18 @@ import abc
 from collections import OrderedDict, defaultdict
 from time import time
 
+from devito.ir.iet import Expression, FindNodes
 from devito.logger import dle
 from devito.tools import as_tuple
 
 
-__all__ = ['AbstractRewriter', 'Arg', 'BlockingArg', 'State', 'dle_pass']
+__all__ = ['AbstractRewriter', 'Arg', 'BlockingArg', 'PrefetchArg', 'State', 'dle_pass']
 
 
 def dle_pass(func):
 
     def wrapper(self, state, **kwargs):
+        nexprs_in = state.nexprs
         tic = time()
         # Processing
         processed, extra = func(self, state.nodes, state)
@@ -22,6 +24,7 @@ def dle_pass(func):
         toc = time()
 
         self.timings[func.__name__] = toc - tic
+        self.nexprs[func.__name__] = (nexprs_in, state.nexprs)
 
     return wrapper
 
@@ -46,6 +49,12 @@ class State(object):
         self.includes.extend(list(kwargs.get('includes', [])))
         self.flags.update({i: True for i in as_tuple(kwargs.get('flags', ()))})
 
+    @property
+    def nexprs(self):
+        """The number of expressions in the processed Iteration/Expression trees."""
+        nodes = (self.nodes,) + tuple(self.elemental_functions)
+        return len(FindNodes(Expression).visit(nodes))
+
 
 class Arg(object):
 
@@ -61,7 +70,7 @@ class Arg(object):
 
 class BlockingArg(Arg):
 
-    def __init__(self, blocked_dim, iteration, value):
+    def __init__(self, blocked_dim, iteration, value, level=0):
         """
         Represent an argument introduced in the kernel by Rewriter._loop_blocking.
 
@@ -69,19 +78,39 @@ class BlockingArg(Arg):
         :param iteration: The :class:`Iteration` object from which the ``blocked_dim``
                           was derived.
         :param value: A suggested value determined by the DLE.
+        :param level: (Optional) the blocking level. Level 0, the default, is that
+                      of the blocks of iterations; with hierarchical blocking, the
+                      value at level ``n > 0`` is the number of level ``n-1``
+                      blocks in a block.
         """
         super(BlockingArg, self).__init__(blocked_dim, value)
         self.iteration = iteration
+        self.level = level
 
     def __repr__(self):
-        return "DLE-BlockingArg[%s,%s,suggested=%s]" %\
-            (self.argument, self.original_dim, self.value)
+        return "DLE-BlockingArg[%s,%s,level=%d,suggested=%s]" %\
+            (self.argument, self.original_dim, self.level, self.value)
 
     @property
     def original_dim(self):
         return self.iteration.dim
 
 
+class PrefetchArg(Arg):
+
+    def __init__(self, distance, value):
+        """
+        Represent an argument introduced in the kernel by Rewriter._prefetch.
+
+        :param distance: The :class:`Scalar` representing the prefetch distance.
+        :param value: A suggested value determined by the DLE.
+        """
+        super(PrefetchArg, self).__init__(distance, value)
+
+    def __repr__(self):
+        return "DLE-PrefetchArg[%s,suggested=%s]" % (self.argument, self.value)
+
+
 class AbstractRewriter(object):
     """
     Transform Iteration/Expression trees to generate high performance C.
@@ -106,6 +135,7 @@ class AbstractRewriter(object):
         self.params = params
 
         self.timings = OrderedDict()
+        self.nexprs = OrderedDict()
 
     def run(self):
         """The optimization pipeline, as a sequence of AST transformation passes."""
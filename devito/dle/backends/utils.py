@@ -37,6 +37,29 @@ simdinfo = {
 }
 
 
+def _intrinsics(width, suffix, fma=True):
+    handle = {i: '_mm%d_%s_p%s' % (width, i, suffix)
+              for i in ['loadu', 'storeu', 'set1', 'add', 'mul', 'div']}
+    handle['type'] = '__m%d%s' % (width, '' if suffix == 's' else suffix)
+    if fma:
+        handle['fmadd'] = '_mm%d_fmadd_p%s' % (width, suffix)
+    return handle
+
+
+"""
+SIMD intrinsics, for each supported (instruction set, data type). FMA3 is
+available on all processors supporting AVX2 or AVX-512
+"""
+simdlang = {
+    ('avx', 'float32'): _intrinsics(256, 's', fma=False),
+    ('avx', 'float64'): _intrinsics(256, 'd', fma=False),
+    ('avx2', 'float32'): _intrinsics(256, 's'),
+    ('avx2', 'float64'): _intrinsics(256, 'd'),
+    ('avx512f', 'float32'): _intrinsics(512, 's'),
+    ('avx512f', 'float64'): _intrinsics(512, 'd')
+}
+
+
 def get_simd_flag():
     """Retrieve the best SIMD flag on the current architecture."""
     if get_simd_flag.flag is None:
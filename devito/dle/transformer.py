@@ -1,7 +1,8 @@
 from devito.ir.iet import Node
 from devito.dle.backends import (State, BasicRewriter, DevitoCustomRewriter,
                                  DevitoRewriter, DevitoRewriterSafeMath,
-                                 DevitoSpeculativeRewriter)
+                                 DevitoIntrinsicsRewriter, DevitoSpeculativeRewriter,
+                                 DevitoTimeBlockingRewriter)
 from devito.exceptions import DLEException
 from devito.logger import dle_warning
 from devito.parameters import configuration
@@ -13,6 +14,8 @@ modes = {
     'basic': BasicRewriter,
     'advanced': DevitoRewriter,
     'advanced-safemath': DevitoRewriterSafeMath,
+    'advanced-timeblocking': DevitoTimeBlockingRewriter,
+    'advanced-intrinsics': DevitoIntrinsicsRewriter,
     'speculative': DevitoSpeculativeRewriter
 }
 """The DLE transformation modes."""
@@ -20,7 +23,8 @@ modes = {
 default_options = {
     'blockinner': False,
     'blockshape': None,
-    'blockalways': False
+    'blockalways': False,
+    'blocklevels': 1
 }
 """Default values for the various optimization options."""
 
@@ -30,7 +34,7 @@ configuration.add('dle_options',
                   list(default_options))
 
 
-def transform(node, mode='basic', options=None):
+def transform(node, mode='basic', options=None, profile=None):
     """
     Transform Iteration/Expression trees to generate highly optimized C code.
 
@@ -39,6 +43,8 @@ def transform(node, mode='basic', options=None):
     :param mode: Drive the tree transformation. ``mode`` is a string indicating
                  a certain optimization pipeline.
     :param options: A dictionary with additional information to drive the DLE.
+    :param profile: (Optional) a :class:`BuildProfile` to record the time spent
+                    in, and the expression counts of, each transformation pass.
 
     The ``mode`` parameter accepts the following values: ::
 
@@ -46,9 +52,15 @@ def transform(node, mode='basic', options=None):
         * 'basic': Add instructions to avoid denormal numbers and create elemental
                    functions for rapid JIT-compilation.
         * 'advanced': 'basic', vectorization, loop blocking.
+        * 'advanced-timeblocking': 'advanced', plus temporal blocking (time
+                                   skewing) of the timestepping loop.
+        * 'advanced-intrinsics': 'advanced', but the innermost loops are vectorized
+                                 through explicit SIMD intrinsics (AVX, AVX2 or
+                                 AVX-512) rather than by the compiler.
         * 'speculative': Apply all of the 'advanced' transformations, plus other
                          transformations that might increase (or possibly decrease)
-                         performance.
+                         performance, such as loop fusion, software prefetching
+                         and nontemporal stores.
 
     The ``options`` parameter accepts the following values: ::
 
@@ -59,6 +71,10 @@ def transform(node, mode='basic', options=None):
                         heuristic.
         * 'blockalways': Apply blocking even though the DLE thinks it's not
                          worthwhile applying it.
+        * 'blocklevels': The number of levels of loop blocking (an integer,
+                         defaults to 1). With more than one level, blocks are
+                         grouped into blocks of blocks, and only the outermost
+                         level is parallelized.
     """
     assert isinstance(node, Node)
 
@@ -85,10 +101,16 @@ def transform(node, mode='basic', options=None):
     elif mode not in modes:
         try:
             rewriter = DevitoCustomRewriter(node, mode, params)
-            return rewriter.run()
+            state = rewriter.run()
         except DLEException:
             dle_warning("Unknown transformer mode(s) %s" % mode)
             return State(node)
     else:
         rewriter = modes[mode](node, params)
-        return rewriter.run()
+        state = rewriter.run()
+
+    if profile is not None:
+        for k, v in rewriter.timings.items():
+            profile.add('dle.%s' % k[1:], v, *rewriter.nexprs[k])
+
+    return state
@@ -51,18 +51,17 @@ def collect(exprs):
             if handle:
                 candidates[expr.rhs] = ExprData(*handle)
 
+    # Find aliasing expressions. Aliasing is an equivalence relation, and two
+    # expressions alias each other if and only if they have the same signature,
+    # so the groups are built by hash lookup rather than by pairwise comparison
+    groups = OrderedDict()
+    for k, v in candidates.items():
+        groups.setdefault(signature(k, v.offsets), []).append(k)
+
     aliases = OrderedDict()
     mapper = OrderedDict()
-    unseen = list(candidates)
-    while unseen:
-        # Find aliasing expressions
-        handle = unseen.pop(0)
-        group = [handle]
-        for e in list(unseen):
-            if compare(handle, e) and\
-                    is_translated(candidates[handle].offsets, candidates[e].offsets):
-                group.append(e)
-                unseen.remove(e)
+    for group in groups.values():
+        handle = group[0]
 
         # Try creating a basis for the aliasing expressions' offsets
         offsets = [tuple(candidates[e].offsets) for e in group]
@@ -213,6 +212,30 @@ def is_translated(ofs1, ofs2):
     return len(distance(ofs1, ofs2)) == 1
 
 
+def signature(expr, offsets):
+    """
+    Return a hashable, translation-invariant signature for ``expr``, whose
+    indexed objects are at ``offsets``.
+
+    The signature consists of the expression structure, with each indexed object
+    reduced to its base, plus the offsets of the indexed objects relative to the
+    first one. Two expressions ``e1`` and ``e2`` have the same signature if and
+    only if ``compare(e1, e2)`` and ``is_translated(ofs1, ofs2)``.
+    """
+    def structure(e):
+        if e.is_Atom:
+            return (type(e), e)
+        elif isinstance(e, Indexed):
+            return (type(e), len(e.args), e.base)
+        else:
+            return (type(e), tuple(structure(i) for i in e.args))
+
+    reference = offsets[0]
+    distances = tuple(tuple(i - j for i, j in zip(ofs, reference)) for ofs in offsets)
+
+    return structure(expr), distances
+
+
 def compare(e1, e2):
     """
     Return True if the two expressions e1 and e2 alias each other, False otherwise.
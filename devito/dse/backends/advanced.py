@@ -2,12 +2,20 @@ from __future__ import absolute_import
 
 from collections import OrderedDict
 
+import numpy as np
+
 from devito.ir import Cluster, ClusterGroup, IterationSpace, groupby
 from devito.dse.aliases import collect
 from devito.dse.backends import BasicRewriter, dse_pass
-from devito.symbolics import Eq, estimate_cost, xreplace_constrained, iq_timeinvariant
+from devito.parameters import configuration
+from devito.dimension import Dimension
+from devito.logger import dse
+from devito.symbolics import (Eq, FMA, FMAF, count_divisions, estimate_cost,
+                              q_reciprocal, retrieve_indexed, search,
+                              xreplace_constrained, iq_timeinvariant)
 from devito.dse.manipulation import (common_subexprs_elimination, collect_nested,
-                                     compact_temporaries)
+                                     compact_temporaries, fuse_multiply_add, horner)
+from devito.tools import filter_ordered, flatten
 from devito.types import Indexed, Scalar, Array
 
 
@@ -18,6 +26,18 @@ class AdvancedRewriter(BasicRewriter):
         self._eliminate_inter_stencil_redundancies(state)
         self._eliminate_intra_stencil_redundancies(state)
         self._factorize(state)
+        self._hoist_reciprocals(state)
+        if self.fma:
+            self._optimize_fma(state)
+
+    @property
+    def fma(self):
+        """True if fused multiply-adds were requested through
+        ``configuration['dse-fma']`` and the target provides them."""
+        if not configuration['dse-fma']:
+            return False
+        return configuration['isa'] in ['avx2', 'avx512'] or\
+            configuration['platform'] in ['hsw', 'bdw', 'skx', 'knl']
 
     @dse_pass
     def _extract_time_invariants(self, cluster, template, with_cse=True,
@@ -73,6 +93,100 @@ class AdvancedRewriter(BasicRewriter):
 
         return cluster.rebuild(processed)
 
+    @dse_pass
+    def _hoist_reciprocals(self, cluster, template, **kwargs):
+        """
+        Strength-reduce divisions by loop-invariant denominators into
+        multiplications by precomputed reciprocals: ::
+
+            * If the denominator only depends on symbolic constants (e.g., the
+              grid spacing or the timestep), the reciprocal is evaluated once,
+              outside of any loop, and stored in a scalar temporary;
+            * If the denominator is a time-invariant :class:`Function` accessed
+              at the current grid point, the reciprocal is precomputed, outside
+              of the time loop, into a temporary :class:`Array`.
+
+        Examples
+        ========
+        Let ``t`` be the time dimension, ``x, y`` the space dimensions. Then: ::
+
+            u[t+1,x,y] = (u[t,x+1,y] - u[t,x-1,y])/(h_x*m[x,y])
+            >>>
+            rcp0 = 1/h_x
+            rcp1[x,y] = 1/m[x,y]
+            u[t+1,x,y] = (u[t,x+1,y] - u[t,x-1,y])*rcp0*rcp1[x,y]
+        """
+        if cluster.is_sparse:
+            return cluster
+
+        g = cluster.trace
+        timed = any(i.is_Time for i in cluster.ispace.dimensions)
+
+        scalars = OrderedDict()
+        arrays = OrderedDict()
+        reciprocals = flatten(search(e, q_reciprocal, 'all') for e in cluster.exprs)
+        for i in filter_ordered(reciprocals):
+            base = i.base
+            if not base.atoms(Indexed):
+                if any(isinstance(j, Dimension) or j in g for j in base.free_symbols):
+                    continue
+                scalars[i] = Scalar(name=template(len(scalars) + len(arrays)))
+            elif base.is_Indexed and timed:
+                function = base.base.function
+                if not function.is_SymbolicFunction or\
+                        tuple(base.indices) != tuple(function.indices) or\
+                        any(j.is_Time for j in function.indices) or\
+                        not g.time_invariant(base):
+                    continue
+                shape = tuple(j.symbolic_extent for j in function.indices)
+                arrays[i] = Array(name=template(len(scalars) + len(arrays)),
+                                  shape=shape, dimensions=function.indices)
+        if not scalars and not arrays:
+            return cluster
+
+        # The scalar reciprocals are computed once, outside of any loop
+        rules = OrderedDict()
+        processed = []
+        if scalars:
+            exprs = []
+            for k, v in scalars.items():
+                rules[k] = v.indexify()
+                exprs.append(Eq(rules[k], k))
+            processed.append(Cluster(exprs, IterationSpace([])))
+
+        # The reciprocal Arrays are computed once, outside of the time loop
+        intervals, sub_iterators, directions = cluster.ispace.args
+        for k, v in arrays.items():
+            indices = v.indices
+            rules[k] = Indexed(v.indexed, *indices)
+            ispace = IterationSpace(intervals.drop([j for j in intervals.dimensions
+                                                    if j not in indices]),
+                                    sub_iterators, directions)
+            processed.append(Cluster([Eq(rules[k], k)], ispace))
+
+        exprs = [e.xreplace(rules) for e in cluster.exprs]
+        dse("Hoisted %d reciprocals, removing %d divisions per grid point" %
+            (len(rules), count_divisions(cluster.exprs) - count_divisions(exprs)))
+
+        return processed + [cluster.rebuild(exprs)]
+
+    @dse_pass
+    def _optimize_fma(self, cluster, *args, **kwargs):
+        """
+        Rewrite polynomials in Horner form, and then sums of products into chains
+        of fused multiply-adds. Each multiply-add becomes an explicit :class:`FMA`,
+        as the C compiler isn't allowed to contract ``a*b + c`` in ISO C mode.
+        """
+        indexeds = flatten(retrieve_indexed(e, mode='all') for e in cluster.exprs)
+        if any(np.dtype(i.base.function.dtype) == np.float64 for i in indexeds):
+            fma = FMA
+        else:
+            fma = FMAF
+
+        processed = [fuse_multiply_add(horner(e), fma) for e in cluster.exprs]
+
+        return cluster.rebuild(processed)
+
     @dse_pass
     def _eliminate_inter_stencil_redundancies(self, cluster, template, **kwargs):
         """
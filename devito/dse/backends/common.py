@@ -23,6 +23,7 @@ def dse_pass(func):
             template = None
 
         # Invoke the DSE pass
+        nexprs_in = sum(len(c.exprs) for c in state.clusters)
         tic = time()
         state.update(flatten([func(self, c, template, **kwargs)
                               for c in state.clusters]))
@@ -31,6 +32,7 @@ def dse_pass(func):
         # Profiling
         key = '%s%d' % (func.__name__, len(self.timings))
         self.timings[key] = toc - tic
+        self.nexprs[key] = (nexprs_in, sum(len(c.exprs) for c in state.clusters))
         if self.profile:
             candidates = [c.exprs for c in state.clusters if c.is_dense]
             self.ops[key] = estimate_cost(flatten(candidates))
@@ -63,7 +65,8 @@ class AbstractRewriter(object):
         '_extract_time_invariants': 'ti',
         '_extract_time_varying': 'td',
         '_eliminate_intra_stencil_redundancies': 'tcse',
-        '_eliminate_inter_stencil_redundancies': 'r'
+        '_eliminate_inter_stencil_redundancies': 'r',
+        '_hoist_reciprocals': 'rcp'
     }
 
     """
@@ -80,6 +83,7 @@ class AbstractRewriter(object):
 
         self.ops = OrderedDict()
         self.timings = OrderedDict()
+        self.nexprs = OrderedDict()
 
     def run(self, cluster):
         state = State(cluster)
@@ -12,6 +12,9 @@ class SpeculativeRewriter(AdvancedRewriter):
         self._eliminate_inter_stencil_redundancies(state)
         self._eliminate_intra_stencil_redundancies(state)
         self._factorize(state)
+        self._hoist_reciprocals(state)
+        if self.fma:
+            self._optimize_fma(state)
 
     @dse_pass
     def _extract_time_varying(self, cluster, template, **kwargs):
@@ -45,6 +48,9 @@ class AggressiveRewriter(SpeculativeRewriter):
 
         self._factorize(state)
         self._eliminate_intra_stencil_redundancies(state)
+        self._hoist_reciprocals(state)
+        if self.fma:
+            self._optimize_fma(state)
 
     @dse_pass
     def _extract_sum_of_products(self, cluster, template, **kwargs):
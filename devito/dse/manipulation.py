@@ -1,14 +1,15 @@
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 
-from sympy import collect, collect_const
+from sympy import Add, Mul, collect, collect_const
 
 from devito.ir import FlowGraph
-from devito.symbolics import Eq, count, estimate_cost, q_op, q_leaf, xreplace_constrained
+from devito.symbolics import (Eq, FMA, count, estimate_cost, pow_to_mul, q_op, q_leaf,
+                              xreplace_constrained)
 from devito.types import Indexed, Array
 from devito.tools import flatten
 
-__all__ = ['promote_scalar_expressions', 'collect_nested',
-           'common_subexprs_elimination', 'compact_temporaries']
+__all__ = ['promote_scalar_expressions', 'collect_nested', 'horner',
+           'fuse_multiply_add', 'common_subexprs_elimination', 'compact_temporaries']
 
 
 def promote_scalar_expressions(exprs, shape, indices, onstack):
@@ -79,6 +80,133 @@ def collect_nested(expr, aggressive=False):
     return run(expr)[0]
 
 
+def horner(expr):
+    """
+    Rewrite the polynomials in ``expr`` in Horner form, checking all levels of the
+    expression tree. For example: ::
+
+        a*x**3 + b*x**2 + c*x + d --> d + x*(c + x*(b + a*x))
+
+    A sum is rewritten only if this reduces its operation count once the powers
+    are turned into multiplications.
+
+    :param expr: the expression to be rewritten.
+    """
+    if q_leaf(expr) or not expr.args:
+        return expr
+
+    args = [horner(i) for i in expr.args]
+    if any(i is not j for i, j in zip(args, expr.args)):
+        expr = expr.func(*args)
+
+    if not expr.is_Add:
+        return expr
+
+    # Split each term into coefficient and power of its terminal factors
+    terms = []
+    degrees = Counter()
+    for term in expr.args:
+        powers = OrderedDict()
+        for factor in Mul.make_args(term):
+            base, exp = factor.as_base_exp()
+            if (base.is_Symbol or base.is_Indexed) and exp.is_Integer and exp > 0:
+                powers[base] = int(exp)
+        terms.append((term, powers))
+        for base, exp in powers.items():
+            degrees[base] = max(degrees[base], exp)
+
+    # The Horner variable is the terminal of highest degree
+    candidates = [k for k, v in degrees.items() if v > 1]
+    if not candidates:
+        return expr
+    x = max(candidates, key=lambda i: degrees[i])
+
+    coeffs = OrderedDict([(i, []) for i in range(degrees[x] + 1)])
+    for term, powers in terms:
+        exp = powers.get(x, 0)
+        coeffs[exp].append(term/x**exp if exp > 0 else term)
+
+    handle = Add(*coeffs.pop(degrees[x]))
+    for exp in reversed(list(coeffs)):
+        handle = Add(*coeffs[exp]) + x*handle
+
+    if estimate_cost(pow_to_mul(handle)) < estimate_cost(pow_to_mul(expr)):
+        return handle
+    else:
+        return expr
+
+
+def fuse_multiply_add(expr, fma=FMA):
+    """
+    Turn the sums of products in ``expr`` into chains of fused multiply-adds,
+    checking all levels of the expression tree. For example: ::
+
+        a*b + c*(d + e) + f --> fma(c, d + e, fma(a, b, f))
+
+    The operands of the products are left untouched, so the grouping of, for
+    example, the coefficients of a factorized stencil is preserved.
+
+    :param expr: the expression to be rewritten.
+    :param fma: the :class:`FMA` type to be used.
+    """
+    if q_leaf(expr) or not expr.args:
+        return expr
+
+    args = [fuse_multiply_add(i, fma) for i in expr.args]
+    if any(i is not j for i, j in zip(args, expr.args)):
+        expr = expr.func(*args)
+
+    if not expr.is_Add:
+        return expr
+
+    # Split each product into the two operands of a multiply-add
+    products = []
+    others = []
+    for term in expr.args:
+        operands = _as_multiply_add(term) if term.is_Mul else None
+        if operands is None:
+            others.append(term)
+        else:
+            products.append((term, operands))
+
+    if not products or (not others and len(products) == 1):
+        return expr
+
+    if others:
+        handle = Add(*others)
+    else:
+        handle = products.pop(0)[0]
+    for _, (a, b) in products:
+        handle = fma(a, b, handle)
+
+    return handle
+
+
+def _as_multiply_add(expr):
+    """
+    Split the product ``expr`` into two operands ``a, b`` such that ``expr = a*b``
+    and neither ``a`` nor ``b`` is a trivial coefficient (1 or -1). Return None
+    if this isn't possible.
+    """
+    numbers = [i for i in expr.args if i.is_Number]
+    factors = [i for i in expr.args if not i.is_Number]
+    coeff = Mul(*numbers)
+    if not factors:
+        return None
+    elif coeff == 1 or coeff == -1:
+        if len(factors) < 2:
+            return None
+        # A negation is free when applied to a terminal
+        leaves = [i for i in factors if q_leaf(i)]
+        if coeff == -1 and not leaves:
+            return None
+        a = leaves[0] if coeff == -1 else factors[0]
+        factors.remove(a)
+        return coeff*a, Mul(*factors)
+    else:
+        return coeff, Mul(*factors)
+
+
 def common_subexprs_elimination(exprs, make, mode='default'):
     """
     Perform common subexpressions elimination.
@@ -89,15 +217,21 @@ def common_subexprs_elimination(exprs, make, mode='default'):
     :param make: A function to construct symbols used for replacement.
                  The function takes as input an integer ID; ID is computed internally
                  and used as a unique identifier for the constructed symbols.
+    :param mode: Either 'default', which detects redundancies on a hash-consed
+                 DAG of ``exprs`` in near-linear time, or 'tree', which repeatedly
+                 counts and replaces sub-expressions in the SymPy trees.
     """
 
     # Note: not defaulting to SymPy's CSE() function for three reasons:
     # - it also captures array index access functions (eg, i+1 in A[i+1] and B[i+1]);
     # - it sometimes "captures too much", losing factorization opportunities;
     # - very slow
-    # TODO: a second "sympy" mode will be provided, relying on SymPy's CSE() but
+    # TODO: a third "sympy" mode will be provided, relying on SymPy's CSE() but
     # also ensuring some sort of post-processing
-    assert mode == 'default'  # Only supported mode ATM
+    assert mode in ['default', 'tree']
+
+    if mode == 'default':
+        return ExprDAG(exprs).cse(make)
 
     processed = list(exprs)
     mapped = []
@@ -130,6 +264,123 @@ def common_subexprs_elimination(exprs, make, mode='default'):
     return processed
 
 
+class ExprDAG(object):
+
+    """
+    A hash-consed DAG representation of a collection of SymPy expressions.
+
+    Each distinct sub-expression becomes a node with an integer ID. Two
+    sub-expressions are the same node if and only if they have the same type
+    and the same children, so structural equality is established in O(arity)
+    rather than by recursively comparing SymPy trees. IDs are assigned in
+    post-order, hence a node's ID is always greater than its children's.
+
+    :param exprs: The SymPy expressions; as in the DSE, Numbers, Symbols and
+                  Indexeds are leaves, so index functions are never captured.
+    """
+
+    def __init__(self, exprs):
+        self.exprs = list(exprs)
+
+        # Per-node information, indexed by node ID
+        self.nodes = []
+        self.children = []
+        self.costs = []
+        self.ops = []
+        # Position of the first occurrence of a node in a pre-order visit of
+        # /exprs/, used to break ties deterministically
+        self.ranks = []
+
+        self._ids = {}
+        self._cache = {}
+        self._visits = 0
+        self.roots = [self._intern(i) for i in self.exprs]
+
+    def _intern(self, expr):
+        try:
+            # Shortcut: the very same object has been seen before
+            return self._cache[id(expr)][0]
+        except KeyError:
+            pass
+        rank = self._visits
+        self._visits += 1
+        if q_leaf(expr):
+            children = ()
+            # The type is part of the key as, e.g., 2 == 2.0 in SymPy
+            key = (type(expr), expr)
+        else:
+            children = tuple(self._intern(i) for i in expr.args)
+            key = (expr.func, children)
+        try:
+            node = self._ids[key]
+        except KeyError:
+            node = self._ids[key] = len(self.nodes)
+            self.nodes.append(expr)
+            self.children.append(children)
+            self.ops.append(q_op(expr))
+            self.costs.append(self._cost(expr, children))
+            self.ranks.append(rank)
+        # Retain /expr/ so that its id is not recycled
+        self._cache[id(expr)] = (node, expr)
+        return node
+
+    def _cost(self, expr, children):
+        # Same as ``estimate_cost(expr)``, but computed incrementally
+        if not q_op(expr):
+            cost = 0
+        elif expr.is_Function:
+            cost = 1
+        else:
+            cost = len(expr.args) - (1 + sum(True for i in expr.args if i.is_Integer))
+        return cost + sum(self.costs[i] for i in children)
+
+    def cse(self, make):
+        """
+        Perform common subexpressions elimination. As in the 'tree' mode, the
+        most expensive among the repeated sub-expressions are assigned to a
+        temporary first, so that their operands are no longer counted as
+        repeated unless they also appear elsewhere.
+
+        :param make: A function to construct symbols used for replacement,
+                     given an integer ID.
+        """
+        # Visit the nodes by decreasing cost; parents never cost less than
+        # their children, and have greater IDs, so this is still topological
+        schedule = sorted(range(len(self.nodes)), key=lambda i: (-self.costs[i], -i))
+
+        counter = [0]*len(self.nodes)
+        for i in self.roots:
+            counter[i] += 1
+        picked = []
+        for i in schedule:
+            if self.ops[i] and counter[i] > 1:
+                picked.append(i)
+                n = 1
+            else:
+                n = counter[i]
+            for j in self.children[i]:
+                counter[j] += n
+
+        # Temporaries are numbered from the least expensive, so that the
+        # output reads in (mostly) topological order
+        picked = sorted(picked, key=lambda i: (self.costs[i], -self.ranks[i]))
+        mapper = OrderedDict([(i, make(n)) for n, i in enumerate(picked)])
+
+        # Rebuild the SymPy expressions, bottom-up
+        rebuilt = {}
+        for i in range(len(self.nodes)):
+            args = [mapper.get(j, rebuilt[j]) for j in self.children[i]]
+            if all(a is b for a, b in zip(args, self.nodes[i].args)):
+                rebuilt[i] = self.nodes[i]
+            else:
+                rebuilt[i] = self.nodes[i].func(*args)
+
+        processed = [Eq(v, rebuilt[k]) for k, v in mapper.items()]
+        processed.extend(mapper.get(i, rebuilt[i]) for i in self.roots)
+
+        return processed
+
+
 def compact_temporaries(temporaries, leaves):
     """
     Drop temporaries consisting of single symbols.
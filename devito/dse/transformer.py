@@ -1,13 +1,26 @@
 from __future__ import absolute_import
 
-from devito.ir.clusters import ClusterGroup, groupby
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+from os import getpid, makedirs, path, rename
+from time import time
+import multiprocessing
+import pickle
+import re
+
+import numpy as np
+
+from devito.ir.clusters import Cluster, ClusterGroup, groupby
 from devito.dse.backends import (BasicRewriter, AdvancedRewriter, SpeculativeRewriter,
                                  AggressiveRewriter, CustomRewriter)
 from devito.exceptions import DSEException
-from devito.logger import dse_warning
+from devito.logger import debug, dse_warning
 from devito.parameters import configuration
+from devito.symbolics import estimate_cost, estimate_memory, retrieve_indexed
+from devito.tools import filter_ordered, flatten
 
-__all__ = ['rewrite']
+__all__ = ['rewrite', 'estimate_runtime']
 
 
 modes = {
@@ -18,10 +31,30 @@ modes = {
 }
 """The DSE transformation modes."""
 
-configuration.add('dse', 'advanced', list(modes))
+configuration.add('dse', 'advanced', list(modes) + ['auto'])
+
+# The machine model used by the 'auto' mode, that is the peak performance in
+# GFlops/s and the peak memory bandwidth in GB/s
+configuration.add('peak-gflopss', 1000., callback=lambda i: float(i))
+configuration.add('peak-bandwidth', 100., callback=lambda i: float(i))
+
+# Memoization of the DSE at the granularity of Clusters. The cache size is
+# expressed as a number of Clusters; if a directory is provided, the rewritten
+# Clusters are also pickled to disk, and thus reused across processes
+configuration.add('dse-cache', 0, [0, 1], lambda i: bool(i))
+configuration.add('dse-cache-dir', None)
+configuration.add('dse-cache-size', 256)
 
+# Number of processes rewriting independent Clusters concurrently
+configuration.add('dse-workers', 1, callback=lambda i: int(i))
 
-def rewrite(clusters, mode='advanced'):
+# Emit explicit fused multiply-adds, if supported by the target, in the 'advanced',
+# 'speculative' and 'aggressive' modes. As FMAs round only once, results may
+# slightly differ from those of separate multiplies and adds
+configuration.add('dse-fma', 0, [0, 1], lambda i: bool(i))
+
+
+def rewrite(clusters, mode='advanced', profile=None):
     """
     Transform N :class:`Cluster` objects of SymPy expressions into M
     :class:`Cluster` objects of SymPy expressions with reduced
@@ -29,6 +62,8 @@ def rewrite(clusters, mode='advanced'):
 
     :param clusters: The clusters to be transformed.
     :param mode: drive the expression transformation
+    :param profile: (Optional) a :class:`BuildProfile` to record the time spent
+                    in, and the expression counts of, each transformation pass.
 
     The ``mode`` parameter recognises the following values: ::
 
@@ -44,6 +79,12 @@ def rewrite(clusters, mode='advanced'):
                          sub-expression (i.e., anything that is at least in a
                          sum-of-products form). This may substantially increase
                          the memory pressure.
+         * 'auto': Apply all of the above, and retain the output with the lowest
+                   runtime predicted by :func:`estimate_runtime`.
+
+    With ``configuration['dse-fma']``, the 'advanced', 'speculative' and
+    'aggressive' modes also emit explicit fused multiply-adds, if the target
+    provides them.
     """
     if not (mode is None or isinstance(mode, str)):
         raise ValueError("Parameter 'mode' should be a string, not %s." % type(mode))
@@ -51,21 +92,320 @@ def rewrite(clusters, mode='advanced'):
     if mode is None or mode == 'noop':
         return clusters
 
-    processed = ClusterGroup()
-    for cluster in clusters:
-        if cluster.is_dense:
-            if mode in modes:
-                processed.extend(modes[mode]().run(cluster))
-            else:
-                try:
-                    processed.extend(CustomRewriter().run(cluster))
-                except DSEException:
-                    dse_warning("Unknown rewrite mode(s) %s" % mode)
-                    processed.append(cluster)
+    if mode != 'auto':
+        processed = ClusterGroup(flatten(_rewrite_all(clusters, [mode], profile)))
+        return groupby(processed).finalize()
+
+    # All candidate pipelines are run at once, so that the rewrite of all
+    # (Cluster, mode) pairs is shared out amongst the DSE workers
+    rewritten = _rewrite_all(clusters, list(modes), profile)
+    candidates = OrderedDict()
+    for n, i in enumerate(modes):
+        handle = rewritten[n*len(clusters):(n+1)*len(clusters)]
+        candidates[i] = groupby(ClusterGroup(flatten(handle))).finalize()
+    predicted = OrderedDict([(k, estimate_runtime(v)) for k, v in candidates.items()])
+
+    # On a tie, the least aggressive mode wins
+    choice = min(predicted, key=predicted.get)
+    debug("DSE `auto` picked `%s` [predicted: %s]" %
+          (choice, ', '.join('%s=%.3g' % i for i in predicted.items())))
+    if profile is not None:
+        profile.choose('dse', choice)
+
+    return candidates[choice]
+
+
+def _rewrite_all(clusters, modes, profile=None):
+    """
+    Rewrite each Cluster in ``clusters`` in each mode in ``modes``. Return a list
+    with the rewritten Clusters of each (mode, Cluster) pair, in this order.
+    """
+    global _pending_clusters
+
+    jobs = [(cluster, mode) for mode in modes for cluster in clusters]
+
+    # Skip the rewrite of the Clusters equivalent to Clusters rewritten before
+    keys = [dse_cache.key(cluster, mode) for cluster, mode in jobs]
+    results = []
+    for key, (cluster, mode) in zip(keys, jobs):
+        tic = time()
+        cached = dse_cache.fetch(key, cluster)
+        if cached is not None and profile is not None:
+            profile.add('dse.cache', time() - tic, len(cluster.exprs),
+                        sum(len(i.exprs) for i in cached))
+        results.append(cached)
+
+    # Rewrite the remaining Clusters, which are independent of each other, in a
+    # pool of forked processes, if requested
+    pending = [n for n, i in enumerate(results) if i is None]
+    nworkers = min(configuration['dse-workers'], len(pending))
+    if nworkers > 1 and 'fork' in multiprocessing.get_all_start_methods() and\
+            not multiprocessing.current_process().daemon:
+        _pending_clusters = [jobs[n] for n in pending]
+        try:
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(nworkers, mp_context=context) as executor:
+                rewritten = list(executor.map(_rewrite_pending, range(len(pending))))
+        finally:
+            _pending_clusters = []
+        for n, i in zip(pending, rewritten):
+            if i is not None:
+                state, timings = i
+                results[n] = (dse_cache.thaw(state, jobs[n][0]), timings)
+
+    processed = []
+    for key, (cluster, mode), result in zip(keys, jobs, results):
+        if result is None:
+            # Rewrite in this process
+            result = _rewrite(cluster, mode)
+        if isinstance(result, tuple):
+            rewritten, timings = result
+            dse_cache.store(key, cluster, rewritten, timings)
+            if profile is not None:
+                for k, (v, nexprs_in, nexprs_out) in timings.items():
+                    # Strip the leading underscore and the trailing pass counter
+                    name = k[1:].rstrip('0123456789')
+                    profile.add('dse.%s' % name, v, nexprs_in, nexprs_out)
+        else:
+            rewritten = result
+        processed.append(rewritten)
+
+    return processed
+
+
+def estimate_runtime(clusters):
+    """
+    Predict the runtime, in seconds per grid point, of ``clusters`` through a
+    roofline model of the machine, whose peak performance and memory bandwidth
+    are given by ``configuration['peak-gflopss']`` and
+    ``configuration['peak-bandwidth']``. Only the dense Clusters contribute to
+    the runtime. Further, the Clusters outside of the time loop are assumed to
+    be amortized across the timesteps.
+    """
+    peak_flopss = float(configuration['peak-gflopss'])*10**9
+    peak_bandwidth = float(configuration['peak-bandwidth'])*10**9
+
+    dense = [i for i in clusters if i.is_dense]
+    timed = [i for i in dense if any(d.is_Time for d in i.ispace.dimensions)]
+
+    runtime = 0.
+    for cluster in (timed or dense):
+        functions = [i.base.function for i in
+                     flatten(retrieve_indexed(e, mode='all') for e in cluster.exprs)]
+        itemsize = max([np.dtype(i.dtype).itemsize for i in functions] or [0])
+        flops = estimate_cost(cluster.exprs)
+        traffic = estimate_memory(cluster.exprs)*itemsize
+        runtime += max(flops/peak_flopss, traffic/peak_bandwidth)
+
+    return runtime
+
+
+def _rewrite(cluster, mode):
+    """
+    Rewrite ``cluster`` in mode ``mode``. Return the rewritten Clusters, as well
+    as a mapper from the applied passes to their wall time and expression counts.
+    """
+    if cluster.is_dense:
+        if mode in modes:
+            rewriter = modes[mode]()
+            rewritten = rewriter.run(cluster)
+        else:
+            try:
+                rewriter = CustomRewriter()
+                rewritten = rewriter.run(cluster)
+            except DSEException:
+                dse_warning("Unknown rewrite mode(s) %s" % mode)
+                return [cluster]
+    else:
+        # Downgrade sparse clusters to basic rewrite mode since it's
+        # pointless to expose loop-redundancies when the iteration space
+        # only consists of a few points
+        rewriter = BasicRewriter(False)
+        rewritten = rewriter.run(cluster)
+    timings = OrderedDict([(k, (v,) + rewriter.nexprs[k])
+                           for k, v in rewriter.timings.items()])
+    return rewritten, timings
+
+
+_pending_clusters = []
+"""The (Cluster, mode) pairs being rewritten by the DSE worker processes."""
+
+
+def _rewrite_pending(i):
+    """
+    Rewrite the ``i``-th Cluster in ``_pending_clusters``. Return the pickled
+    rewritten Clusters and the pass timings, or None if the rewritten Clusters
+    can't be shipped back.
+    """
+    cluster, mode = _pending_clusters[i]
+    result = _rewrite(cluster, mode)
+    if not isinstance(result, tuple):
+        return None
+    rewritten, timings = result
+    try:
+        return dse_cache.freeze(cluster, rewritten, timings), timings
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+# DSE cache
+
+
+class DSECache(object):
+
+    """
+    A cache of rewritten :class:`Cluster`s.
+
+    An entry is keyed on a canonical representation of a Cluster, in which the
+    Functions are renamed based on their order of appearance, as well as on
+    the structure (but not the data) of such Functions and on the DSE mode.
+    Thus, Clusters that only differ in the names of the Functions they access,
+    such as those shared by the forward and adjoint Operators of a given
+    physics, share the same entry. Entries are stored in pickled form, so that
+    a cached Cluster never keeps user data alive. On a cache hit, the rewritten
+    Clusters are unpickled and rebound to the caller's Functions.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0.
+
+    def key(self, cluster, mode):
+        """
+        Return the cache key of ``cluster`` when rewritten in mode ``mode``, or
+        None if the cache is disabled.
+        """
+        if not configuration['dse-cache']:
+            return None
+        functions = self._functions(cluster)
+        if functions:
+            canonical = {f.name: 'f%d' % n for n, f in enumerate(functions)}
+            pattern = re.compile(r'\b(%s)\b' % '|'.join(re.escape(i) for i in canonical))
+            normalize = lambda i: pattern.sub(lambda m: canonical[m.group(0)], str(i))
         else:
-            # Downgrade sparse clusters to basic rewrite mode since it's
-            # pointless to expose loop-redundancies when the iteration space
-            # only consists of a few points
-            processed.extend(BasicRewriter(False).run(cluster))
+            normalize = str
+        # The ISA and the platform determine whether FMAs are emitted
+        signature = [str(mode), str(cluster.is_dense), str(configuration['dse-fma']),
+                     configuration['isa'], configuration['platform']]
+        signature.extend(normalize(i) for i in cluster.exprs)
+        signature.extend(normalize(i) for i in [cluster.ispace,
+                                                cluster.ispace.sub_iterators,
+                                                sorted(cluster.atomics, key=str),
+                                                sorted(cluster.guards.items(), key=str)])
+        for f in functions:
+            signature.append(str((f.__class__.__base__.__name__, f.dtype, f.indices,
+                                  getattr(f, 'staggered', None))))
+        return sha1(''.join(signature).encode()).hexdigest()
+
+    def fetch(self, key, cluster):
+        """
+        Return the rewritten Clusters cached under ``key``, rebound to the
+        Functions accessed by ``cluster``, or None on a cache miss.
+        """
+        if key is None:
+            return None
+
+        state = self.entries.pop(key, None)
+        if state is None:
+            state = self._load(key)
+        if state is None:
+            self.misses += 1
+            return None
+        self.entries[key] = state
+        self._evict()
+
+        clusters = self.thaw(state, cluster)
+
+        self.hits += 1
+        self.saved += sum(i[0] for i in pickle.loads(state)[0].values())
+        debug("DSE cache hit [%s]" % key)
+        return clusters
+
+    def store(self, key, cluster, rewritten, timings):
+        """
+        Add the Clusters ``rewritten`` out of ``cluster`` to the cache. ``timings``
+        maps the applied DSE passes to their wall time and expression counts.
+        """
+        if key is None or key in self.entries:
+            return
+        try:
+            state = self.freeze(cluster, rewritten, timings)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            debug("Cluster couldn't be cached [%s]" % e)
+            return
+        self.entries[key] = state
+        self._evict()
+        self._dump(key, state)
+
+    def freeze(self, cluster, rewritten, timings):
+        """Pickle the Clusters ``rewritten`` out of ``cluster``."""
+        state = (timings, self._functions(cluster), [i.args for i in rewritten])
+        return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+    def thaw(self, state, cluster):
+        """
+        Unpickle the rewritten Clusters in ``state``, as returned by :meth:`freeze`,
+        and rebind them to the Functions accessed by ``cluster``.
+        """
+        _, functions, args = pickle.loads(state)
+        mapper = {}
+        for i, j in zip(functions, self._functions(cluster)):
+            mapper[i] = j
+            mapper[i.indexed] = j.indexed
+        rebind = lambda i: i.xreplace(mapper)
+        return [Cluster([rebind(e) for e in exprs], ispace, atomics,
+                        {k: rebind(v) for k, v in guards.items()})
+                for exprs, ispace, atomics, guards in args]
+
+    def stats(self):
+        """Return the cache hits, misses and the DSE time saved, in seconds."""
+        return {'hits': self.hits, 'misses': self.misses, 'saved': self.saved}
+
+    def clear(self):
+        """Drop all in-memory entries and reset the statistics."""
+        self.entries.clear()
+        self.hits = self.misses = 0
+        self.saved = 0.
+
+    def _functions(self, cluster):
+        indexeds = flatten(retrieve_indexed(i, mode='all') for i in cluster.exprs)
+        return filter_ordered(i.base.function for i in indexeds)
+
+    def _evict(self):
+        while len(self.entries) > configuration['dse-cache-size']:
+            self.entries.popitem(last=False)
+
+    def _filename(self, key):
+        dirname = configuration['dse-cache-dir']
+        return path.join(dirname, '%s.pkl' % key) if dirname else None
+
+    def _load(self, key):
+        filename = self._filename(key)
+        if filename is None or not path.exists(filename):
+            return None
+        try:
+            with open(filename, 'rb') as f:
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+    def _dump(self, key, state):
+        filename = self._filename(key)
+        if filename is None or path.exists(filename):
+            return
+        try:
+            if not path.isdir(path.dirname(filename)):
+                makedirs(path.dirname(filename))
+            # Write to a private file, then atomically move it in place
+            tmpname = '%s.tmp%d' % (filename, getpid())
+            with open(tmpname, 'wb') as f:
+                f.write(state)
+            rename(tmpname, filename)
+        except (IOError, OSError) as e:
+            debug("Couldn't write `%s` to disk [%s]" % (filename, e))
+
 
-    return groupby(processed).finalize()
+dse_cache = DSECache()
+"""The process-wide cache of rewritten Clusters."""
@@ -8,7 +8,7 @@ from psutil import virtual_memory
 
 from devito.arguments import ArgumentMap
 from devito.cgen_utils import INT, FLOAT
-from devito.data import Data, first_touch
+from devito.data import Data, CompactData, bfloat16, compact_dtypes, first_touch
 from devito.dimension import Dimension
 from devito.equation import Eq, Inc
 from devito.finite_difference import (centered, cross_derivative,
@@ -107,16 +107,22 @@ class TensorFunction(SymbolicFunction):
             self._first_touch = kwargs.get('first_touch', configuration['first_touch'])
             self._data = None
 
+            # Storage data type, possibly more compact than the arithmetic one
+            storage_dtype = kwargs.get('storage_dtype')
+            if storage_dtype is not None and storage_dtype is not bfloat16:
+                storage_dtype = np.dtype(storage_dtype).type
+            self._storage_dtype = storage_dtype
+
     def _allocate_memory(func):
         """Allocate memory as a :class:`Data`."""
         def wrapper(self):
             if self._data is None:
                 debug("Allocating memory for %s (%s)" % (self.name, self.shape))
-                self._data = Data(self.shape, self.indices, self.dtype)
+                self._data = Data(self.shape, self.indices, self.storage_dtype)
                 if self._first_touch:
                     first_touch(self)
                 else:
-                    self.data.fill(0)
+                    self._data.fill(0)
                 if self.initializer is not None:
                     self.initializer(self.data)
             return func(self)
@@ -182,6 +188,20 @@ class TensorFunction(SymbolicFunction):
     def _mem_external(self):
         return True
 
+    @property
+    def _mem_dtype(self):
+        return np.uint16 if self.storage_dtype in compact_dtypes else self.dtype
+
+    @property
+    def storage_dtype(self):
+        """
+        The data type of the buffered data. This may be a compact storage
+        format (``numpy.float16`` or :class:`bfloat16`), in which case the
+        values are converted to ``self.dtype`` on load, and rounded to the
+        storage format on store.
+        """
+        return self._storage_dtype or self.dtype
+
     @property
     def shape(self):
         """
@@ -247,9 +267,24 @@ class TensorFunction(SymbolicFunction):
         .. note::
 
             Alias to ``self.data``.
+
+        .. note::
+
+            With a compact ``storage_dtype``, this is a :class:`CompactData`,
+            that is a proxy converting the values from/to ``numpy.float32``
+            upon access.
         """
         # TODO: for the domain-allocation switch, this needs to be turned
         # into a view of the domain region
+        if self.storage_dtype in compact_dtypes:
+            return CompactData(self._data)
+        return self._data
+
+    @property
+    @_allocate_memory
+    def _data_buffer(self):
+        """Reference to the actual data, for internal use only. With a compact
+        ``storage_dtype``, these are the raw bits."""
         return self._data
 
     @property
@@ -363,6 +398,10 @@ class Function(TensorFunction):
                     case, an error is raised if such iterable has fewer entries
                     then the number of space dimensions.
     :param dtype: (Optional) data type of the buffered data.
+    :param storage_dtype: (Optional) compact storage format of the buffered data,
+                          either ``numpy.float16`` or :class:`bfloat16`. The
+                          arithmetic is still performed in ``dtype``, which
+                          must then be ``numpy.float32``. Defaults to ``dtype``.
     :param space_order: Discretisation order for space derivatives. By default,
                         space derivatives are expressed in terms of centered
                         approximations, with ``ceil(space_order/2)`` points
@@ -413,6 +452,12 @@ class Function(TensorFunction):
                 self.dtype = kwargs.get('dtype', np.float32)
             else:
                 self.dtype = kwargs.get('dtype', self.grid.dtype)
+            if self.storage_dtype in compact_dtypes and self.dtype != np.float32:
+                raise ValueError("'storage_dtype' %s requires float32 arithmetic"
+                                 % self.storage_dtype.__name__)
+            elif self.storage_dtype not in compact_dtypes + (self.dtype,):
+                accepted = [i.__name__ for i in compact_dtypes + (self.dtype,)]
+                raise ValueError("'storage_dtype' must be any of %s" % str(accepted))
 
             # Halo region
             space_order = kwargs.get('space_order', 1)
@@ -577,6 +622,10 @@ class TimeFunction(Function):
                     case, an error is raised if such tuple has fewer entries
                     then the number of space dimensions.
     :param dtype: (Optional) data type of the buffered data
+    :param storage_dtype: (Optional) compact storage format of the buffered data,
+                          either ``numpy.float16`` or :class:`bfloat16`. The
+                          arithmetic is still performed in ``dtype``, which
+                          must then be ``numpy.float32``. Defaults to ``dtype``.
     :param space_order: Discretisation order for space derivatives. By default,
                         space derivatives are expressed in terms of centered
                         approximations, with ``ceil(space_order/2)`` points
@@ -635,7 +684,7 @@ class TimeFunction(Function):
 
             # Check we won't allocate too much memory for the system
             available_mem = virtual_memory().available
-            if np.dtype(self.dtype).itemsize * self.size > available_mem:
+            if np.dtype(self._mem_dtype).itemsize * self.size > available_mem:
                 warning("Trying to allocate more memory for symbol %s " % self.name +
                         "than available on physical device, this will start swapping")
 
@@ -1,9 +1,11 @@
-from sympy import Eq
+from sympy import Eq, Pow
+from sympy.core.operations import AssocOp
 
 from devito.dimension import SubDimension
 from devito.equation import DOMAIN, INTERIOR
 from devito.ir.support import IterationSpace, Any, compute_intervals, compute_directions
 from devito.symbolics import FrozenExpr, dimension_sort, indexify
+from devito.types import Basic, Indexed
 
 __all__ = ['LoweredEq', 'ClusterizedEq', 'IREq']
 
@@ -26,6 +28,12 @@ class IREq(object):
     def dimensions(self):
         return self.ispace.dimensions
 
+    def __reduce_ex__(self, proto):
+        # Pickling support; the metadata is not part of the SymPy args
+        args = tuple(_freeze(i) for i in self.args)
+        return (_unpickle_ireq, (type(self), args),
+                {'ispace': self.ispace, 'is_Increment': self.is_Increment})
+
 
 class LoweredEq(Eq, IREq):
 
@@ -133,3 +141,32 @@ class ClusterizedEq(Eq, IREq, FrozenExpr):
 
     def func(self, *args, **kwargs):
         return super(ClusterizedEq, self).func(*args, evaluate=False, ispace=self.ispace)
+
+
+def _freeze(expr):
+    """
+    Turn ``expr`` into a tree of ``(func, args)`` tuples. Unlike SymPy's
+    default pickling, this allows to rebuild ``expr`` without triggering
+    any evaluation (e.g., ``2*(a + b) -> 2*a + 2*b``), which would otherwise
+    alter the generated code.
+    """
+    if expr.is_Atom or isinstance(expr, (Basic, Indexed)):
+        return expr
+    return (expr.func, tuple(_freeze(i) for i in expr.args))
+
+
+def _thaw(frozen):
+    """Rebuild an expression from the output of :func:`_freeze`."""
+    if not isinstance(frozen, tuple):
+        return frozen
+    func, args = frozen
+    args = [_thaw(i) for i in args]
+    if issubclass(func, (AssocOp, Pow)):
+        return func(*args, evaluate=False)
+    else:
+        return func(*args)
+
+
+def _unpickle_ireq(cls, args):
+    """Rebuild a pickled :class:`IREq`."""
+    return Eq.__new__(cls, *[_thaw(i) for i in args], evaluate=False)
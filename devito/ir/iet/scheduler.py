@@ -125,7 +125,7 @@ def iet_make(clusters, dtype):
     return List(body=processed)
 
 
-def iet_insert_C_decls(iet, func_table):
+def iet_insert_C_decls(iet, func_table, pool=None):
     """
     Given an Iteration/Expression tree ``iet``, build a new tree with the
     necessary symbol declarations. Declarations are placed as close as
@@ -134,6 +134,9 @@ def iet_insert_C_decls(iet, func_table):
     :param iet: The input Iteration/Expression tree.
     :param func_table: A mapper from callable names to :class:`Callable`s
                        called from within ``iet``.
+    :param pool: (Optional) a list. If provided, the tensors that would be
+                 allocated on the heap are instead appended to ``pool``, as
+                 their storage is to be provided by the caller.
     """
     # Resolve function calls first
     scopes = []
@@ -161,6 +164,9 @@ def iet_insert_C_decls(iet, func_table):
             key = lambda i: not i.is_Parallel
             site = filter_iterations(v, key=key, stop='asap') or [iet]
             allocator.push_stack(site[-1], k.write)
+        elif pool is not None:
+            # In caller-provided memory, reused across calls
+            allocator.push_pool(k.write)
         else:
             # On the heap, as a tensor that must be globally accessible
             allocator.push_heap(k.write)
@@ -178,4 +184,10 @@ def iet_insert_C_decls(iet, func_table):
         decls, allocs, frees = zip(*allocator.onheap)
         iet = List(header=decls + allocs, body=iet, footer=frees)
 
+    # Introduce casts to the caller-provided memory (if any)
+    if allocator.onpool:
+        arrays, casts = zip(*allocator.onpool)
+        pool.extend(arrays)
+        iet = List(header=casts, body=iet)
+
     return iet
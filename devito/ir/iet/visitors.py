@@ -148,7 +148,7 @@ class CGen(Visitor):
             elif i.is_Scalar:
                 ret.append(c.Value('const %s' % c.dtype_to_ctype(i.dtype), i.name))
             elif i.is_Tensor:
-                ret.append(c.Value(c.dtype_to_ctype(i.dtype),
+                ret.append(c.Value(c.dtype_to_ctype(i._mem_dtype),
                                    '*restrict %s_vec' % i.name))
             elif i.is_Lowered:
                 ret.append(c.Value('const %s' % c.dtype_to_ctype(i.dtype), i.name))
@@ -181,8 +181,9 @@ class CGen(Visitor):
         f = o.function
         align = "__attribute__((aligned(64)))"
         shape = ''.join(["[%s]" % ccode(j) for j in f.symbolic_shape[1:]])
-        lvalue = c.POD(f.dtype, '(*restrict %s)%s %s' % (f.name, shape, align))
-        rvalue = '(%s (*)%s) %s' % (c.dtype_to_ctype(f.dtype), shape, '%s_vec' % f.name)
+        lvalue = c.POD(f._mem_dtype, '(*restrict %s)%s %s' % (f.name, shape, align))
+        rvalue = '(%s (*)%s) %s' % (c.dtype_to_ctype(f._mem_dtype), shape,
+                                    '%s_vec' % f.name)
         return c.Initializer(lvalue, rvalue)
 
     def visit_PointerCast(self, o):
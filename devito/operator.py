@@ -1,34 +1,66 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from hashlib import sha1
 from operator import attrgetter
+from os import getpid, makedirs, path, rename
+from time import time
+import multiprocessing
+import pickle
 
+import cgen as c
 import ctypes
 import numpy as np
 import sympy
 
 from devito.arguments import ArgumentMap
-from devito.compiler import jit_compile, load
+from devito.compiler import (get_lib_ext, get_tmp_dir, jit_compile, jit_compile_async,
+                             load, wait_jit_executor)
+from devito.cgen_utils import storage_conversions
+from devito.data import Data, bfloat16
 from devito.dimension import Dimension
 from devito.dle import transform
 from devito.dse import rewrite
 from devito.exceptions import InvalidOperator
 from devito.function import Constant
-from devito.logger import bar, info
-from devito.ir.equations import LoweredEq
+from devito.logger import bar, debug, info
+from devito.ir.equations import ClusterizedEq, LoweredEq
 from devito.ir.clusters import clusterize
-from devito.ir.iet import (Callable, List, MetaCall, iet_build, iet_insert_C_decls,
-                           ArrayCast, PointerCast, derive_parameters)
+from devito.ir.iet import (Call, Callable, Conditional, Expression, FindNodes, Iteration,
+                           List, MetaCall, Transformer, iet_build, iet_insert_C_decls,
+                           ArrayCast, PointerCast, derive_parameters,
+                           retrieve_iteration_tree)
 from devito.parameters import configuration
-from devito.profiling import create_profile
-from devito.symbolics import retrieve_terminals
-from devito.tools import as_tuple, filter_sorted, flatten, numpy_to_ctypes
-from devito.types import Object
+from devito.profiling import BuildProfile, count_exprs, create_profile
+from devito.symbolics import (Load, LoadBFloat16, LoadHalf, Store, StoreBFloat16,
+                              StoreHalf, q_inc, retrieve_indexed, retrieve_terminals)
+from devito.tools import (as_tuple, filter_ordered, filter_sorted, flatten,
+                          numpy_to_ctypes)
+from devito.types import Object, Scalar
+
+# Memoization of the lowering pipeline (expressions -> IET). The cache size is
+# expressed as a number of Operators; if a directory is provided, the lowered
+# Operators are also pickled to disk, and thus reused across processes
+configuration.add('lowering-cache', 0, [0, 1], lambda i: bool(i))
+configuration.add('lowering-cache-dir', None)
+configuration.add('lowering-cache-size', 64)
+
+# Heap-allocated temporaries (e.g., those introduced by the DSE) may either be
+# allocated and freed within the generated code, upon each call, or be taken
+# from a pool owned by the Operator, and thus allocated only once
+configuration.add('heap-pool', 0, [0, 1], lambda i: bool(i))
+
+# The time-invariant temporaries (e.g., those hoisted by the DSE) may be kept
+# in pooled storage across calls, and only recomputed when their inputs change
+configuration.add('persistent-invariants', 0, [0, 1], lambda i: bool(i))
 
 
 class Operator(Callable):
 
-    _default_headers = ['#define _POSIX_C_SOURCE 200809L']
+    _default_headers = ['#define _POSIX_C_SOURCE 200809L',
+                        '#define MIN(a,b) (((a) < (b)) ? (a) : (b))',
+                        '#define MAX(a,b) (((a) > (b)) ? (a) : (b))']
     _default_includes = ['stdlib.h', 'math.h', 'sys/time.h']
     _default_globals = []
 
@@ -46,7 +78,13 @@ class Operator(Callable):
                 defaults to ``configuration['dse']``.
         * dle : Use the Devito Loop Engine to optimize the loops -
                 defaults to ``configuration['dle']``.
+        * lowered : (Internal) The pickled state of an identical Operator,
+                    already lowered (see :func:`build_operators`).
     """
+
+    _cacheable = True
+    """True if the lowered Operator may be fetched from the lowering cache."""
+
     def __init__(self, expressions, **kwargs):
         expressions = as_tuple(expressions)
 
@@ -68,31 +106,72 @@ class Operator(Callable):
         self._compiler = configuration['compiler']
         self._lib = None
         self._cfunction = None
+        self._compiling = None
+
+        # Storage for the pooled heap temporaries, allocated lazily
+        self._heap_arrays = []
+        self._heap_pool = {}
+
+        # The time-invariant temporaries persisting across calls, if any
+        self._invariants = []
+        self._invariants_key = None
 
         # References to local or external routines
         self.func_table = OrderedDict()
 
+        # Where the build time goes
+        profile = self.build_profile = BuildProfile()
+
         # Expression lowering and analysis
-        expressions = [LoweredEq(e, subs=subs) for e in expressions]
-        self.dtype = retrieve_dtype(expressions)
-        self.input, self.output, self.dimensions = retrieve_symbols(expressions)
+        with profile.timer('lowering'):
+            expressions = [LoweredEq(e, subs=subs) for e in expressions]
+            self.dtype = retrieve_dtype(expressions)
+            self.input, self.output, self.dimensions = retrieve_symbols(expressions)
+        profile.add('lowering', nexprs_in=len(expressions), nexprs_out=len(expressions))
+
+        # Skip the rest of the lowering pipeline if an identical Operator was
+        # built before, possibly on different (but compatible) Functions
+        with profile.timer('lowering-cache'):
+            self._lowering_key = lowering_cache.key(self, expressions, dse, dle)
+            lowered = kwargs.get('lowered')
+            if lowered is not None and self._cacheable:
+                lowering_cache.loads(self, lowered)
+                lowering_cache.put(self._lowering_key, lowered)
+                return
+            if lowering_cache.fetch(self):
+                return
 
         # Group expressions based on their iteration space and data dependences,
         # and apply the Devito Symbolic Engine (DSE) for flop optimization
-        clusters = clusterize(expressions)
-        clusters = rewrite(clusters, mode=set_dse_mode(dse))
+        with profile.timer('clusterize'):
+            clusters = clusterize(expressions)
+        profile.add('clusterize', nexprs_in=len(expressions),
+                    nexprs_out=count_exprs(clusters))
+        with profile.timer('dse'):
+            nexprs = count_exprs(clusters)
+            clusters = rewrite(clusters, mode=set_dse_mode(dse), profile=profile)
+        profile.add('dse', nexprs_in=nexprs, nexprs_out=count_exprs(clusters))
+
+        # Convert from/to the storage format of the compactly stored Functions
+        clusters = self._convert_storage(clusters)
 
         # Lower Clusters to an Iteration/Expression tree (IET)
-        nodes = iet_build(clusters, self.dtype)
+        with profile.timer('iet_build'):
+            nodes = iet_build(clusters, self.dtype)
+        profile.add('iet_build', nexprs_in=count_exprs(clusters),
+                    nexprs_out=count_exprs(nodes))
 
         # Introduce C-level profiling infrastructure
         nodes, self.profiler = self._profile_sections(nodes)
 
         # Translate into backend-specific representation (e.g., GPU, Yask)
-        nodes = self._specialize(nodes)
+        with profile.timer('specialize'):
+            nodes = self._specialize(nodes)
 
         # Apply the Devito Loop Engine (DLE) for loop optimization
-        dle_state = transform(nodes, *set_dle_mode(dle))
+        with profile.timer('dle'):
+            dle_state = transform(nodes, *set_dle_mode(dle), profile=profile)
+        profile.add('dle', nexprs_in=count_exprs(nodes), nexprs_out=dle_state.nexprs)
 
         # Update the Operator state based on the DLE
         self.dle_arguments = dle_state.arguments
@@ -103,8 +182,18 @@ class Operator(Callable):
                                 if isinstance(i.argument, Dimension)])
         self._includes.extend(list(dle_state.includes))
 
+        # Make the time-invariant temporaries persistent across calls, if requested
+        nodes = dle_state.nodes
+        if configuration['persistent-invariants']:
+            nodes = self._persist_invariants(nodes)
+
         # Introduce the required symbol declarations
-        nodes = iet_insert_C_decls(dle_state.nodes, self.func_table)
+        with profile.timer('c_decls'):
+            if configuration['heap-pool'] or configuration['persistent-invariants']:
+                pool = self._heap_arrays
+            else:
+                pool = None
+            nodes = iet_insert_C_decls(nodes, self.func_table, pool)
 
         # Insert data and pointer casts for array parameters and profiling structs
         nodes = self._build_casts(nodes)
@@ -115,10 +204,77 @@ class Operator(Callable):
         # Finish instantiation
         super(Operator, self).__init__(self.name, nodes, 'int', parameters, ())
 
+        lowering_cache.store(self)
+
+    # Pickling support
+
+    _pickle_exclude = ['_lib', '_cfunction', '_compiling', '_heap_pool',
+                       '_invariants_key']
+    """Attributes that are specific to a process and thus not serialized."""
+
+    _dataless = ()
+    """The names of the Functions shipped without data, if unpickled."""
+
+    def __getstate__(self):
+        """
+        Serialize the Operator, including its shared object, if JIT-compiled.
+
+        .. note::
+
+            As with any pickled :class:`Function`, the Function data is not
+            serialized. An unpickled Operator may only be applied once all of
+            its Functions have either been given new data or are overridden
+            through ``apply``'s keyword arguments. Further, the symbolic state
+            (the Functions, the IET, ...) is serialized too, so unpickling still
+            goes through SymPy, although neither the lowering nor the
+            compilation are carried out again.
+        """
+        state = {k: v for k, v in self.__dict__.items() if k not in self._pickle_exclude}
+        state['_dataless'] = tuple(i.name for i in self.input if i.is_TensorFunction)
+        if self._lib is not None:
+            # Ship the shared object itself, so that it needs neither to be
+            # recompiled nor to be reachable through a shared file system
+            with open('%s.%s' % (self._lib.name, get_lib_ext()), 'rb') as f:
+                state['_soname'] = path.basename(self._lib.name)
+                state['_sobytes'] = f.read()
+        return state
+
+    def __setstate__(self, state):
+        soname = state.pop('_soname', None)
+        sobytes = state.pop('_sobytes', None)
+        self.__dict__.update(state)
+        self._lib = None
+        self._cfunction = None
+        self._compiling = None
+        self._heap_pool = {}
+        self._invariants_key = None
+        if sobytes is not None:
+            # Different shared objects may share the same name (e.g., those
+            # built through PGO), so the file is named after its contents
+            basename = path.join(get_tmp_dir(), '%s-%s' %
+                                 (soname, sha1(sobytes).hexdigest()))
+            lib_file = '%s.%s' % (basename, get_lib_ext())
+            if not path.exists(lib_file):
+                # Write to a private file, then atomically move it in place
+                tmpname = '%s.tmp%d' % (lib_file, getpid())
+                with open(tmpname, 'wb') as f:
+                    f.write(sobytes)
+                rename(tmpname, lib_file)
+            self._lib = load(basename, self._compiler)
+            self._lib.name = basename
+
     def _argument_defaults(self, arguments):
         """
         Derive all default values from parameters and ensure uniqueness.
         """
+        # The Functions of an unpickled Operator have no data to default to
+        dataless = [p.name for p in self.input if p.name in self._dataless and
+                    p.name not in arguments and p._data is None]
+        if dataless:
+            raise ValueError("No data for Function(s) %s, as shipped through "
+                             "pickling; either set their data or override them "
+                             "upon `apply`" % ', '.join(dataless))
+
         default_args = ArgumentMap()
         for p in self.input:
             if p.name not in arguments:
@@ -146,16 +302,31 @@ class Operator(Callable):
         # DLE arguments would be massaged into the IET so as to comply
         # with the rest of the argument derivation procedure.
         for arg in self.dle_arguments:
+            if not isinstance(arg.argument, Dimension):
+                # E.g., the prefetch distance, which may be provided by the user
+                if arg.argument in self.parameters:
+                    name = arg.argument.name
+                    arguments[name] = kwargs.get(name, arg.value)
+                continue
             dim = arg.argument
-            osize = arguments[arg.original_dim.symbolic_size.name]
             if dim.symbolic_size in self.parameters:
+                if isinstance(arg.value, int):
+                    arguments[dim.symbolic_size.name] = arg.value
+                    continue
+                osize = arguments[arg.original_dim.symbolic_size.name]
                 if arg.value is None:
                     arguments[dim.symbolic_size.name] = osize
-                elif isinstance(arg.value, int):
-                    arguments[dim.symbolic_size.name] = arg.value
                 else:
                     arguments[dim.symbolic_size.name] = arg.value(osize)
 
+        # Add in the pooled heap temporaries
+        arguments.update(self._heap_pool_values(arguments))
+
+        # Tell whether the persistent time-invariant temporaries are out-of-date
+        if self._invariants:
+            stale = self._invariants_signature(arguments) != self._invariants_key
+            arguments[self._invariants_flag.name] = int(stale)
+
         # Add in the profiler argument
         arguments[self.profiler.name] = self.profiler.new()
 
@@ -173,6 +344,48 @@ class Operator(Callable):
 
         return arguments
 
+    def _heap_pool_values(self, arguments):
+        """
+        Return a mapper from the pooled heap temporaries to their storage.
+
+        The storage is allocated upon first use and then reused by all subsequent
+        calls, as long as the temporaries' shape doesn't change; it is released
+        along with the Operator. As the allocated memory is not initialized, the
+        pages are first-touched by the generated code itself, that is, with the
+        same access pattern (and thus the same NUMA placement) as in the
+        subsequent calls.
+        """
+        values = {}
+        for i in self._heap_arrays:
+            shape = tuple(arguments[d.symbolic_size.name] for d in i.indices)
+            data = self._heap_pool.get(i.name)
+            if data is None or data.shape != shape:
+                debug("Allocating pooled memory for %s (%s)" % (i.name, str(shape)))
+                data = self._heap_pool[i.name] = Data(shape, i.indices, i.dtype)
+            values[i.name] = data
+        return values
+
+    def _invariants_signature(self, arguments):
+        """
+        Return a signature of the runtime values the persistent time-invariant
+        temporaries depend on, or None if unknown (e.g., if raw arrays, whose
+        modifications can't be tracked, are provided in place of Functions).
+        """
+        signature = []
+        for i in self._invariants_deps:
+            value = arguments.get(i)
+            if isinstance(value, np.ndarray):
+                version = getattr(value, '_version', None)
+                if version is None:
+                    return None
+                signature.append((i, id(value), version))
+            else:
+                signature.append((i, value))
+        for i in self._invariants:
+            value = arguments[i.name]
+            signature.append((i.name, id(value), value.shape))
+        return tuple(signature)
+
     @property
     def elemental_functions(self):
         return tuple(i.root for i in self.func_table.values())
@@ -189,10 +402,45 @@ class Operator(Callable):
         """
         if self._lib is None:
             # No need to recompile if a shared object has already been loaded.
-            return jit_compile(self.ccode, self._compiler)
+            if self._compiling is not None:
+                # Wait for the compilation launched by `compile_async`
+                return self._compiling.result()
+            ccode = self._generate_code()
+            with self.build_profile.timer('compilation'):
+                return jit_compile(ccode, self._compiler)
         else:
             return self._lib.name
 
+    def compile_async(self):
+        """
+        JIT-compile the C code generated by the Operator in the background.
+
+        Several Operators may be compiled concurrently this way. Any subsequent
+        access to :attr:`compile`, :attr:`cfunction` or ``apply`` transparently
+        waits for the pending compilation to complete.
+
+        :returns: A :class:`concurrent.futures.Future` wrapping the file name
+                  of the JIT-compiled function.
+        """
+        if self._compiling is None:
+            if self._lib is None:
+                ccode = self._generate_code()
+                tic = time()
+                self._compiling = jit_compile_async(ccode, self._compiler)
+                self._compiling.add_done_callback(
+                    lambda i: self.build_profile.add('compilation', time() - tic))
+            else:
+                self._compiling = Future()
+                self._compiling.set_result(self._lib.name)
+        return self._compiling
+
+    def _generate_code(self):
+        """Generate the C code, keeping track of the time spent and its size."""
+        with self.build_profile.timer('codegen'):
+            ccode = self.ccode
+        self.build_profile.set_code(ccode)
+        return ccode
+
     @property
     def cfunction(self):
         """Returns the JIT-compiled C function as a ctypes.FuncPtr object."""
@@ -200,24 +448,30 @@ class Operator(Callable):
             basename = self.compile
             self._lib = load(basename, self._compiler)
             self._lib.name = basename
+            lowering_cache.store_lib(self)
 
         if self._cfunction is None:
             self._cfunction = getattr(self._lib, self.name)
             # Associate a C type to each argument for runtime type check
-            argtypes = []
-            for i in self.parameters:
-                if i.is_Object:
-                    argtypes.append(ctypes.c_void_p)
-                elif i.is_Scalar:
-                    argtypes.append(numpy_to_ctypes(i.dtype))
-                elif i.is_Tensor:
-                    argtypes.append(np.ctypeslib.ndpointer(dtype=i.dtype, flags='C'))
-                else:
-                    argtypes.append(ctypes.c_void_p)
-            self._cfunction.argtypes = argtypes
+            self._cfunction.argtypes = self._argtypes
 
         return self._cfunction
 
+    @property
+    def _argtypes(self):
+        """The C types of the parameters, in ctypes format."""
+        argtypes = []
+        for i in self.parameters:
+            if i.is_Object:
+                argtypes.append(ctypes.c_void_p)
+            elif i.is_Scalar:
+                argtypes.append(numpy_to_ctypes(i.dtype))
+            elif i.is_Tensor:
+                argtypes.append(np.ctypeslib.ndpointer(dtype=i._mem_dtype, flags='C'))
+            else:
+                argtypes.append(ctypes.c_void_p)
+        return argtypes
+
     def _profile_sections(self, nodes):
         """Introduce C-level profiling nodes within the Iteration/Expression tree."""
         return List(body=nodes), None
@@ -227,6 +481,107 @@ class Operator(Callable):
         best block sizes when loop blocking is in use."""
         return arguments
 
+    def _autotune_compiler(self, arguments):
+        """JIT-compile this Operator using the compiler flags that empirically
+        perform best on ``arguments``. Return True on success, False if compiler
+        auto-tuning is not supported."""
+        return False
+
+    def _compile_pgo(self, arguments):
+        """JIT-compile this Operator through profile-guided optimization,
+        training it on ``arguments``. Return True on success, False if
+        profile-guided optimization is not supported."""
+        return False
+
+    def _persist_invariants(self, nodes):
+        """
+        Guard the top-level loop nests computing only time-invariant, heap-allocated
+        temporaries with a runtime flag, so that they are skipped whenever the
+        temporaries, kept in pooled storage, are known to be up-to-date.
+        """
+        def expressions(root):
+            # Including those in the elemental functions called from within /root/
+            found = FindNodes(Expression).visit(root)
+            for i in FindNodes(Call).visit(root):
+                handle = self.func_table.get(i.name)
+                if handle is not None and handle.local:
+                    found.extend(expressions(handle.root))
+            return found
+
+        def dimensions(root):
+            found = [i.dim for i in FindNodes(Iteration).visit(root)]
+            for i in FindNodes(Call).visit(root):
+                handle = self.func_table.get(i.name)
+                if handle is not None and handle.local:
+                    found.extend(dimensions(handle.root))
+            return found
+
+        invariants = []
+        mapper = OrderedDict()
+        for root in filter_ordered(i[0] for i in retrieve_iteration_tree(nodes)):
+            exprs = expressions(root)
+            writes = filter_ordered(i.write for i in exprs if not i.is_scalar)
+            reads = [i for i in flatten(e.functions for e in exprs)
+                     if i.is_Array and i not in writes]
+            if not writes or any(d.is_Time for d in dimensions(root)):
+                continue
+            if any(not (i.is_Array and i._mem_heap) for i in writes):
+                continue
+            if any(i not in invariants for i in reads):
+                # Depends on temporaries that are not time-invariant
+                continue
+            invariants.extend(writes)
+            mapper[root] = writes
+
+        # The temporaries must not be written anywhere else
+        others = [i.write for i in expressions(Transformer({k: None for k in mapper})
+                                               .visit(nodes))]
+        if not mapper or any(i in others for i in invariants):
+            return nodes
+
+        self._invariants = invariants
+        self._invariants_flag = Scalar(name='invariants_stale', dtype=np.int32)
+        self._invariants_deps = [i.name for i in derive_parameters(tuple(mapper))
+                                 if i not in invariants]
+        mapper = {k: Conditional(self._invariants_flag, k) for k in mapper}
+        return Transformer(mapper).visit(nodes)
+
+    def _convert_storage(self, clusters):
+        """
+        Wrap the accesses to the :class:`Function`s in a compact storage format
+        (e.g., ``storage_dtype=numpy.float16``) with the conversions from/to
+        the data type of the arithmetic, namely ``self.dtype``.
+        """
+        loads = {np.float16: LoadHalf, bfloat16: LoadBFloat16}
+        stores = {np.float16: StoreHalf, bfloat16: StoreBFloat16}
+        storage = lambda i: getattr(i.base.function, 'storage_dtype', None)
+
+        processed = []
+        conversions = set()
+        for cluster in clusters:
+            exprs = []
+            for e in cluster.exprs:
+                mapper = {i: loads[storage(i)](i) for i in retrieve_indexed(e.rhs)
+                          if storage(i) in loads}
+                rhs = e.rhs.xreplace(mapper)
+                if storage(e.lhs) in stores:
+                    if q_inc(e):
+                        raise InvalidOperator("Cannot increment `%s`, as it's "
+                                              "stored in a compact format"
+                                              % e.lhs.base.function.name)
+                    rhs = stores[storage(e.lhs)](rhs)
+                if rhs is not e.rhs:
+                    e = ClusterizedEq(e.lhs, rhs, ispace=e.ispace,
+                                      is_Increment=e.is_Increment)
+                    conversions.update(i.cname for i in rhs.atoms(Load, Store))
+                exprs.append(e)
+            processed.append(cluster.rebuild(exprs))
+
+        self._globals.extend(c.Line(v) for k, v in storage_conversions.items()
+                             if k in conversions)
+
+        return processed
+
     def _specialize(self, nodes):
         """Transform the Iteration/Expression tree into a backend-specific
         representation, such as code to be executed on a GPU or through a
@@ -236,7 +591,10 @@ class Operator(Callable):
     def _build_parameters(self, nodes):
         """Determine the Operator parameters based on the Iteration/Expression
         tree ``nodes``."""
-        return derive_parameters(nodes, True)
+        parameters = derive_parameters(nodes, True) + list(self._heap_arrays)
+        if self._invariants:
+            parameters.append(self._invariants_flag)
+        return parameters
 
     def _build_casts(self, nodes):
         """Introduce array and pointer casts at the top of the Iteration/Expression
@@ -261,13 +619,44 @@ class OperatorRunnable(Operator):
         # Build the arguments list to invoke the kernel function
         arguments = self.arguments(**kwargs)
 
+        # Empirically-driven JIT-compilation, if requested
+        if self._lib is None and self._compiling is None:
+            if configuration['compiler-autotuning']:
+                self._autotune_compiler(arguments)
+            elif configuration['compiler-pgo']:
+                self._compile_pgo(arguments)
+
         # Invoke kernel function with args
         arg_values = [arguments[p.name] for p in self.parameters]
         self.cfunction(*arg_values)
 
+        # The persistent time-invariant temporaries are now up-to-date
+        if self._invariants:
+            self._invariants_key = self._invariants_signature(arguments)
+
+        # The data written by the kernel has changed
+        for i in self.output:
+            value = arguments.get(i.name)
+            if getattr(value, '_version', None) is not None:
+                value._modified()
+
         # Output summary of performance achieved
         return self._profile_output(arguments)
 
+    def bind(self, **kwargs):
+        """
+        Process the runtime arguments once, and return a :class:`BoundOperator`
+        to repeatedly apply the stencil kernel with little Python overhead.
+
+        :param kwargs: The runtime arguments, as in ``apply``.
+        """
+        arguments = self.arguments(**kwargs)
+        if self._invariants:
+            # Data may be modified across calls, unbeknownst to the BoundOperator,
+            # so the time-invariant temporaries are recomputed upon each call
+            arguments[self._invariants_flag.name] = 1
+        return BoundOperator(self, arguments)
+
     def _profile_output(self, arguments):
         """Return a performance summary of the profiled sections."""
         summary = self.profiler.summary(arguments, self.dtype)
@@ -286,6 +675,95 @@ class OperatorRunnable(Operator):
         return nodes, profiler
 
 
+class BoundOperator(object):
+
+    """
+    An :class:`OperatorRunnable` bound to a set of runtime arguments.
+
+    The arguments are converted into a vector of ctypes values once and for
+    all, so that a call boils down to patching the entries that change (e.g.,
+    ``time_s`` and ``time_e``) and invoking the JIT-compiled function.
+
+    :param operator: The bound :class:`OperatorRunnable`.
+    :param arguments: A mapper from parameter names to runtime values, as
+                      returned by :meth:`Operator.arguments`.
+    """
+
+    def __init__(self, operator, arguments):
+        self.operator = operator
+        self.arguments = arguments
+
+        parameters = operator.parameters
+        self._index = {p.name: n for n, p in enumerate(parameters)}
+
+        # Validate the arguments through the C types of the JIT-compiled
+        # function, then build the ctypes values which will be passed as they are
+        argtypes = operator.cfunction.argtypes
+        self._cargs = []
+        for p, argtype in zip(parameters, argtypes):
+            value = arguments[p.name]
+            argtype.from_param(value)
+            if p.is_Scalar:
+                self._cargs.append(numpy_to_ctypes(p.dtype)(value))
+            elif p.is_Tensor:
+                self._cargs.append(value.ctypes.data_as(ctypes.c_void_p))
+            else:
+                self._cargs.append(value)
+
+        # A fresh handle to the function, with no argtypes to convert through
+        self._cfunction = operator._lib[operator.name]
+
+        # The profiler timers are accumulated by the generated code
+        self._timers = arguments[operator.profiler.name]._obj
+
+        # The output data, whose version must be bumped upon each call
+        self._outputs = [arguments[i.name] for i in operator.output
+                         if getattr(arguments.get(i.name), '_version', None) is not None]
+
+        self.ncalls = 0
+        self.overhead = 0.
+
+    def __call__(self, **kwargs):
+        """
+        Apply the stencil kernel.
+
+        :param kwargs: New values for any scalar parameter, by name (e.g.,
+                       ``time_s=4, time_e=8``).
+        """
+        tic = time()
+        for k, v in kwargs.items():
+            try:
+                index = self._index[k]
+            except KeyError:
+                raise ValueError("Unknown parameter %s" % k)
+            if not self.operator.parameters[index].is_Scalar:
+                raise ValueError("Only scalar parameters may be changed, not %s" % k)
+            self._cargs[index].value = v
+            self.arguments[k] = v
+        ctypes.memset(ctypes.addressof(self._timers), 0, ctypes.sizeof(self._timers))
+        toc = time()
+
+        retval = self._cfunction(*self._cargs)
+
+        # The data written by the kernel has changed
+        tic2 = time()
+        for i in self._outputs:
+            i._modified()
+
+        self.ncalls += 1
+        self.overhead += toc - tic + time() - tic2
+        return retval
+
+    @property
+    def overhead_per_call(self):
+        """The average Python overhead of a call, in seconds."""
+        return self.overhead / max(self.ncalls, 1)
+
+    def summary(self):
+        """Return a performance summary of the last call."""
+        return self.operator._profile_output(self.arguments)
+
+
 # Functions collecting information from a bag of expressions
 
 def retrieve_dtype(expressions):
@@ -369,3 +847,262 @@ def set_dle_mode(mode):
         else:
             return tuple(flatten(i.split(',') for i in mode)), {}
     raise TypeError("Illegal DLE mode %s." % str(mode))
+
+
+# Lowering cache
+
+
+class LoweringCache(object):
+
+    """
+    A cache of lowered :class:`Operator`s, that is Operators which have gone
+    through the whole lowering pipeline (clusterization, DSE, IET construction,
+    DLE, ...).
+
+    An entry is keyed on a canonical representation of the lowered equations
+    (thus including ``subs``), the structure (but not the data) of the involved
+    Functions, the DSE and DLE modes, and the configuration. Entries are stored
+    in pickled form, so that a cached Operator never keeps user data alive.
+    On a cache hit, the Operator state is unpickled and rebound, by name, to
+    the Functions, Constants and Dimensions provided by the caller; further,
+    if the cached Operator was already JIT-compiled, its shared object is
+    reused straight away.
+    """
+
+    # Not part of the Operator state, or specific to an Operator instance
+    _volatile = ['input', 'output', 'dimensions', '_lowering_key', 'build_profile',
+                 '_compiler', '_lib', '_cfunction', '_compiling', '_heap_pool',
+                 '_invariants_key']
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, operator, expressions, dse, dle):
+        """
+        Return the cache key of ``operator``, or None if the cache is disabled
+        or ``operator`` can't be cached.
+        """
+        if not configuration['lowering-cache'] or not operator._cacheable:
+            return None
+        signature = [operator.__class__.__name__, operator.name,
+                     set_dse_mode(dse), str(set_dle_mode(dle))]
+        signature.extend(str(i) for i in expressions)
+        for i in operator.input + operator.output:
+            signature.append(str((i.__class__.__base__.__name__, i.name, i.dtype,
+                                  getattr(i, 'storage_dtype', None),
+                                  i.shape, i.indices, getattr(i, 'staggered', None),
+                                  getattr(i, '_halo', None),
+                                  getattr(i, '_padding', None))))
+        for i in operator.dimensions:
+            signature.append(str((i.__class__.__name__, i._hashable_content())))
+        signature.extend(str(i) for i in configuration.items()
+                         if not i[0].startswith(('lowering-cache', 'log_level')))
+        signature.append(' '.join(operator._compiler._cmdline([])))
+        return sha1(''.join(signature).encode()).hexdigest()
+
+    def fetch(self, operator):
+        """
+        Initialize ``operator`` from the cache. Return True on a cache hit,
+        False otherwise.
+        """
+        key = operator._lowering_key
+        if key is None:
+            return False
+
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            entry = self._load(key)
+        if entry is None:
+            self.misses += 1
+            debug("Operator `%s`: lowering cache miss [%s]" % (operator.name, key))
+            return False
+        self.entries[key] = entry
+        self._evict()
+
+        self.loads(operator, entry['state'])
+        if entry['lib'] is not None:
+            operator._lib = entry['lib']
+
+        self.hits += 1
+        debug("Operator `%s`: lowering cache hit [%s]" % (operator.name, key))
+        return True
+
+    def store(self, operator):
+        """Add the lowered ``operator`` to the cache."""
+        key = operator._lowering_key
+        if key is None or key in self.entries:
+            return
+        state = self.dumps(operator)
+        if state is None:
+            return
+        self.entries[key] = {'state': state, 'lib': None}
+        self._evict()
+        self._dump(key, state)
+
+    def dumps(self, operator):
+        """
+        Return the pickled state of the lowered ``operator``, or None if it
+        can't be pickled.
+        """
+        state = {k: v for k, v in operator.__dict__.items() if k not in self._volatile}
+        for i in ['input', 'output', 'dimensions']:
+            state[i] = getattr(operator, i)
+        try:
+            return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            debug("Operator `%s`: couldn't be cached [%s]" % (operator.name, e))
+            return None
+
+    def loads(self, operator, state):
+        """
+        Initialize ``operator`` from the pickled ``state`` of an identical
+        lowered Operator, rebinding it, by name, to the Functions, Constants
+        and Dimensions of ``operator``.
+        """
+        state = pickle.loads(state)
+        mapper = {i.name: i for i in operator.input + operator.output +
+                  operator.dimensions}
+        for i in ['input', 'output', 'dimensions']:
+            state[i] = [mapper.get(j.name, j) for j in state[i]]
+        state['parameters'] = tuple(mapper.get(i.name, i) for i in state['parameters'])
+        operator.__dict__.update(state)
+
+    def put(self, key, state):
+        """Add an entry, given as a pickled Operator state, to the cache."""
+        if key is not None and key not in self.entries:
+            self.entries[key] = {'state': state, 'lib': None}
+            self._evict()
+
+    def state(self, key):
+        """Return the pickled Operator state cached under ``key``, if any."""
+        entry = self.entries.get(key)
+        return entry['state'] if entry is not None else None
+
+    def store_lib(self, operator):
+        """Attach the JIT-compiled shared object of ``operator`` to its entry."""
+        entry = self.entries.get(operator._lowering_key)
+        if entry is not None:
+            entry['lib'] = operator._lib
+
+    def clear(self):
+        """Drop all in-memory entries and reset the statistics."""
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def _evict(self):
+        while len(self.entries) > configuration['lowering-cache-size']:
+            self.entries.popitem(last=False)
+
+    def _filename(self, key):
+        dirname = configuration['lowering-cache-dir']
+        return path.join(dirname, '%s.pkl' % key) if dirname else None
+
+    def _load(self, key):
+        filename = self._filename(key)
+        if filename is None or not path.exists(filename):
+            return None
+        try:
+            with open(filename, 'rb') as f:
+                return {'state': f.read(), 'lib': None}
+        except (IOError, OSError):
+            return None
+
+    def _dump(self, key, state):
+        filename = self._filename(key)
+        if filename is None or path.exists(filename):
+            return
+        try:
+            if not path.isdir(path.dirname(filename)):
+                makedirs(path.dirname(filename))
+            # Write to a private file, then atomically move it in place
+            tmpname = '%s.tmp%d' % (filename, getpid())
+            with open(tmpname, 'wb') as f:
+                f.write(state)
+            rename(tmpname, filename)
+        except (IOError, OSError) as e:
+            debug("Couldn't write `%s` to disk [%s]" % (filename, e))
+
+
+lowering_cache = LoweringCache()
+"""The process-wide cache of lowered Operators."""
+
+
+# Bulk Operator construction
+
+
+def build_operators(specs, **kwargs):
+    """
+    Build and JIT-compile many :class:`Operator`s at once.
+
+    The symbolic lowering of the Operators is carried out in a pool of forked
+    processes; the lowered Operators are shipped back in pickled form and
+    rebound to the caller's Functions. All C compilations are then run
+    concurrently through :meth:`Operator.compile_async`. The number of
+    processes and compilation workers is ``configuration['jit-workers']``.
+
+    :param specs: A list of Operator specifications. Each specification is
+                  either a (list of) equation(s) or a 2-tuple
+                  ``(expressions, kwargs)``, with ``kwargs`` overriding the
+                  options in ``kwargs`` for that specific Operator.
+    :param kwargs: Options shared by all Operators (``name``, ``subs``, ``dse``,
+                   ``dle``, ...).
+
+    :returns: A list of JIT-compiled Operators, in the same order as ``specs``.
+    """
+    from devito.base import Operator as BackendOperator
+
+    processed = []
+    for spec in specs:
+        if isinstance(spec, tuple) and len(spec) == 2 and isinstance(spec[1], dict):
+            expressions, options = spec
+        else:
+            expressions, options = spec, {}
+        options = dict(kwargs, **options)
+        processed.append((BackendOperator, as_tuple(expressions), options))
+
+    # Lower in separate processes. Forking makes the specs (and thus the
+    # caller's Functions) available to the workers without serialization
+    states = [None]*len(processed)
+    nworkers = min(configuration['jit-workers'], len(processed))
+    if nworkers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        # Forking while the background compilations are running isn't safe
+        wait_jit_executor()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(nworkers, mp_context=context,
+                                 initializer=_init_lowering_worker,
+                                 initargs=(processed,)) as executor:
+            states = list(executor.map(_lower_spec, range(len(processed))))
+
+    # Build the Operators, skipping the lowering if done by a worker
+    operators = [cls(expressions, lowered=state, **options)
+                 for (cls, expressions, options), state in zip(processed, states)]
+
+    # JIT-compile concurrently, then load the shared objects
+    futures = [op.compile_async() for op in operators]
+    for op, i in zip(operators, futures):
+        i.result()
+        op.cfunction
+
+    return operators
+
+
+def _init_lowering_worker(specs):
+    """Hand the Operator specifications ``specs`` to a lowering process."""
+    global _worker_specs
+    _worker_specs = specs
+
+
+def _lower_spec(i):
+    """
+    Lower the ``i``-th Operator specification handed to this process. Return
+    the pickled Operator state, if it can be pickled.
+    """
+    cls, expressions, options = _worker_specs[i]
+    op = cls(expressions, **options)
+    return lowering_cache.dumps(op) if op._cacheable else None
+
+
+_worker_specs = None
+"""In a lowering process, the Operator specifications of :func:`build_operators`."""
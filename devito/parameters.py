@@ -100,10 +100,29 @@ env_vars_mapper = {
     'DEVITO_DSE': 'dse',
     'DEVITO_DLE': 'dle',
     'DEVITO_DLE_OPTIONS': 'dle_options',
+    'DEVITO_DSE_CACHE': 'dse-cache',
+    'DEVITO_DSE_CACHE_DIR': 'dse-cache-dir',
+    'DEVITO_DSE_CACHE_SIZE': 'dse-cache-size',
+    'DEVITO_DSE_WORKERS': 'dse-workers',
+    'DEVITO_DSE_FMA': 'dse-fma',
+    'DEVITO_PEAK_GFLOPSS': 'peak-gflopss',
+    'DEVITO_PEAK_BANDWIDTH': 'peak-bandwidth',
     'DEVITO_OPENMP': 'openmp',
     'DEVITO_LOGGING': 'log_level',
     'DEVITO_FIRST_TOUCH': 'first_touch',
     'DEVITO_DEBUG_COMPILER': 'debug_compiler',
+    'DEVITO_JIT_CACHE': 'jit-cache',
+    'DEVITO_JIT_CACHE_DIR': 'jit-cache-dir',
+    'DEVITO_JIT_CACHE_SIZE': 'jit-cache-size',
+    'DEVITO_JIT_WORKERS': 'jit-workers',
+    'DEVITO_JIT_INMEMORY': 'jit-inmemory',
+    'DEVITO_COMPILER_PGO': 'compiler-pgo',
+    'DEVITO_COMPILER_AUTOTUNING': 'compiler-autotuning',
+    'DEVITO_LOWERING_CACHE': 'lowering-cache',
+    'DEVITO_LOWERING_CACHE_DIR': 'lowering-cache-dir',
+    'DEVITO_LOWERING_CACHE_SIZE': 'lowering-cache-size',
+    'DEVITO_HEAP_POOL': 'heap-pool',
+    'DEVITO_PERSISTENT_INVARIANTS': 'persistent-invariants',
 }
 
 configuration = Parameters("Devito-Configuration")
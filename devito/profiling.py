@@ -1,8 +1,11 @@
 from __future__ import absolute_import
 
+import json
 import operator
 from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
 from functools import reduce
+from time import time
 
 from ctypes import Structure, byref, c_double
 from cgen import Struct, Value
@@ -12,7 +15,7 @@ from devito.ir.iet import (Expression, TimedList, FindNodes, Transformer,
 from devito.symbolics import estimate_cost, estimate_memory
 from devito.tools import flatten
 
-__all__ = ['Profile', 'create_profile']
+__all__ = ['BuildProfile', 'Profile', 'create_profile']
 
 
 def create_profile(name, node):
@@ -83,10 +86,11 @@ def create_profile(name, node):
         # Estimate computational properties of the profiled section
         expressions = FindNodes(Expression).visit(body)
         ops = estimate_cost([e.expr for e in expressions])
+        ops_fma = estimate_cost([e.expr for e in expressions], fma=True)
         memory = estimate_memory([e.expr for e in expressions])
 
         # Keep track of the new profiled section
-        profiler.add(lname, group[0], ops, memory)
+        profiler.add(lname, group[0], ops, memory, ops_fma)
 
     # Transform the Iteration/Expression tree introducing the C-level timers
     processed = Transformer(mapper).visit(node)
@@ -106,7 +110,7 @@ class Profiler(object):
         self.name = name
         self._sections = OrderedDict()
 
-    def add(self, name, section, ops, memory):
+    def add(self, name, section, ops, memory, ops_fma=None):
         """
         Add a profiling section.
 
@@ -114,8 +118,11 @@ class Profiler(object):
         :param section: The code section, represented as a tuple of :class:`Iteration`s.
         :param ops: The number of floating-point operations in the section.
         :param memory: The memory traffic in the section, as bytes moved from/to memory.
+        :param ops_fma: (Optional) The number of operations in the section, with
+                        each fused multiply-add counted once. Defaults to ``ops``.
         """
-        self._sections[section] = Profile(name, ops, memory)
+        ops_fma = ops if ops_fma is None else ops_fma
+        self._sections[section] = Profile(name, ops, memory, ops_fma)
 
     def new(self):
         """
@@ -163,7 +170,7 @@ class Profiler(object):
 
             # Keep track of performance achieved
             summary.setsection(profile.name, time, gflopss, gpointss, oi, profile.ops,
-                               itershape, datashape)
+                               itershape, datashape, profile.ops_fma)
 
         # Rename the most time consuming section as 'main'
         if len(summary) > 0:
@@ -195,8 +202,11 @@ class PerformanceSummary(OrderedDict):
     A special dictionary to track and quickly access performance data.
     """
 
-    def setsection(self, key, time, gflopss, gpointss, oi, ops, itershape, datashape):
-        self[key] = PerfEntry(time, gflopss, gpointss, oi, ops, itershape, datashape)
+    def setsection(self, key, time, gflopss, gpointss, oi, ops, itershape, datashape,
+                   ops_fma=None):
+        ops_fma = ops if ops_fma is None else ops_fma
+        self[key] = PerfEntry(time, gflopss, gpointss, oi, ops, itershape, datashape,
+                              ops_fma)
 
     @property
     def gflopss(self):
@@ -211,9 +221,97 @@ class PerformanceSummary(OrderedDict):
         return OrderedDict([(k, v.time) for k, v in self.items()])
 
 
-Profile = namedtuple('Profile', 'name ops memory')
+class BuildProfile(OrderedDict):
+
+    """
+    Track where the construction of an :class:`Operator` spends its time.
+
+    Each entry maps a build stage (e.g., ``clusterize``, ``dse.factorize``,
+    ``compilation``) to a :class:`BuildEntry`, that is the wall time spent in
+    that stage and the number of expressions in input to and in output from
+    that stage, if meaningful. The size of the generated code is also tracked,
+    as well as the choices made automatically by a stage (e.g., the DSE mode
+    picked by ``dse='auto'``).
+    """
+
+    def __init__(self):
+        super(BuildProfile, self).__init__()
+        self.code_size = None
+        self.code_lines = None
+        self.choices = OrderedDict()
+
+    def add(self, stage, time=0., nexprs_in=None, nexprs_out=None):
+        """
+        Record ``stage``. If ``stage`` was recorded before (e.g., a DSE pass
+        applied to several clusters), the time and expression counts add up.
+        """
+        if stage in self:
+            entry = self[stage]
+            time += entry.time
+            nexprs_in = _sum_counts(entry.nexprs_in, nexprs_in)
+            nexprs_out = _sum_counts(entry.nexprs_out, nexprs_out)
+        self[stage] = BuildEntry(time, nexprs_in, nexprs_out)
+
+    @contextmanager
+    def timer(self, stage):
+        """Record the wall time spent in the enclosed block as ``stage``."""
+        # Any nested stage recorded within the block comes after ``stage``
+        self.add(stage)
+        tic = time()
+        yield
+        self.add(stage, time() - tic)
+
+    def choose(self, stage, choice):
+        """Record that ``stage`` automatically picked ``choice``."""
+        self.choices[stage] = choice
+
+    def set_code(self, ccode):
+        """Record the size of the generated code ``ccode``."""
+        ccode = str(ccode)
+        self.code_size = len(ccode)
+        self.code_lines = ccode.count('\n') + 1
+
+    @property
+    def elapsed(self):
+        """The total build time, excluding nested stages."""
+        return sum(v.time for k, v in self.items() if '.' not in k)
+
+    def as_dict(self):
+        return OrderedDict([('stages', OrderedDict([(k, v._asdict())
+                                                    for k, v in self.items()])),
+                            ('choices', self.choices),
+                            ('elapsed', self.elapsed),
+                            ('code_size', self.code_size),
+                            ('code_lines', self.code_lines)])
+
+    def to_json(self, **kwargs):
+        """Return a JSON representation. ``kwargs`` are passed to ``json.dumps``."""
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+def _sum_counts(a, b):
+    return b if a is None else (a if b is None else a + b)
+
+
+def count_exprs(nodes):
+    """
+    Return the number of expressions in an iterable of :class:`Cluster`s
+    or in an Iteration/Expression tree.
+    """
+    try:
+        return sum(len(c.exprs) for c in nodes)
+    except (AttributeError, TypeError):
+        return len(FindNodes(Expression).visit(nodes))
+
+
+BuildEntry = namedtuple('BuildEntry', 'time nexprs_in nexprs_out')
+"""Structured build-time data."""
+
+
+Profile = namedtuple('Profile', 'name ops memory ops_fma')
 """Metadata for a profiled code section."""
 
 
-PerfEntry = namedtuple('PerfEntry', 'time gflopss gpointss oi ops itershape datashape')
+PerfEntry = namedtuple('PerfEntry', 'time gflopss gpointss oi ops itershape datashape '
+                       'ops_fma')
 """Structured performance data."""
@@ -9,9 +9,10 @@ from sympy.functions.elementary.trigonometric import TrigonometricFunction
 
 from devito.tools import as_tuple
 
-__all__ = ['FrozenExpr', 'Eq', 'CondEq', 'CondNe', 'Mul', 'Add', 'IntDiv',
-           'FunctionFromPointer', 'ListInitializer', 'taylor_sin', 'taylor_cos',
-           'bhaskara_sin', 'bhaskara_cos']
+__all__ = ['FrozenExpr', 'Eq', 'CondEq', 'CondNe', 'Mul', 'Add', 'IntDiv', 'FMA',
+           'FMAF', 'Load', 'LoadHalf', 'LoadBFloat16', 'Store', 'StoreHalf',
+           'StoreBFloat16', 'FunctionFromPointer', 'ListInitializer', 'Byref',
+           'taylor_sin', 'taylor_cos', 'bhaskara_sin', 'bhaskara_cos']
 
 
 class FrozenExpr(Expr):
@@ -99,6 +100,76 @@ class IntDiv(sympy.Expr):
     __repr__ = __str__
 
 
+class FMA(sympy.Function):
+
+    """
+    Symbolic representation of the C notation ``fma(a, b, c)``, that is ``a*b + c``
+    computed as a single operation, with a single rounding.
+    """
+
+    nargs = 3
+
+    cname = 'fma'
+
+
+class FMAF(FMA):
+
+    """
+    Symbolic representation of the C notation ``fmaf(a, b, c)``, that is the
+    single-precision :class:`FMA`.
+    """
+
+    cname = 'fmaf'
+
+
+class Load(sympy.Function):
+
+    """
+    Symbolic representation of a load from a compact storage format, that is
+    the conversion of a stored value into the data type of the arithmetic.
+    """
+
+    nargs = 1
+
+
+class LoadHalf(Load):
+
+    """A :class:`Load` from the IEEE-754 half-precision format."""
+
+    cname = 'load_half'
+
+
+class LoadBFloat16(Load):
+
+    """A :class:`Load` from the bfloat16 format."""
+
+    cname = 'load_bfloat16'
+
+
+class Store(sympy.Function):
+
+    """
+    Symbolic representation of a store into a compact storage format, that is
+    the rounding of a value to the storage format.
+    """
+
+    nargs = 1
+
+
+class StoreHalf(Store):
+
+    """A :class:`Store` into the IEEE-754 half-precision format."""
+
+    cname = 'store_half'
+
+
+class StoreBFloat16(Store):
+
+    """A :class:`Store` into the bfloat16 format."""
+
+    cname = 'store_bfloat16'
+
+
 class FunctionFromPointer(sympy.Expr):
 
     """
@@ -140,6 +211,16 @@ class ListInitializer(sympy.Symbol):
     __repr__ = __str__
 
 
+class Byref(sympy.Function):
+
+    """
+    Symbolic representation of the C notation ``&expr``, that is the address
+    of ``expr`` (e.g., an array element).
+    """
+
+    nargs = 1
+
+
 class taylor_sin(TrigonometricFunction):
 
     """
@@ -4,12 +4,14 @@ from operator import attrgetter
 from sympy import Indexed, cos, sin
 
 from devito.dimension import Dimension
+from devito.symbolics.extended_sympy import FMA, Load, Store
 from devito.symbolics.search import retrieve_indexed, retrieve_ops, search
-from devito.symbolics.queries import q_timedimension
+from devito.symbolics.queries import q_reciprocal, q_timedimension
 from devito.logger import warning
 from devito.tools import flatten, filter_sorted, partial_order
 
-__all__ = ['count', 'estimate_cost', 'estimate_memory', 'dimension_sort']
+__all__ = ['count', 'count_divisions', 'estimate_cost', 'estimate_memory',
+           'dimension_sort']
 
 
 def count(exprs, query):
@@ -23,12 +25,22 @@ def count(exprs, query):
     return dict(mapper)
 
 
-def estimate_cost(handle, estimate_functions=False):
+def count_divisions(exprs):
+    """
+    Return the number of divisions, that is powers with negative exponent, in
+    the expressions ``exprs``.
+    """
+    return sum(count(exprs, q_reciprocal).values())
+
+
+def estimate_cost(handle, estimate_functions=False, fma=False):
     """Estimate the operation count of ``handle``.
 
     :param handle: a SymPy expression or an iterator of SymPy expressions.
     :param estimate_functions: approximate the operation count of known
                                functions (eg, sin, cos).
+    :param fma: count a fused multiply-add (i.e., an :class:`FMA`) as a single
+                operation, rather than as a multiplication plus an addition.
     """
     external_functions = {sin: 50, cos: 50}
     try:
@@ -54,7 +66,12 @@ def estimate_cost(handle, estimate_functions=False):
         operations = flatten(retrieve_ops(i) for i in handle)
         flops = 0
         for op in operations:
-            if op.is_Function:
+            if isinstance(op, FMA):
+                flops += 1 if fma else 2
+            elif isinstance(op, (Load, Store)):
+                # Conversions from/to the storage format aren't floating-point ops
+                continue
+            elif op.is_Function:
                 if estimate_functions:
                     flops += external_functions.get(op.__class__, 1)
                 else:
@@ -5,7 +5,7 @@ from devito.tools import as_tuple
 
 __all__ = ['q_leaf', 'q_indexed', 'q_terminal', 'q_trigonometry', 'q_op',
            'q_terminalop', 'q_sum_of_product', 'q_indirect', 'q_timedimension',
-           'q_affine', 'q_linear', 'q_identity', 'q_inc',
+           'q_affine', 'q_linear', 'q_identity', 'q_inc', 'q_reciprocal',
            'iq_timeinvariant', 'iq_timevarying']
 
 
@@ -85,6 +85,10 @@ def q_timedimension(expr):
     return isinstance(expr, Dimension) and expr.is_Time
 
 
+def q_reciprocal(expr):
+    return expr.is_Pow and expr.exp.is_Number and expr.exp < 0
+
+
 def q_inc(expr):
     try:
         return expr.is_Increment
@@ -150,7 +150,8 @@ def partial_order(elements):
 
 def numpy_to_ctypes(dtype):
     """Map numpy types to ctypes types."""
-    return {np.int32: ctypes.c_int,
+    return {np.uint16: ctypes.c_uint16,
+            np.int32: ctypes.c_int,
             np.float32: ctypes.c_float,
             np.int64: ctypes.c_int64,
             np.float64: ctypes.c_double}[dtype]
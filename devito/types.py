@@ -2,6 +2,7 @@ from __future__ import absolute_import
 import weakref
 import abc
 import gc
+from ctypes import Structure
 
 import numpy as np
 import sympy
@@ -133,6 +134,19 @@ class Cached(object):
         original = _SymbolCache[self.__class__]
         self.__dict__ = original().__dict__
 
+    # Pickling support
+
+    _pickle_exclude = ['_data', 'initializer']
+    """Attributes that are not serialized, such as any user-provided data."""
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in self._pickle_exclude}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for i in self._pickle_exclude:
+            self.__dict__.setdefault(i, None)
+
 
 class AbstractSymbol(sympy.Symbol, Basic):
     """
@@ -214,6 +228,18 @@ class AbstractCachedSymbol(AbstractSymbol, Cached):
             newcls._cache_put(newobj)
         return newobj
 
+    # Pickling support
+
+    __getstate__ = Cached.__getstate__
+    __setstate__ = Cached.__setstate__
+
+    def __reduce_ex__(self, proto):
+        # The dynamically created class cannot be looked up by pickle, so the
+        # object is rebuilt from the base class and the cached state
+        cls = self.__class__.__base__
+        return (_unpickle_symbol, (cls, self.name, self._assumptions),
+                self.__getstate__())
+
 
 class Symbol(AbstractCachedSymbol):
 
@@ -306,6 +332,21 @@ class AbstractCachedFunction(AbstractFunction, Cached):
             newcls._cache_put(newobj)
         return newobj
 
+    # Pickling support
+
+    __getstate__ = Cached.__getstate__
+    __setstate__ = Cached.__setstate__
+
+    def __reduce_ex__(self, proto):
+        if self.function is not self:
+            # E.g., `u(t + dt, x)`, which shares its state with `u(t, x)`
+            return (_unpickle_applied, (self.function, self.args))
+        # The dynamically created class cannot be looked up by pickle, so the
+        # object is rebuilt from the base class and the cached state
+        cls = self.__class__.__base__
+        return (_unpickle_function, (cls, self.name, self.args),
+                self.__getstate__())
+
     @classmethod
     def __indices_setup__(cls, **kwargs):
         """Extract the function indices from ``kwargs``."""
@@ -375,6 +416,12 @@ class AbstractCachedFunction(AbstractFunction, Cached):
         from Python (e.g., via NumPy arrays), False otherwise."""
         return False
 
+    @property
+    def _mem_dtype(self):
+        """Return the data type of the elements as laid out in memory, which
+        may differ from ``self.dtype``, the data type of the arithmetic."""
+        return self.dtype
+
     @property
     def _mem_stack(self):
         """Return True if the associated data was/is/will be allocated on the stack
@@ -551,6 +598,22 @@ class Object(Basic):
         else:
             return {}
 
+    # Pickling support
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if isinstance(self.dtype, type) and issubclass(self.dtype, Structure):
+            # Dynamically created ctypes structs can't be pickled, so we
+            # carry over what's necessary to rebuild them
+            state['dtype'] = (self.dtype.__name__, self.dtype._fields_)
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state['dtype'], tuple):
+            name, fields = state['dtype']
+            state['dtype'] = type(name, (Structure,), {'_fields_': fields})
+        self.__dict__.update(state)
+
 
 # Extended SymPy hierarchy follows, for essentially two reasons:
 # - To keep track of `function`
@@ -570,6 +633,9 @@ class IndexedData(sympy.IndexedBase):
         obj.function = self.function
         return obj
 
+    def __getstate__(self):
+        return {'function': self.function}
+
     def __getitem__(self, indices, **kwargs):
         """
         Return :class:`Indexed`, rather than :class:`sympy.Indexed`.
@@ -595,6 +661,27 @@ class Indexed(sympy.Indexed):
 # Utilities
 
 
+def _unpickle_symbol(cls, name, assumptions):
+    """Rebuild a pickled :class:`AbstractCachedSymbol`."""
+    newcls = cls._symbol_type(name)
+    newobj = sympy.Symbol.__new__(newcls, name, **assumptions.generator)
+    newcls._cache_put(newobj)
+    return newobj
+
+
+def _unpickle_function(cls, name, args):
+    """Rebuild a pickled :class:`AbstractCachedFunction`."""
+    newcls = cls._symbol_type(name)
+    newobj = sympy.Function.__new__(newcls, *args, evaluate=False)
+    newcls._cache_put(newobj)
+    return newobj
+
+
+def _unpickle_applied(function, args):
+    """Rebuild a pickled :class:`AbstractCachedFunction` applied to ``args``."""
+    return function.func(*args)
+
+
 class CacheManager(object):
 
     """
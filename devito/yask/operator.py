@@ -11,6 +11,7 @@ from devito.logger import yask as log, yask_warning as warning
 from devito.ir.iet import (Element, List, PointerCast, MetaCall, IsPerfectIteration,
                            Transformer, filter_iterations, retrieve_iteration_tree)
 from devito.operator import OperatorRunnable
+from devito.symbolics import FMA
 from devito.tools import flatten
 from devito.types import Object
 
@@ -33,6 +34,9 @@ class Operator(OperatorRunnable):
     _default_headers += ['#define restrict __restrict']
     _default_includes = OperatorRunnable._default_includes + ['yask_kernel_api.hpp']
 
+    # YASK contexts and solutions can't be shared across Operators
+    _cacheable = False
+
     def __init__(self, expressions, **kwargs):
         kwargs['dle'] = ('denormals',) + (('openmp',) if configuration['openmp'] else ())
         super(Operator, self).__init__(expressions, **kwargs)
@@ -147,6 +151,9 @@ class Operator(OperatorRunnable):
         # Output summary of performance achieved
         return self._profile_output(arguments)
 
+    def bind(self, **kwargs):
+        raise NotImplementedError("YASK Operators can only be run through `apply`")
+
     @property
     def compile(self):
         """
@@ -159,12 +166,25 @@ class Operator(OperatorRunnable):
         """
         if self._lib is None:
             # No need to recompile if a shared object has already been loaded.
-            if not isinstance(self.yk_soln, YaskNullKernel):
-                self._compiler.libraries.append(self.yk_soln.soname)
-            return jit_compile(self.ccode, self._compiler)
+            if self._compiling is not None:
+                # Wait for the compilation launched by `compile_async`
+                return self._compiling.result()
+            self._link_yask_kernel()
+            ccode = self._generate_code()
+            with self.build_profile.timer('compilation'):
+                return jit_compile(ccode, self._compiler)
         else:
             return self._lib.name
 
+    def compile_async(self):
+        if self._lib is None and self._compiling is None:
+            self._link_yask_kernel()
+        return super(Operator, self).compile_async()
+
+    def _link_yask_kernel(self):
+        if not isinstance(self.yk_soln, YaskNullKernel):
+            self._compiler.libraries.append(self.yk_soln.soname)
+
 
 class sympy2yask(object):
     """
@@ -217,6 +237,11 @@ class sympy2yask(object):
                 indices = [int((i.origin if isinstance(i, LoweredDimension) else i) - j)
                            for i, j in zip(expr.indices, function.indices)]
                 return self.mapper[function].new_relative_grid_point(indices)
+            elif isinstance(expr, FMA):
+                # YASK takes care of fusing multiply-adds itself
+                a, b, addend = expr.args
+                return nfac.new_add_node(nfac.new_multiply_node(run(a), run(b)),
+                                         run(addend))
             elif expr.is_Add:
                 return nary2binary(expr.args, nfac.new_add_node)
             elif expr.is_Mul:
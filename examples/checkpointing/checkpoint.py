@@ -19,17 +19,22 @@ class CheckpointOperator(Operator):
         self.op = op
         self.time_order = kwargs.pop('time_order', 1)
         self.args = kwargs
+        self.bound = None
 
     def apply(self, t_start, t_end):
         """ If the devito operator requires some extra arguments in the call to apply
             they can be stored in the args property of this object so pyRevolve calls
             pyRevolve.Operator.apply() without caring about these extra arguments while
-            this method passes them on correctly to devito.Operator
+            this method passes them on correctly to devito.Operator. As pyRevolve
+            calls this method many times over short time windows, the arguments are
+            processed only once, through devito.Operator.bind(), and only the time
+            window is updated on later calls.
         """
-        args = self.args.copy()
-        args[self.t_arg_names['t_start']] = t_start
-        args[self.t_arg_names['t_end']] = t_end + self.time_order
-        self.op.apply(**args)
+        args = {self.t_arg_names['t_start']: t_start,
+                self.t_arg_names['t_end']: t_end + self.time_order}
+        if self.bound is None:
+            self.bound = self.op.bind(**dict(self.args, **args))
+        self.bound(**args)
 
 
 class DevitoCheckpoint(Checkpoint):
@@ -1,13 +1,23 @@
 from collections import OrderedDict
+from multiprocessing import cpu_count
+from time import time
 import sys
 
 import numpy as np
 import click
 
-from devito import clear_cache, configuration, sweep
-from devito.logger import warning
-from examples.seismic.acoustic.acoustic_example import run as acoustic_run
-from examples.seismic.tti.tti_example import run as tti_run
+from devito import Eq, Function, Grid, clear_cache, configuration, sweep
+from devito.compiler import jit_compile
+from devito.dse import collect, common_subexprs_elimination
+from devito.dse.aliases import calculate_offsets, compare, is_translated
+from devito.ir import LoweredEq, clusterize
+from devito.logger import info, warning
+from devito.symbolics import retrieve_indexed
+from devito.tools import flatten
+from devito.types import Scalar
+from examples.seismic.acoustic.acoustic_example import (run as acoustic_run,
+                                                        acoustic_setup)
+from examples.seismic.tti.tti_example import run as tti_run, tti_setup
 
 
 @click.group()
@@ -16,10 +26,14 @@ def benchmark():
     Benchmarking script for seismic forward operators.
 
     \b
-    There are three main 'execution modes':
+    There are four main 'execution modes':
     run: a single run with given DSE/DLE levels
     bench: complete benchmark with multiple DSE/DLE levels
     test: tests numerical correctness with different parameters
+    jit: compares the latency of the on-disk and in-memory JIT compilation
+    dse: compares the DSE time with and without parallel Cluster rewriting
+    cse: compares the scaling of the CSE engines with the space order
+    aliases: measures the scaling of the alias detection with the candidates
 
     Further, this script can generate a roofline plot from a benchmark
     """
@@ -69,7 +83,7 @@ def option_performance(f):
                 'dle': 'advanced'},
         'dle': {'autotune': True,
                 'dse': 'advanced',
-                'dle': ['basic', 'advanced']}
+                'dle': ['basic', 'advanced', 'advanced-intrinsics']}
     }
 
     def from_preset(ctx, param, value):
@@ -181,6 +195,210 @@ def bench(problem, **kwargs):
     clear_cache()
 
 
+@benchmark.command(name='jit')
+@option_simulation
+@option_performance
+@click.option('-x', '--repeats', default=3,
+              help='Number of compilations per JIT mode')
+def cli_jit(problem, **kwargs):
+    """
+    Compare the latency of the on-disk and in-memory JIT compilation.
+    """
+    jit(problem, **kwargs)
+
+
+def jit(problem, **kwargs):
+    """
+    Compare the latency of the on-disk and in-memory JIT compilation.
+    """
+    setup = tti_setup if problem == 'tti' else acoustic_setup
+    solver = setup(shape=kwargs['shape'], spacing=kwargs['spacing'],
+                   nbpml=kwargs['nbpml'], tn=kwargs['tn'],
+                   space_order=kwargs['space_order'][0],
+                   dse=kwargs['dse'], dle=kwargs['dle'])
+    op = solver.op_fwd(save=False)
+    # Only the compilation is timed, not the code generation
+    ccode = str(op.ccode)
+
+    # The persistent JIT cache would turn all but the first compilation into
+    # cache hits, so it's disabled for the whole benchmark
+    jit_cache, jit_inmemory = configuration['jit-cache'], configuration['jit-inmemory']
+    configuration['jit-cache'] = False
+    timings = OrderedDict()
+    try:
+        for mode, inmemory in [('on-disk', False), ('in-memory', True)]:
+            configuration['jit-inmemory'] = inmemory
+            timings[mode] = []
+            for _ in range(kwargs['repeats']):
+                tic = time()
+                jit_compile(ccode, op._compiler)
+                timings[mode].append(time() - tic)
+    finally:
+        configuration['jit-cache'] = jit_cache
+        configuration['jit-inmemory'] = jit_inmemory
+
+    for mode, v in timings.items():
+        info("JIT compilation %s: min %.2f s, mean %.2f s [%d runs]" %
+             (mode, min(v), np.mean(v), len(v)))
+
+    clear_cache()
+
+    return timings
+
+
+@benchmark.command(name='dse')
+@option_simulation
+@option_performance
+@click.option('-w', '--workers', default=cpu_count(),
+              help='Number of DSE worker processes')
+@click.option('-x', '--repeats', default=3,
+              help='Number of Operator constructions per DSE configuration')
+def cli_dse(problem, **kwargs):
+    """
+    Compare the DSE time with and without parallel Cluster rewriting.
+    """
+    dse(problem, **kwargs)
+
+
+def dse(problem, **kwargs):
+    """
+    Compare the DSE time with and without parallel Cluster rewriting.
+    """
+    setup = tti_setup if problem == 'tti' else acoustic_setup
+
+    # The caches would turn all but the first construction into cache hits
+    lowering_cache = configuration['lowering-cache']
+    dse_cache = configuration['dse-cache']
+    dse_workers = configuration['dse-workers']
+    configuration['lowering-cache'] = False
+    configuration['dse-cache'] = False
+    timings = OrderedDict()
+    try:
+        for workers in [1, kwargs['workers']]:
+            configuration['dse-workers'] = workers
+            timings[workers] = []
+            for _ in range(kwargs['repeats']):
+                # A new solver, hence a new Operator, at each repetition
+                solver = setup(shape=kwargs['shape'], spacing=kwargs['spacing'],
+                               nbpml=kwargs['nbpml'], tn=kwargs['tn'],
+                               space_order=kwargs['space_order'][0],
+                               dse=kwargs['dse'], dle=kwargs['dle'])
+                op = solver.op_fwd(save=False)
+                timings[workers].append(op.build_profile['dse'].time)
+                clear_cache()
+    finally:
+        configuration['lowering-cache'] = lowering_cache
+        configuration['dse-cache'] = dse_cache
+        configuration['dse-workers'] = dse_workers
+
+    for workers, v in timings.items():
+        info("DSE with %d worker(s): min %.2f s, mean %.2f s [%d runs]" %
+             (workers, min(v), np.mean(v), len(v)))
+    serial, parallel = [min(v) for v in timings.values()]
+    info("DSE speedup: %.2fx" % (serial / parallel))
+
+    return timings
+
+
+@benchmark.command(name='cse')
+@option_simulation
+@option_performance
+@click.option('-m', '--mode', multiple=True, default=['default', 'tree'],
+              type=click.Choice(['default', 'tree']), help='CSE engines to compare')
+def cli_cse(problem, **kwargs):
+    """
+    Compare the scaling of the CSE engines with the space order.
+    """
+    cse(problem, **kwargs)
+
+
+def cse(problem, **kwargs):
+    """
+    Compare the scaling of the CSE engines with the space order.
+    """
+    setup = tti_setup if problem == 'tti' else acoustic_setup
+    make = lambda i: Scalar(name='r%d' % i).indexify()
+
+    timings = OrderedDict()
+    for space_order in [4, 8, 12, 16]:
+        solver = setup(shape=kwargs['shape'], spacing=kwargs['spacing'],
+                       nbpml=kwargs['nbpml'], tn=kwargs['tn'],
+                       space_order=space_order, dse='noop', dle='noop')
+        op = solver.op_fwd(save=False)
+        expressions = [LoweredEq(e, subs=op.args['subs'])
+                       for e in op.args['expressions']]
+        exprs = flatten(i.exprs for i in clusterize(expressions))
+
+        for mode in kwargs['mode']:
+            tic = time()
+            processed = common_subexprs_elimination(exprs, make, mode)
+            timings[(space_order, mode)] = time() - tic
+            info("CSE [%s] with space order %d: %.2f s (%d temporaries)" %
+                 (mode, space_order, timings[(space_order, mode)],
+                  len(processed) - len(exprs)))
+
+        clear_cache()
+
+    return timings
+
+
+@benchmark.command(name='aliases')
+@click.option('-n', '--ncandidates', multiple=True, default=[100, 200, 400, 800],
+              help='Number of candidate sums-of-products')
+def cli_aliases(**kwargs):
+    """
+    Measure the scaling of the alias detection with the number of candidates.
+    """
+    aliases(**kwargs)
+
+
+def aliases(**kwargs):
+    """
+    Measure the scaling of the alias detection with the number of candidates.
+    """
+    grid = Grid(shape=(16, 16, 16))
+    x, y, z = grid.dimensions
+    functions = [Function(name='f%d' % i, grid=grid).indexed for i in range(4)]
+
+    timings = OrderedDict()
+    for ncandidates in kwargs['ncandidates']:
+        # Sums-of-products following four patterns, translated along x and y
+        exprs = []
+        for i in range(ncandidates):
+            fa, fb = functions[i % 4], functions[(i + 1) % 4]
+            dx, dy = divmod(i // 4, 8)
+            rhs = (0.5*fa[x + dx, y + dy, z]*fb[x + dx, y + dy + 1, z] +
+                   fb[x + dx + 1, y + dy, z]*fa[x + dx, y + dy, z + 1])
+            exprs.append(Eq(Scalar(name='r%d' % i).indexify(), rhs))
+
+        tic = time()
+        _, found = collect(exprs)
+        timings[(ncandidates, 'signature')] = time() - tic
+
+        # The previous pairwise approach, as a reference
+        tic = time()
+        unseen = [i.rhs for i in exprs]
+        offsets = {i: calculate_offsets(retrieve_indexed(i, mode='all'))[1]
+                   for i in unseen}
+        ngroups = 0
+        while unseen:
+            handle = unseen.pop(0)
+            for e in list(unseen):
+                if compare(handle, e) and is_translated(offsets[handle], offsets[e]):
+                    unseen.remove(e)
+            ngroups += 1
+        timings[(ncandidates, 'pairwise')] = time() - tic
+
+        info("Alias detection over %d candidates: %.2f s by signature, "
+             "%.2f s pairwise (%d aliases, %d groups)" %
+             (ncandidates, timings[(ncandidates, 'signature')],
+              timings[(ncandidates, 'pairwise')], len(found), ngroups))
+
+    clear_cache()
+
+    return timings
+
+
 @benchmark.command(name='plot')
 @option_simulation
 @option_performance
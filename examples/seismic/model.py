@@ -299,6 +299,8 @@ class Model(object):
     :param delta: Thomsen delta parameter (0<delta<1), delta<epsilon
     :param theta: Tilt angle in radian
     :param phi: Asymuth angle in radian
+    :param storage_dtype: (Optional) compact storage format of the model
+                          parameters, such as ``numpy.float16``
 
     The :class:`Model` provides two symbolic data objects for the
     creation of seismic wave propagation operators:
@@ -307,7 +309,7 @@ class Model(object):
     :param damp: The damping field for absorbing boundarycondition
     """
     def __init__(self, origin, spacing, shape, vp, nbpml=20, dtype=np.float32,
-                 epsilon=None, delta=None, theta=None, phi=None):
+                 epsilon=None, delta=None, theta=None, phi=None, storage_dtype=None):
         self.shape = shape
         self.nbpml = int(nbpml)
         self.origin = origin
@@ -320,7 +322,8 @@ class Model(object):
 
         # Create square slowness of the wave as symbol `m`
         if isinstance(vp, np.ndarray):
-            self.m = Function(name="m", grid=self.grid)
+            self.m = Function(name="m", grid=self.grid,
+                              storage_dtype=storage_dtype)
         else:
             self.m = Constant(name="m", value=1/vp**2)
 
@@ -328,7 +331,8 @@ class Model(object):
         self.vp = vp
 
         # Create dampening field as symbol `damp`
-        self.damp = Function(name="damp", grid=self.grid)
+        self.damp = Function(name="damp", grid=self.grid,
+                             storage_dtype=storage_dtype)
         damp_boundary(self.damp.data, self.nbpml, spacing=self.spacing)
 
         # Additional parameter fields for TTI operators
@@ -336,7 +340,8 @@ class Model(object):
 
         if epsilon is not None:
             if isinstance(epsilon, np.ndarray):
-                self.epsilon = Function(name="epsilon", grid=self.grid)
+                self.epsilon = Function(name="epsilon", grid=self.grid,
+                                        storage_dtype=storage_dtype)
                 self.epsilon.data[:] = self.pad(1 + 2 * epsilon)
                 # Maximum velocity is scale*max(vp) if epsilon > 0
                 if np.max(self.epsilon.data) > 0:
@@ -349,7 +354,8 @@ class Model(object):
 
         if delta is not None:
             if isinstance(delta, np.ndarray):
-                self.delta = Function(name="delta", grid=self.grid)
+                self.delta = Function(name="delta", grid=self.grid,
+                                      storage_dtype=storage_dtype)
                 self.delta.data[:] = self.pad(np.sqrt(1 + 2 * delta))
             else:
                 self.delta = delta
@@ -358,7 +364,8 @@ class Model(object):
 
         if theta is not None:
             if isinstance(theta, np.ndarray):
-                self.theta = Function(name="theta", grid=self.grid)
+                self.theta = Function(name="theta", grid=self.grid,
+                                      storage_dtype=storage_dtype)
                 self.theta.data[:] = self.pad(theta)
             else:
                 self.theta = theta
@@ -367,7 +374,8 @@ class Model(object):
 
         if phi is not None:
             if isinstance(phi, np.ndarray):
-                self.phi = Function(name="phi", grid=self.grid)
+                self.phi = Function(name="phi", grid=self.grid,
+                                    storage_dtype=storage_dtype)
                 self.phi.data[:] = self.pad(phi)
             else:
                 self.phi = phi
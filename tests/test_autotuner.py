@@ -61,6 +61,74 @@ def test_at_is_actually_working(shape, expected):
     buffer.close()
 
 
+@silencio(log_level='DEBUG')
+@skipif_yask
+def test_at_hierarchical_blocking():
+    """
+    Check that, with two levels of blocking, the block sizes and the number
+    of blocks in a block of blocks are tuned independently.
+    """
+    shape = (30, 30)
+    grid = Grid(shape=shape)
+
+    buffer = StringIO()
+    temporary_handler = logging.StreamHandler(buffer)
+    logger.addHandler(temporary_handler)
+
+    infield = Function(name='infield', grid=grid)
+    infield.data[:] = np.arange(reduce(mul, shape), dtype=np.int32).reshape(shape)
+    outfield = Function(name='outfield', grid=grid)
+    stencil = Eq(outfield.indexify(), outfield.indexify() + infield.indexify()*3.0)
+    op = Operator(stencil, dle=('blocking', {'blockinner': True, 'blockalways': True,
+                                             'blocklevels': 2}))
+
+    # 3 legal block sizes times 3 block counts, plus the degenerate block
+    op(infield=infield, outfield=outfield, autotune=True)
+    out = [i for i in buffer.getvalue().split('\n') if 'AutoTuner:' in i]
+    assert len(out) == 3*len(options['at_blockcount']) + 1
+
+    logger.removeHandler(temporary_handler)
+
+    temporary_handler.flush()
+    temporary_handler.close()
+    buffer.flush()
+    buffer.close()
+
+
+@silencio(log_level='DEBUG')
+@skipif_yask
+def test_at_prefetch():
+    """
+    Check that the prefetch distance is auto-tuned when software prefetching
+    is in use.
+    """
+    shape = (30, 30)
+    grid = Grid(shape=shape)
+
+    buffer = StringIO()
+    temporary_handler = logging.StreamHandler(buffer)
+    logger.addHandler(temporary_handler)
+
+    infield = Function(name='infield', grid=grid)
+    infield.data[:] = np.arange(reduce(mul, shape), dtype=np.int32).reshape(shape)
+    outfield = Function(name='outfield', grid=grid)
+    stencil = Eq(outfield.indexify(), outfield.indexify() + infield.indexify()*3.0)
+    op = Operator(stencil, dle=('prefetch', {}))
+
+    # One attempt for each prefetch distance
+    op(infield=infield, outfield=outfield, autotune=True)
+    out = [i for i in buffer.getvalue().split('\n') if 'AutoTuner:' in i]
+    assert len(out) == len(options['at_prefetch'])
+    assert np.all(outfield.data == infield.data*3.0)
+
+    logger.removeHandler(temporary_handler)
+
+    temporary_handler.flush()
+    temporary_handler.close()
+    buffer.flush()
+    buffer.close()
+
+
 @silencio(log_level='DEBUG')
 @skipif_yask
 def test_timesteps_per_at_run():
@@ -0,0 +1,192 @@
+from __future__ import absolute_import
+
+from os import path, utime
+from time import time
+
+import numpy as np
+import pytest
+from conftest import skipif_yask
+
+from devito import Grid, Eq, Operator, Function, TimeFunction, configuration
+from devito.compiler import (GNUCompiler, get_lib_ext, get_shm_dir, jit_cache,
+                             pgo_profiled)
+from devito.core.autotuning import tuning_db
+
+
+@pytest.fixture
+def cachedir(tmpdir):
+    """Enable the JIT cache, redirected to a private directory."""
+    previous = configuration['jit-cache'], configuration['jit-cache-dir']
+    configuration['jit-cache'] = 1
+    configuration['jit-cache-dir'] = str(tmpdir)
+    jit_cache.clear()
+    yield str(tmpdir)
+    configuration['jit-cache'], configuration['jit-cache-dir'] = previous
+
+
+@skipif_yask
+class TestJITCache(object):
+
+    def test_key(self):
+        compiler = GNUCompiler()
+        key = jit_cache.key('int main() {}', compiler)
+        assert key == jit_cache.key('int main() {}', compiler)
+        assert key != jit_cache.key('int main() { return 0; }', compiler)
+        # Different flags must lead to different keys
+        compiler.cflags += ['-ffast-math']
+        assert key != jit_cache.key('int main() {}', compiler)
+
+    def test_hit_miss(self, cachedir):
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+
+        op0 = Operator(Eq(u, u + 1))
+        op0.apply()
+        assert jit_cache.stats() == {'hits': 0, 'misses': 1, 'evictions': 0}
+        assert path.dirname(op0._lib.name) == cachedir
+
+        # An identical Operator reuses the shared object already in the cache
+        op1 = Operator(Eq(u, u + 1))
+        op1.apply()
+        assert jit_cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0}
+        assert op0._lib.name == op1._lib.name
+        assert np.all(u.data == 2.)
+
+    def test_eviction(self, cachedir):
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+
+        previous = configuration['jit-cache-size']
+        configuration['jit-cache-size'] = 0
+        try:
+            op = Operator(Eq(u, u + 1))
+            op.apply()
+            Operator(Eq(u, u + 2)).apply()
+            # Recently used entries may be about to be loaded, so they are kept
+            assert jit_cache.stats()['evictions'] == 0
+            assert len(jit_cache.entries) == 2
+
+            lib_file = '%s.%s' % (op._lib.name, get_lib_ext())
+            utime(lib_file, (time() - 2*jit_cache.grace,)*2)
+            jit_cache.evict()
+        finally:
+            configuration['jit-cache-size'] = previous
+
+        # The least recently used entry has been evicted
+        assert jit_cache.stats()['evictions'] == 1
+        assert len(jit_cache.entries) == 1
+        assert not path.exists(lib_file)
+        assert np.all(u.data == 3.)
+
+
+@skipif_yask
+class TestCompileAsync(object):
+
+    def test_concurrent(self, cachedir):
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+        v = Function(name='v', grid=grid)
+
+        op0 = Operator(Eq(u, u + 1))
+        op1 = Operator(Eq(v, v + 2))
+        futures = [op0.compile_async(), op1.compile_async()]
+        # Launching twice doesn't trigger a second compilation
+        assert op0.compile_async() is futures[0]
+
+        # `apply` waits for the pending compilation
+        op0.apply()
+        op1.apply()
+        assert [i.result() for i in futures] == [op0._lib.name, op1._lib.name]
+        assert jit_cache.stats()['misses'] == 2
+        assert np.all(u.data == 1.)
+        assert np.all(v.data == 2.)
+
+    def test_compiled(self, cachedir):
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+
+        op = Operator(Eq(u, u + 1))
+        op.apply()
+        assert op.compile_async().result() == op._lib.name
+        assert jit_cache.stats()['misses'] == 1
+
+
+@skipif_yask
+class TestInMemory(object):
+
+    def test_apply(self, cachedir):
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+
+        configuration['jit-inmemory'] = 1
+        try:
+            op = Operator(Eq(u, u + 1))
+            op.apply()
+        finally:
+            configuration['jit-inmemory'] = 0
+        assert path.dirname(op._lib.name) == get_shm_dir()
+        # Neither the source code nor the shared object go through the cache
+        assert jit_cache.stats()['misses'] == 0
+        assert not path.exists('%s.c' % op._lib.name)
+        assert np.all(u.data == 1.)
+
+
+@skipif_yask
+@pytest.mark.skipif(configuration['compiler'].pgo_flags('generate', '') is None,
+                    reason="The compiler doesn't support PGO")
+class TestPGO(object):
+
+    def test_apply(self, cachedir):
+        grid = Grid(shape=(8, 8))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        eqn = Eq(u.forward, u.laplace + 1.)
+
+        configuration['compiler-pgo'] = 1
+        try:
+            op = Operator(eqn)
+            op.apply(time=10)
+        finally:
+            configuration['compiler-pgo'] = 0
+        assert path.basename(op._lib.name) == 'kernel-pgo'
+        assert pgo_profiled(op.ccode, op._compiler)
+
+        # Same results as a standard build
+        Operator(eqn).apply(u=v, time=10)
+        assert np.all(u.data == v.data)
+
+
+@skipif_yask
+class TestCompilerAutotuning(object):
+
+    def test_apply(self, cachedir):
+        grid = Grid(shape=(8, 8))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        eqn = Eq(u.forward, u + 1.)
+
+        configuration['compiler-autotuning'] = 1
+        try:
+            op0 = Operator(eqn)
+            op0.apply(time=10)
+            key = jit_cache.key(op0.ccode, configuration['compiler'])
+            best = tuning_db.lookup('compiler', key)
+            variants = configuration['compiler'].tuning_variants()
+            assert best in variants
+            # Unless requested, the numerical results can't be altered
+            assert not any('fast-math' in i for i in variants)
+            assert op0._compiler.cflags == variants[best]
+
+            # The outcome is on record, hence reused
+            op1 = Operator(eqn)
+            op1.apply(time=10)
+            assert op1._compiler.cflags == variants[best]
+            assert op1._lib.name == op0._lib.name
+        finally:
+            configuration['compiler-autotuning'] = 0
+
+        # Same results as a standard build
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        op2 = Operator(eqn)
+        op2.apply(u=v, time=10)
+        op2.apply(u=v, time=10)
+        assert np.all(u.data == v.data)
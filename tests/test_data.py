@@ -3,7 +3,8 @@ from conftest import skipif_yask
 import numpy as np
 import pytest
 
-from devito import Grid, Function, TimeFunction
+from devito import Grid, Function, TimeFunction, bfloat16
+from devito.data import CompactData
 
 
 @pytest.fixture
@@ -116,3 +117,88 @@ def test_logic_indexing():
     assert np.all(v_mod.data[3] == v_mod.data[1])
     assert np.all(v_mod.data[-1] == v_mod.data[1])
     assert np.all(v_mod.data[-2] == v_mod.data[0])
+
+
+@pytest.mark.parametrize('storage_dtype,expected', [
+    (np.float16, [1., 1.00390625, 1.01171875, -3.30078125]),
+    (bfloat16, [1., 1., 1.015625, -3.296875])
+])
+def test_compact_storage(storage_dtype, expected):
+    """
+    Tests that values are rounded to nearest, ties to even, when written to
+    compactly stored :class:`Data`, and converted back to float32 when read.
+    """
+    grid = Grid(shape=(4,))
+    u = Function(name='u', grid=grid, storage_dtype=storage_dtype)
+    assert u._data_buffer.dtype == np.uint16
+
+    u.data[:] = [1., 1.00390625, 1.01171875, -3.3]
+    assert u.data[:].dtype == np.float32
+    assert np.all(u.data[:] == np.float32(expected))
+    assert u.data[3] == np.float32(expected[3])
+
+    # Whole-array operations see the values, not the bits
+    assert u.data.dtype == np.float32
+    assert np.all(u.data == np.float32(expected))
+    assert np.isclose(u.data.sum(), np.float32(expected).sum())
+    assert np.max(u.data) == np.float32(expected[2])
+    assert np.allclose(u.data, expected)
+    v = Function(name='v', grid=grid)
+    v.data[:] = u.data
+    assert np.all(v.data == u.data)
+
+
+@pytest.mark.parametrize('storage_dtype', [np.float16, bfloat16])
+def test_compact_storage_writes(storage_dtype):
+    """
+    Tests that writes to compactly stored :class:`Data`, through chained indexing,
+    in-place arithmetic or references held across accesses, reach the storage.
+    """
+    grid = Grid(shape=(4, 4))
+    u = TimeFunction(name='u', grid=grid, storage_dtype=storage_dtype)
+
+    u.data[0][1:3] = 5.
+    u.data[1, :][2] = 1.
+    assert np.all(u.data[0, 1:3] == 5.) and np.all(u.data[0, [0, 3]] == 0.)
+    assert np.all(u.data[1, 2] == 1.) and np.sum(u.data[1]) == 4.
+    # Modulo indexing along the time dimension
+    assert np.all(u.data[2][1:3] == 5.)
+
+    u.data[1] += 2.
+    assert np.all(u.data[1, 2] == 3.) and np.sum(u.data[1]) == 36.
+
+    data = u.data
+    data[:] = 1.
+    version = u._data_buffer._version
+    data[0, 0] = 2.
+    assert u._data_buffer._version != version
+    assert u.data[0, 0, 0] == 2. and np.sum(u.data) == 36.
+
+    # Arrays derived in other ways are plain values
+    copy = u.data.copy()
+    copy[:] = 0.
+    assert np.sum(u.data) == 36.
+    assert type(u.data[[0, 1], 0]) is np.ndarray
+
+    # Ufuncs writing into the values reach the storage too
+    np.multiply(u.data[1], 2., out=u.data[1])
+    np.add.at(u.data[0], (0, 0), 1.)
+    assert u.data[0, 0, 0] == 3. and np.sum(u.data) == 53.
+
+
+@pytest.mark.parametrize('storage_dtype', [np.float16, bfloat16])
+def test_compact_storage_proxy(storage_dtype):
+    """
+    Tests that compactly stored :class:`Data` is accessed through a proxy, which
+    only converts the indexed values.
+    """
+    grid = Grid(shape=(4, 4))
+    u = Function(name='u', grid=grid, storage_dtype=storage_dtype)
+    u.data[:] = 1.
+
+    assert isinstance(u.data, CompactData)
+    assert u.data.shape == (4, 4) and u.data.dtype == np.float32 and len(u.data) == 4
+    # Views of the storage are proxies too, while elements are values
+    assert isinstance(u.data[1:3], CompactData) and u.data[1:3].shape == (2, 4)
+    assert type(u.data[1, 1]) is np.float32
+    assert type(np.asarray(u.data)) is np.ndarray
@@ -10,8 +10,9 @@ from sympy import solve
 from conftest import EVAL
 
 from devito.dle import transform
-from devito.dle.backends import DevitoRewriter as Rewriter
-from devito import Grid, Function, TimeFunction, Eq, Operator
+from devito.dle.backends import (DevitoRewriter as Rewriter, get_simd_flag, simdinfo,
+                                 simdlang)
+from devito import Grid, Function, TimeFunction, Eq, Operator, configuration
 from devito.ir.equations import LoweredEq
 from devito.ir.iet import (ELEMENTAL, Expression, Callable, Iteration, List, tagger,
                            Transformer, FindNodes, iet_analyze, retrieve_iteration_tree)
@@ -307,6 +308,21 @@ def test_cache_blocking_time_loop(shape, time_order, blockshape, blockinner):
     assert np.equal(wo_blocking.data, w_blocking.data).all()
 
 
+@skipif_yask
+@pytest.mark.parametrize("shape", [(20, 33), (45, 31, 45)])
+@pytest.mark.parametrize("blockshape", [2, (13, 20), (3, 5, 7)])
+@pytest.mark.parametrize("blockinner", [False, True])
+def test_cache_blocking_hierarchical(shape, blockshape, blockinner):
+    wo_blocking, _ = _new_operator2(shape, time_order=2, dle='noop')
+    w_blocking, op = _new_operator2(shape, time_order=2,
+                                    dle=('blocking', {'blockshape': blockshape,
+                                                      'blockinner': blockinner,
+                                                      'blocklevels': 2}))
+
+    assert np.equal(wo_blocking.data, w_blocking.data).all()
+    assert any(i.level == 1 for i in op.dle_arguments)
+
+
 @skipif_yask
 @pytest.mark.parametrize("shape,blockshape", [
     ((25, 25, 46), (None, None, None)),
@@ -354,6 +370,92 @@ def test_cache_blocking_edge_cases_highorder(shape, blockshape):
     assert np.equal(wo_blocking.data, w_blocking.data).all()
 
 
+@skipif_yask
+@pytest.mark.parametrize("shape,blockshape", [
+    ((15, 15), (1, 4, 4)),
+    ((15, 15), (3, 4, 5)),
+    ((15, 15), (4, 2, 3)),
+    ((15, 15), (11, 16, 16)),
+    ((25, 46), (4, 7, 11))
+])
+def test_time_blocking(shape, blockshape):
+    wo_blocking, _ = _new_operator3(shape, time_order=2, dle='noop')
+    w_blocking, op = _new_operator3(shape, time_order=2,
+                                    dle=('timeblocking', {'blockshape': blockshape,
+                                                          'blockinner': True}))
+    assert op.dle_flags['timeblocking']
+    assert np.equal(wo_blocking.data, w_blocking.data).all()
+
+
+@skipif_yask
+@pytest.mark.parametrize('expr,fused', [
+    ('v + u.forward', True),
+    # Dependence carried along x
+    ('u.forward.dx', False),
+])
+def test_loop_fusion(expr, fused):
+    grid = Grid(shape=(12, 12, 12))
+    x = grid.dimensions[0]
+    u = TimeFunction(name='u', grid=grid, space_order=2)
+    v = TimeFunction(name='v', grid=grid, space_order=2)
+    eqns = [Eq(u.forward, u.laplace + 1.), Eq(v.forward, eval(expr))]
+
+    op0 = Operator(eqns, dle='noop')
+    op1 = Operator(eqns, dle=('fusion', {}))
+    assert op1.dle_flags['fusion'] is fused
+    nests = [i for i in FindNodes(Iteration).visit(op1) if i.dim is x]
+    assert len(nests) == (1 if fused else 2)
+
+    op0.apply(time=4)
+    u0, v0 = u.data.copy(), v.data.copy()
+    u.data[:] = 0.
+    v.data[:] = 0.
+    op1.apply(time=4)
+    assert np.allclose(u.data, u0)
+    assert np.allclose(v.data, v0)
+
+
+@skipif_yask
+@pytest.mark.parametrize("shape,passes", [
+    ((15, 15), 'prefetch'),
+    ((25, 46), 'blocking,simd,prefetch')
+])
+def test_prefetch(shape, passes):
+    wo_prefetch, _ = _new_operator3(shape, time_order=2, dle='noop')
+    w_prefetch, op = _new_operator3(shape, time_order=2, dle=(passes, {}))
+    assert op.dle_flags['prefetch']
+    assert '__builtin_prefetch' in str(op.ccode)
+    assert np.equal(wo_prefetch.data, w_prefetch.data).all()
+
+
+@skipif_yask
+@pytest.mark.parametrize("shape", [(15, 15), (25, 46)])
+def test_intrinsics(shape):
+    isa = get_simd_flag()
+    if (isa, 'float32') not in simdlang or\
+            '-mno-avx' in configuration['compiler'].cflags:
+        pytest.skip("SIMD intrinsics unsupported on this platform")
+    # The innermost extent is not a multiple of the vector width, so that
+    # the scalar remainder loops are exercised too
+    width = simdinfo[isa] // np.dtype(np.float32).itemsize
+    assert shape[-1] % width != 0
+
+    wo_intrinsics, _ = _new_operator3(shape, time_order=2, dle='advanced')
+    w_intrinsics, op = _new_operator3(shape, time_order=2, dle='advanced-intrinsics')
+    assert op.dle_flags['intrinsics']
+    assert simdlang[(isa, 'float32')]['storeu'] in str(op.ccode)
+
+    # Each vector loop is followed by a scalar remainder loop
+    iterations = FindNodes(Iteration).visit(op.elemental_functions)
+    vector = [i for i in iterations if i.limits[2] == width]
+    assert len(vector) > 0
+    for i in vector:
+        assert any(j.is_Remainder and j.dim == i.dim and j.limits[0] == i.limits[1]
+                   for j in iterations)
+
+    assert np.allclose(wo_intrinsics.data, w_intrinsics.data)
+
+
 @skipif_yask
 @pytest.mark.parametrize('exprs,expected', [
     # trivial 1D
@@ -1,15 +1,19 @@
 from conftest import EVAL
 
-from sympy import sin  # noqa
+from sympy import expand, sin  # noqa
 import numpy as np
 import pytest
 from conftest import x, y, z, time, skipif_yask  # noqa
 
-from devito import Eq  # noqa
+from devito import Eq, Grid, Function, TimeFunction, Operator, configuration  # noqa
 from devito.ir import Stencil, clusterize, FlowGraph, LoweredEq
-from devito.dse import rewrite, common_subexprs_elimination, collect
-from devito.symbolics import (xreplace_constrained, iq_timeinvariant, iq_timevarying,
-                              estimate_cost, pow_to_mul)
+from devito.dse import (rewrite, common_subexprs_elimination, collect, estimate_runtime,
+                        fuse_multiply_add, horner)
+from devito.dse.aliases import calculate_offsets, compare, is_translated, signature
+from devito.symbolics import (FMA, xreplace_constrained, iq_timeinvariant, iq_timevarying,
+                              count_divisions, estimate_cost, pow_to_mul,
+                              retrieve_indexed)
+from devito.profiling import BuildProfile
 from devito.types import Scalar
 from examples.seismic.acoustic import AcousticWaveSolver
 from examples.seismic import demo_model, RickerSource, GaborSource, Receiver
@@ -159,6 +163,81 @@ def test_tti_rewrite_aggressive(tti_nodse):
     assert np.allclose(tti_nodse[1].data, rec.data, atol=10e-1)
 
 
+@skipif_yask
+def test_tti_rewrite_parallel():
+    solver = tti_operator()
+
+    expressions = solver.op_fwd('centered').args['expressions']
+    subs = solver.op_fwd('centered').args['subs']
+    expressions = [LoweredEq(e, subs=subs) for e in expressions]
+    clusters = clusterize(expressions)
+
+    serial = rewrite(clusters, mode='aggressive')
+    configuration['dse-workers'] = len(clusters)
+    try:
+        parallel = rewrite(clusters, mode='aggressive')
+    finally:
+        configuration['dse-workers'] = 1
+
+    # The Clusters rewritten in the worker processes are merged back in order
+    assert [str(i.exprs) for i in serial] == [str(i.exprs) for i in parallel]
+    assert [i.ispace for i in serial] == [i.ispace for i in parallel]
+
+
+@skipif_yask
+@pytest.mark.parametrize('space_order', [4, 8])
+def test_tti_cse_dag(space_order):
+    solver = tti_operator(space_order=space_order)
+
+    expressions = solver.op_fwd('centered').args['expressions']
+    subs = solver.op_fwd('centered').args['subs']
+    expressions = [LoweredEq(e, subs=subs) for e in expressions]
+    exprs = clusterize(expressions)[0].exprs
+
+    make = lambda i: Scalar(name='r%d' % i).indexify()
+    dag = common_subexprs_elimination(exprs, make)
+    tree = common_subexprs_elimination(exprs, make, mode='tree')
+
+    # Same temporaries, possibly numbered differently if equally expensive
+    assert len(dag) == len(tree)
+    assert sorted(estimate_cost(i) for i in dag) ==\
+        sorted(estimate_cost(i) for i in tree)
+
+
+@skipif_yask
+def test_tti_rewrite_auto(tti_nodse):
+    operator = tti_operator(dse='auto')
+    rec, u, v, _ = operator.forward()
+
+    assert np.allclose(tti_nodse[0].data, v.data, atol=10e-1)
+    assert np.allclose(tti_nodse[1].data, rec.data, atol=10e-1)
+
+
+@skipif_yask
+@pytest.mark.parametrize('bandwidth', [10.**6, 1.])
+def test_dse_auto_choice(bandwidth):
+    solver = tti_operator()
+
+    expressions = solver.op_fwd('centered').args['expressions']
+    subs = solver.op_fwd('centered').args['subs']
+    expressions = [LoweredEq(e, subs=subs) for e in expressions]
+    clusters = clusterize(expressions)
+
+    previous = configuration['peak-bandwidth']
+    configuration['peak-bandwidth'] = bandwidth
+    try:
+        profile = BuildProfile()
+        processed = rewrite(clusters, mode='auto', profile=profile)
+        assert estimate_runtime(processed) ==\
+            min(estimate_runtime(rewrite(clusters, mode=i)) for i in
+                ['basic', 'advanced', 'speculative', 'aggressive'])
+        if bandwidth == 1.:
+            # On a hopelessly memory-bound machine, extra temporaries don't pay off
+            assert profile.choices['dse'] == 'basic'
+    finally:
+        configuration['peak-bandwidth'] = previous
+
+
 @skipif_yask
 @pytest.mark.parametrize('kernel,space_order,expected', [
     ('shifted', 8, 355), ('shifted', 16, 811),
@@ -224,6 +303,7 @@ def test_xreplace_constrained_time_varying(tu, tv, tw, ti0, ti1, t0, t1,
 
 
 @skipif_yask
+@pytest.mark.parametrize('mode', ['default', 'tree'])
 @pytest.mark.parametrize('exprs,expected', [
     # simple
     (['Eq(tu, (tv + tw + 5.)*(ti0 + ti1) + (t0 + t1)*(ti0 + ti1))'],
@@ -236,10 +316,11 @@ def test_xreplace_constrained_time_varying(tu, tv, tw, ti0, ti1, t0, t1,
     pytest.mark.xfail((['Eq(tu, ti0*ti1 + ti0*ti1*t0 + ti0*ti1*t0*t1)'],
                        ['ti0*ti1', 'r0', 'r0*t0', 'r0*t0*t1'])),
 ])
-def test_common_subexprs_elimination(tu, tv, tw, ti0, ti1, t0, t1, exprs, expected):
+def test_common_subexprs_elimination(tu, tv, tw, ti0, ti1, t0, t1, exprs, expected,
+                                     mode):
     make = lambda i: Scalar(name='r%d' % i).indexify()
     processed = common_subexprs_elimination(EVAL(exprs, tu, tv, tw, ti0, ti1, t0, t1),
-                                            make)
+                                            make, mode)
     assert len(processed) == len(expected)
     assert all(str(i.rhs) == j for i, j in zip(processed, expected))
 
@@ -334,6 +415,123 @@ def test_collect_aliases(fa, fb, fc, fd, t0, t1, t2, t3, exprs, expected):
         assert (len(v.aliased) == 1 and mapper[k] is None) or v.anti_stencil == mapper[k]
 
 
+@skipif_yask
+@pytest.mark.parametrize('expr1,expr2,expected', [
+    ('fa[x] + fb[x]', 'fa[x+1] + fb[x+1]', True),
+    ('fa[x] + fb[x]', 'fa[x+1] + fb[x]', False),
+    ('fa[x] + fb[x]', 'fa[x] - fb[x]', False),
+    ('fc[x,y] + fd[x+1,y+2]', 'fc[x+1,y+1] + fd[x+2,y+3]', True),
+    ('fc[x,y]*3. + fd[x+2,y+2]', 'fc[x,y]*2. + fd[x+2,y+2]', False),
+])
+def test_aliases_signature(fa, fb, fc, fd, expr1, expr2, expected):
+    e1, e2 = EVAL([expr1, expr2], fa, fb, fc, fd)
+    ofs1 = calculate_offsets(retrieve_indexed(e1, mode='all'))[1]
+    ofs2 = calculate_offsets(retrieve_indexed(e2, mode='all'))[1]
+    assert (signature(e1, ofs1) == signature(e2, ofs2)) is expected
+    assert (compare(e1, e2) and is_translated(ofs1, ofs2)) is expected
+
+
+@skipif_yask
+@pytest.mark.parametrize('expr,expected', [
+    ('t0*fa[x]**3 + t1*fa[x]**2 + t2*fa[x] + t0', 6),
+    ('t0*fa[x]**2 + t1*fb[x]**2 + t2', 6),
+    ('fa[x]**2 + 2.*fa[x]', 2),
+])
+def test_horner(fa, fb, t0, t1, t2, expr, expected):
+    expr = EVAL(expr, fa, fb, t0, t1, t2)
+    processed = horner(expr)
+    assert estimate_cost(pow_to_mul(processed)) == expected
+    assert expand(processed - expr) == 0
+
+
+@skipif_yask
+@pytest.mark.parametrize('expr,expected', [
+    ('fa[x]*fb[x] + t0*t1 + t2', 2),
+    ('fa[x]*fb[x] + t0', 1),
+    ('fa[x] + fb[x]', 1),
+    ('t2*(fa[x] + fb[x]) + t0', 2),
+    ('fa[x] - t0*t1', 1),
+    ('fa[x]*fb[x] + t0*t1', 2),
+])
+def test_fuse_multiply_add(fa, fb, t0, t1, t2, expr, expected):
+    expr = EVAL(expr, fa, fb, t0, t1, t2)
+    processed = fuse_multiply_add(expr)
+    assert estimate_cost(processed, fma=True) == expected
+    # An FMA is still two floating-point operations
+    assert estimate_cost(processed) == estimate_cost(expr)
+    assert expand(processed.replace(FMA, lambda a, b, c: a*b + c) - expr) == 0
+
+
+@skipif_yask
+def test_tti_rewrite_fma(tti_nodse):
+    previous = configuration['isa']
+    configuration['isa'] = 'avx2'
+    configuration['dse-fma'] = 1
+    try:
+        operator = tti_operator(dse='advanced')
+        rec, u, v, summary = operator.forward()
+    finally:
+        configuration['isa'] = previous
+        configuration['dse-fma'] = 0
+
+    assert np.allclose(tti_nodse[0].data, v.data, atol=10e-1)
+    assert np.allclose(tti_nodse[1].data, rec.data, atol=10e-1)
+    assert summary['main'].ops_fma < summary['main'].ops
+
+
+@skipif_yask
+def test_fma_optin():
+    grid = Grid(shape=(16, 16, 16))
+    u = TimeFunction(name='u', grid=grid, space_order=4)
+    v = TimeFunction(name='v', grid=grid, space_order=4)
+    m = Function(name='m', grid=grid)
+    m.data[:] = np.linspace(1, 2, m.data.size).reshape(m.shape)
+    u.data[:] = v.data[:] = np.linspace(0, 1, u.data.size).reshape(u.shape)
+
+    previous = configuration['isa']
+    configuration['isa'] = 'avx2'
+    try:
+        # FMAs are only emitted upon request
+        op0 = Operator(Eq(u.forward, u + 0.1*m*u.laplace), dse='advanced')
+        configuration['dse-fma'] = 1
+        op1 = Operator(Eq(v.forward, v + 0.1*m*v.laplace), dse='advanced')
+    finally:
+        configuration['isa'] = previous
+        configuration['dse-fma'] = 0
+    assert 'fma' not in str(op0.ccode)
+    assert 'fmaf(' in str(op1.ccode)
+
+    # FMAs round only once, so results are equal up to rounding errors
+    op0.apply(time=5)
+    op1.apply(time=5)
+    assert np.allclose(u.data, v.data, rtol=1e-5)
+
+
+@skipif_yask
+def test_hoist_reciprocals():
+    grid = Grid(shape=(8, 8, 8))
+    h_x = grid.dimensions[0].spacing
+    u = TimeFunction(name='u', grid=grid, space_order=2)
+    m = Function(name='m', grid=grid)
+    m.data[:] = 2.
+    eqn = Eq(u.forward, u + (u.dx + u.dy)/m + u.laplace/(m*h_x))
+
+    clusters = clusterize([LoweredEq(eqn)])
+    processed = rewrite(clusters, mode='advanced')
+    timed = [i for i in processed if any(d.is_Time for d in i.ispace.dimensions)]
+    assert len(timed) == 1
+    # All divisions are now outside of the time loop
+    assert count_divisions(clusters[0].exprs) > 0
+    assert count_divisions(timed[0].exprs) == 0
+
+    results = []
+    for dse in ['noop', 'advanced']:
+        u.data[:] = np.linspace(0, 1, u.data.size).reshape(u.shape)
+        Operator(eqn, dse=dse).apply(time=2)
+        results.append(u.data.copy())
+    assert np.allclose(results[0], results[1], rtol=1e-5)
+
+
 @skipif_yask
 @pytest.mark.parametrize('expr,expected', [
     ('Eq(t0, t1)', 0),
@@ -351,3 +549,43 @@ def test_collect_aliases(fa, fb, fc, fd, t0, t1, t2, t3, exprs, expected):
 def test_estimate_cost(fa, fb, fc, t0, t1, t2, expr, expected):
     # Note: integer arithmetic isn't counted
     assert estimate_cost(EVAL(expr, fa, fb, fc, t0, t1, t2)) == expected
+
+
+@skipif_yask
+def test_dse_cache():
+    from devito.dse.transformer import dse_cache
+    grid = Grid(shape=(8, 8, 8))
+
+    def build(uname, mname):
+        u = TimeFunction(name=uname, grid=grid, space_order=2)
+        m = Function(name=mname, grid=grid)
+        m.data[:] = 2.
+        u.data[:] = np.linspace(0, 1, u.data.size).reshape(u.shape)
+        op = Operator(Eq(u.forward, m*u.laplace + u.dx*u.dy*sin(m) + 1.),
+                      dse='aggressive')
+        return op, u
+
+    configuration['dse-cache'] = 1
+    dse_cache.clear()
+    try:
+        op0, u0 = build('u', 'm')
+        misses = dse_cache.stats()['misses']
+        assert misses > 0 and dse_cache.stats()['hits'] == 0
+        # Same structure, different names
+        op1, u1 = build('v', 'p')
+        assert dse_cache.stats() == {'hits': misses, 'misses': misses,
+                                     'saved': dse_cache.saved}
+        assert dse_cache.saved > 0.
+        assert 'dse.cache' in op1.build_profile
+    finally:
+        configuration['dse-cache'] = 0
+        dse_cache.clear()
+
+    # Compare against a fresh, non-cached Operator
+    op2, u2 = build('v', 'p')
+    assert str(op1.ccode) == str(op2.ccode)
+    op0.apply(time=2)
+    op2.apply(time=2)
+    op1.apply(time=2)
+    assert np.all(u0.data == u1.data)
+    assert np.all(u1.data == u2.data)
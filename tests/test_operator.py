@@ -1,15 +1,21 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
+from hashlib import sha1
+import json
+import pickle
 
 from conftest import EVAL, dims, time, x, y, z, skipif_yask
 
 import numpy as np
 import pytest
+from sympy import cos, sin
 
 from devito import (clear_cache, Grid, Eq, Operator, Constant, Function,
                     TimeFunction, SparseTimeFunction, Dimension, configuration,
-                    error, INTERIOR)
+                    error, INTERIOR, Inc, bfloat16, build_operators)
+from devito.compiler import get_lib_ext
+from devito.exceptions import InvalidOperator
 from devito.foreign import Operator as OperatorForeign
 from devito.ir.iet import (Expression, Iteration, FindNodes, IsPerfectIteration,
                            retrieve_iteration_tree)
@@ -1053,6 +1059,416 @@ class TestRegions(object):
         assert np.all(u.data[1, 1:3, 1:3, 1:3] == 3)
 
 
+@skipif_yask
+class TestLoweringCache(object):
+
+    @pytest.fixture
+    def lowering_cache(self):
+        from devito.operator import lowering_cache
+        configuration['lowering-cache'] = 1
+        lowering_cache.clear()
+        yield lowering_cache
+        configuration['lowering-cache'] = 0
+        lowering_cache.clear()
+
+    def build(self, value, dle):
+        grid = Grid(shape=(12, 12, 12))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        m = Function(name='m', grid=grid)
+        m.data[:] = value
+        u.data[:] = np.linspace(0, 1, u.data.size).reshape(u.shape)
+        op = Operator(Eq(u.forward, m*u.laplace + u.dx*u.dy + 1.),
+                      dse='aggressive', dle=dle)
+        return op, u, m
+
+    @pytest.mark.parametrize('dle', ['noop', 'advanced'])
+    def test_hit(self, lowering_cache, dle):
+        op0, u0, m0 = self.build(1., dle)
+        op0.apply(time=3)
+        assert lowering_cache.misses == 1
+
+        # Different Functions, same structure
+        op1, u1, m1 = self.build(2., dle)
+        assert lowering_cache.hits == 1
+        assert str(op0.ccode) == str(op1.ccode)
+        assert op0._lib is op1._lib
+        assert all(i in op1.input for i in [u1, m1])
+        assert all(i not in op1.input for i in [u0, m0])
+
+        op1.apply(time=3)
+
+        # Compare against a fresh, non-cached Operator
+        configuration['lowering-cache'] = 0
+        op2, u2, m2 = self.build(2., dle)
+        op2.apply(time=3)
+        assert np.all(u1.data == u2.data)
+        assert np.any(u1.data != u0.data)
+
+    def test_miss(self, lowering_cache):
+        self.build(1., 'noop')
+        self.build(1., 'advanced')
+        grid = Grid(shape=(12, 12, 12))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+        m = Function(name='m', grid=grid)
+        Operator(Eq(u.forward, m*u.laplace + u.dx*u.dy + 1.), dse='aggressive')
+        assert lowering_cache.hits == 0
+        assert lowering_cache.misses == 3
+
+    def test_disk(self, lowering_cache, tmpdir):
+        configuration['lowering-cache-dir'] = str(tmpdir)
+        try:
+            op0, u0, _ = self.build(1., 'advanced')
+            assert len(tmpdir.listdir()) == 1
+            # Emulate a new process
+            lowering_cache.clear()
+            op1, u1, _ = self.build(1., 'advanced')
+        finally:
+            configuration['lowering-cache-dir'] = None
+        assert lowering_cache.hits == 1
+        assert str(op0.ccode) == str(op1.ccode)
+        op0.apply(time=3)
+        op1.apply(time=3)
+        assert np.all(u0.data == u1.data)
+
+
+@skipif_yask
+class TestBind(object):
+
+    def test_bind(self):
+        grid = Grid(shape=(6, 6))
+        u = TimeFunction(name='u', grid=grid, save=10)
+        v = TimeFunction(name='v', grid=grid, save=10)
+        op = Operator(Eq(u.forward, u + 1.))
+
+        bound = op.bind(u=u, time_s=0, time_e=3)
+        bound()
+        # Only the time window changes across calls
+        bound(time_s=3, time_e=6)
+        bound(time_s=6, time_e=9)
+        assert bound.ncalls == 3
+        assert bound.overhead_per_call > 0.
+        assert 'main' in bound.summary()
+
+        op.apply(u=v, time_s=0, time_e=9)
+        assert np.all(u.data == v.data)
+        assert np.all(u.data[9] == 9.)
+
+    def test_illegal(self):
+        grid = Grid(shape=(6, 6))
+        u = TimeFunction(name='u', grid=grid)
+        op = Operator(Eq(u.forward, u + 1.))
+
+        bound = op.bind(time=2)
+        with pytest.raises(ValueError):
+            bound(foo=1)
+        with pytest.raises(ValueError):
+            bound(u=u.data)
+        with pytest.raises(ValueError):
+            bound(u=3)
+
+
+@skipif_yask
+class TestPickling(object):
+
+    def test_compiled(self):
+        grid = Grid(shape=(6, 6))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        u.data[:] = v.data[:] = np.linspace(0, 1, u.data.size).reshape(u.shape)
+        op = Operator(Eq(u.forward, u.laplace + 1.), dle='advanced')
+        op.apply(time=2)
+
+        new_op = pickle.loads(pickle.dumps(op))
+        assert new_op._lib is not None
+        assert str(new_op.ccode) == str(op.ccode)
+        assert [i.name for i in new_op.parameters] == [i.name for i in op.parameters]
+
+        new_op.apply(u=v, time=2)
+        assert np.all(u.data == v.data)
+
+    def test_dataless(self):
+        grid = Grid(shape=(6, 6))
+        u = TimeFunction(name='u', grid=grid)
+        op = Operator(Eq(u.forward, u + 1.))
+        u.data[:] = 1.
+        op.apply(time=2)
+
+        # The data is not shipped, so it must be provided again
+        new_op = pickle.loads(pickle.dumps(op))
+        with pytest.raises(ValueError):
+            new_op.apply(time=2)
+        new_u = [i for i in new_op.input if i.name == 'u'][0]
+        new_u.data[:] = 1.
+        new_op.apply(time=2)
+        assert np.all(new_u.data == u.data)
+
+    def test_shared_object_naming(self):
+        grid = Grid(shape=(6, 6))
+        u = TimeFunction(name='u', grid=grid)
+        op = Operator(Eq(u.forward, u + 1.))
+        op.cfunction
+
+        # The shipped shared object is named after its contents
+        new_op = pickle.loads(pickle.dumps(op))
+        with open('%s.%s' % (op._lib.name, get_lib_ext()), 'rb') as f:
+            digest = sha1(f.read()).hexdigest()
+        assert new_op._lib.name.endswith(digest)
+
+    def test_not_compiled(self):
+        grid = Grid(shape=(6, 6))
+        u = TimeFunction(name='u', grid=grid)
+        v = TimeFunction(name='v', grid=grid)
+        op = Operator(Eq(u.forward, u + 1.))
+
+        new_op = pickle.loads(pickle.dumps(op))
+        assert new_op._lib is None
+        new_op.apply(u=v, time=2)
+        op.apply(time=2)
+        assert np.all(u.data == v.data)
+        assert np.any(u.data != 0.)
+
+
+@skipif_yask
+class TestBuildProfile(object):
+
+    def test_stages(self):
+        grid = Grid(shape=(6, 6, 6))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+        op = Operator(Eq(u.forward, u.laplace + u.dx*u.dy + 1.),
+                      dse='aggressive', dle='advanced')
+        profile = op.build_profile
+
+        for i in ['lowering', 'clusterize', 'dse', 'iet_build', 'dle', 'c_decls']:
+            assert i in profile
+            assert profile[i].time >= 0.
+        assert any(i.startswith('dse.') for i in profile)
+        assert any(i.startswith('dle.') for i in profile)
+        assert profile['lowering'].nexprs_out == 1
+        # The DSE introduces temporaries
+        assert profile['dse'].nexprs_out > profile['dse'].nexprs_in
+
+        # Code generation and compilation are tracked lazily
+        assert 'compilation' not in profile
+        op.apply(time=2)
+        assert 'codegen' in profile and 'compilation' in profile
+        assert profile.code_size == len(str(op.ccode))
+
+        data = json.loads(profile.to_json())
+        assert list(data['stages']) == list(profile)
+        assert data['code_lines'] == profile.code_lines
+        assert data['elapsed'] == profile.elapsed
+
+
+@skipif_yask
+class TestHeapPool(object):
+
+    def build(self, u, m):
+        # The DSE captures the time-invariant `sin(m)` and `cos(m)` in heap arrays
+        return Operator(Eq(u.forward, u*sin(m) + u.dx*cos(m) + 1.), dse='advanced')
+
+    def test_reuse(self):
+        grid = Grid(shape=(8, 8, 8))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        m = Function(name='m', grid=grid)
+        m.data[:] = np.linspace(0, 1, m.data.size).reshape(m.shape)
+
+        configuration['heap-pool'] = 1
+        try:
+            op = self.build(u, m)
+        finally:
+            configuration['heap-pool'] = 0
+        assert len(op._heap_arrays) > 0
+        assert all(i in op.parameters for i in op._heap_arrays)
+        assert 'free(' not in str(op.ccode)
+
+        op.apply(time=2)
+        pool = dict(op._heap_pool)
+        assert set(pool) == set(i.name for i in op._heap_arrays)
+        # The same storage is used by subsequent calls
+        op.apply(time_s=3, time_e=5)
+        assert all(op._heap_pool[k] is v for k, v in pool.items())
+
+        # Same results as a standard build
+        ref = self.build(v, m)
+        assert len(ref._heap_arrays) == 0
+        assert 'free(' in str(ref.ccode)
+        ref.apply(u=v, time=2)
+        ref.apply(u=v, time_s=3, time_e=5)
+        assert np.all(u.data == v.data)
+
+
+@skipif_yask
+class TestPersistentInvariants(object):
+
+    def build(self, u, m):
+        # The DSE captures the time-invariant `sin(m)` and `cos(m)` in heap arrays
+        return Operator(Eq(u.forward, u*sin(m) + u.dx*cos(m) + 1.), dse='advanced')
+
+    def test_update(self):
+        grid = Grid(shape=(8, 8, 8))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        m = Function(name='m', grid=grid)
+        m.data[:] = np.linspace(0, 1, m.data.size).reshape(m.shape)
+
+        configuration['persistent-invariants'] = 1
+        try:
+            op = self.build(u, m)
+        finally:
+            configuration['persistent-invariants'] = 0
+        assert len(op._invariants) > 0
+        assert all(i in op._heap_arrays for i in op._invariants)
+        assert 'invariants_stale' in str(op.ccode)
+
+        ref = self.build(v, m)
+
+        flag = op._invariants_flag.name
+        assert op.arguments(time=2)[flag] == 1
+        op.apply(time=2)
+        ref.apply(u=v, time=2)
+        # Nothing has changed, so the time-invariants are not recomputed
+        assert op.arguments(time_s=3, time_e=5)[flag] == 0
+        op.apply(time_s=3, time_e=5)
+        ref.apply(u=v, time_s=3, time_e=5)
+        assert np.all(u.data == v.data)
+
+        # Reading `m.data` doesn't modify `m`
+        assert np.all(m.data <= 1.)
+        assert op.arguments(time_s=6, time_e=8)[flag] == 0
+
+        # Any write to `m.data` modifies `m`, hence the time-invariants
+        m.data[:] = 2.
+        assert op.arguments(time_s=6, time_e=8)[flag] == 1
+        op.apply(time_s=6, time_e=8)
+        ref.apply(u=v, time_s=6, time_e=8)
+        assert np.all(u.data == v.data)
+
+        # Also writes through a reference held across `apply` calls, or a view
+        data = m.data
+        data[:] = 3.
+        assert op.arguments(time_s=9, time_e=11)[flag] == 1
+        op.apply(time_s=9, time_e=11)
+        ref.apply(u=v, time_s=9, time_e=11)
+        assert np.all(u.data == v.data)
+        data[1:3][0] = 4.
+        assert op.arguments(time_s=12, time_e=14)[flag] == 1
+        op.apply(time_s=12, time_e=14)
+        ref.apply(u=v, time_s=12, time_e=14)
+        assert np.all(u.data == v.data)
+
+        # In-place modifications too (e.g., the model update in an FWI loop)
+        updates = [lambda: data.__iadd__(0.5), lambda: data.__isub__(0.25*m.data),
+                   lambda: np.add(m.data, 1., out=m.data), lambda: m.data.fill(3.),
+                   lambda: np.copyto(m.data, np.ones(m.shape))]
+        for n, update in enumerate(updates):
+            update()
+            time_s = 15 + 3*n
+            assert op.arguments(time_s=time_s, time_e=time_s + 2)[flag] == 1
+            op.apply(time_s=time_s, time_e=time_s + 2)
+            ref.apply(u=v, time_s=time_s, time_e=time_s + 2)
+            assert np.all(u.data == v.data)
+
+        # Raw arrays may be modified anywhere, so they always trigger an update
+        assert op.arguments(m=np.array(m.data), time=2)[flag] == 1
+
+
+@skipif_yask
+class TestCompactStorage(object):
+
+    @pytest.mark.parametrize('storage_dtype', [np.float16, bfloat16])
+    def test_apply(self, storage_dtype):
+        grid = Grid(shape=(8, 8, 8))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        m0 = Function(name='m0', grid=grid)
+        m1 = Function(name='m1', grid=grid, storage_dtype=storage_dtype)
+        w = Function(name='w', grid=grid, storage_dtype=storage_dtype)
+        # Exactly representable in both formats
+        m0.data[:] = 0.125
+        m1.data[:] = 0.125
+
+        op0 = Operator(Eq(u.forward, u + m0*u.laplace + 1.))
+        op1 = Operator([Eq(v.forward, v + m1*v.laplace + 1.), Eq(w, 2*m1)])
+        assert 'load_' in str(op1.ccode) and 'store_' in str(op1.ccode)
+
+        op0.apply(time=3)
+        op1.apply(time=3)
+        assert np.all(u.data[:] == v.data[:])
+        assert np.all(w.data[:] == 0.25)
+
+    def test_illegal(self):
+        grid = Grid(shape=(4, 4), dtype=np.float64)
+        with pytest.raises(ValueError):
+            Function(name='m', grid=grid, storage_dtype=np.float16)
+        with pytest.raises(ValueError):
+            Function(name='m', grid=grid, storage_dtype=np.int32)
+
+        # Increments can't be carried out in the storage format
+        grid = Grid(shape=(4, 4))
+        w = Function(name='w', grid=grid, storage_dtype=np.float16)
+        with pytest.raises(InvalidOperator):
+            Operator(Inc(w, 1.))
+
+
+@skipif_yask
+class TestBuildOperators(object):
+
+    def test_build(self):
+        grid = Grid(shape=(12, 12, 12))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        m = Function(name='m', grid=grid)
+        m.data[:] = 2.
+
+        eqns = [Eq(u.forward, m*u.laplace + 1.), Eq(v.forward, v.dx + u)]
+        ops = build_operators([eqns[0], (eqns[1], {'dle': 'noop'})],
+                              dse='aggressive', name='Bulk')
+        assert all(op._lib is not None for op in ops)
+        assert all(op.name == 'Bulk' for op in ops)
+        # The lowered Operators are bound to the caller's Functions
+        assert m in ops[0].input and u in ops[0].output
+        assert u in ops[1].input and v in ops[1].output
+
+        # Compare against Operators built one at a time
+        refs = [Operator(eqns[0], dse='aggressive', name='Bulk'),
+                Operator(eqns[1], dse='aggressive', dle='noop', name='Bulk')]
+        assert [str(i.ccode) for i in ops] == [str(i.ccode) for i in refs]
+
+        ops[0].apply(time=3)
+        ops[1].apply(time=3)
+        assert np.any(u.data != 0.)
+        assert np.any(v.data != 0.)
+
+    def test_pending_compilations(self):
+        from devito.operator import lowering_cache
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+        v = Function(name='v', grid=grid)
+
+        # Background compilations are completed before forking
+        previous = configuration['jit-workers']
+        configuration['jit-workers'] = 2
+        try:
+            op = Operator(Eq(u, u + 1))
+            future = op.compile_async()
+            ops = build_operators([Eq(v, v + 1), Eq(v, v + 2)])
+        finally:
+            configuration['jit-workers'] = previous
+        assert future.done()
+        assert all(i._lib is not None for i in ops)
+
+        # Neither the configuration nor the lowering cache are touched
+        assert not configuration['lowering-cache']
+        assert len(lowering_cache.entries) == 0
+
+        op.apply()
+        ops[0].apply()
+        ops[1].apply()
+        assert np.all(u.data == 1.)
+        assert np.all(v.data == 3.)
+
+
 @skipif_yask
 @pytest.mark.xfail
 @pytest.mark.skipif(configuration['backend'] != 'foreign',